@@ -0,0 +1,96 @@
+from array import array
+from datetime import timedelta
+
+# WORKLOAD DISTRIBUTIONS
+# Skewed popularity (Zipf), seasonal timestamps and basket sizes for transactions.
+# Every distribution is turned into an alias table once (Vose's method, O(n)),
+# after which each draw costs one random number, however skewed the weights are.
+# A table is a (prob, alias) pair of compact arrays, indexed 0..n-1.
+
+# Month (Jan..Dec), weekday (Mon..Sun) and hour-of-day weights per timestamp profile
+SEASONALITY = {
+    "retail": {
+        "month": [0.80, 0.75, 0.90, 0.95, 1.00, 1.05, 1.00, 1.00, 0.95, 1.05, 1.45, 1.70],
+        "weekday": [0.90, 0.90, 0.95, 1.00, 1.10, 1.35, 1.20],
+        "hour": [0.15, 0.10, 0.08, 0.06, 0.06, 0.10, 0.25, 0.50, 0.80, 1.00, 1.10, 1.20,
+                 1.30, 1.25, 1.15, 1.10, 1.15, 1.30, 1.55, 1.70, 1.60, 1.20, 0.70, 0.35],
+    },
+    "b2b": {
+        "month": [1.00, 1.05, 1.15, 1.10, 1.05, 1.00, 0.80, 0.75, 1.10, 1.10, 1.05, 0.85],
+        "weekday": [1.20, 1.25, 1.25, 1.20, 1.00, 0.15, 0.10],
+        "hour": [0.02, 0.02, 0.02, 0.02, 0.02, 0.05, 0.20, 0.70, 1.40, 1.60, 1.60, 1.30,
+                 0.90, 1.40, 1.60, 1.50, 1.20, 0.70, 0.25, 0.10, 0.05, 0.03, 0.02, 0.02],
+    },
+}
+
+def build_alias(weights):
+    n = len(weights)
+    total = float(sum(weights))
+    if n == 0 or total <= 0:
+        print("Error: A distribution needs at least one positive weight.")
+        exit()
+
+    prob = array('d', bytes(8 * n))
+    alias = array('I', range(n))
+    scaled = [w * n / total for w in weights]
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = (scaled[l] + scaled[s]) - 1.0
+        (small if scaled[l] < 1.0 else large).append(l)
+    # Leftovers are 1.0 up to rounding error
+    for i in large + small:
+        prob[i] = 1.0
+    return prob, alias
+
+def alias_draw(table, rand):
+    # One uniform number: the integer part picks a column, the fraction the coin flip
+    prob, alias = table
+    u = rand() * len(prob)
+    i = int(u)
+    return i if u - i < prob[i] else alias[i]
+
+def distinct_draws(table, k, rand):
+    # k distinct indices, by rejection; k is small next to the table size
+    picks = []
+    while len(picks) < k:
+        i = alias_draw(table, rand)
+        if i not in picks:
+            picks.append(i)
+    return picks
+
+# WEIGHT BUILDERS
+def zipf_weights(n, exponent, shuffle_rand=None):
+    # Rank r gets weight 1 / r**exponent; ranks are shuffled over ids so the
+    # hot items are not simply the lowest ids
+    weights = [1.0 / (rank ** exponent) for rank in range(1, n + 1)]
+    if shuffle_rand is not None:
+        shuffle_rand.shuffle(weights)
+    return weights
+
+def parse_weights(text):
+    try:
+        weights = [float(part) for part in text.split(",")]
+    except ValueError:
+        weights = []
+    if not weights or any(w < 0 for w in weights) or sum(weights) <= 0:
+        print(f"Error: '{text}' is not a comma-separated list of non-negative weights.")
+        exit()
+    return weights
+
+def day_weights(window_start, days, profile):
+    month = SEASONALITY[profile]["month"]
+    weekday = SEASONALITY[profile]["weekday"]
+    weights = []
+    for d in range(days):
+        day = window_start + timedelta(days=d)
+        weights.append(month[day.month - 1] * weekday[day.weekday()])
+    return weights
+
+def hour_weights(profile):
+    return SEASONALITY[profile]["hour"]
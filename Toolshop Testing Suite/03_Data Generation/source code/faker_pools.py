@@ -0,0 +1,72 @@
+import json
+import os
+import re
+
+from faker import Faker
+
+# FAKER VALUE POOLS
+# Instead of calling a Faker provider for every field of every row, "pool" mode
+# draws a fixed-size vocabulary per provider once, caches it on disk keyed by
+# (locale, seed, size) and composes rows by sampling indices from it.
+# Fields that must stay unique (emails, image ids) embed the row id.
+
+POOL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".faker_pools")
+DEFAULT_POOL_SIZE = 10000
+
+POOL_PROVIDERS = {
+    "first_name": lambda f: f.first_name(),
+    "last_name": lambda f: f.last_name(),
+    "street_address": lambda f: f.street_address(),
+    "city": lambda f: f.city(),
+    "state": lambda f: f.state(),
+    "country": lambda f: f.country(),
+    "postcode": lambda f: f.postcode(),
+    "phone": lambda f: f.numerify('(###) ###-####'),
+    "email_domain": lambda f: f.free_email_domain(),
+    "color_name": lambda f: f.color_name(),
+    "image_id": lambda f: f.bothify(text='?#?#?#?#?#?#?#?#?#?#?#?#').upper(),
+}
+
+# The last 12 characters of an image id (6 letter/digit pairs) encode the product id
+IMAGE_ID_TAIL = 12
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+DIGITS = "0123456789"
+
+def pool_path(locale, seed, size):
+    return os.path.join(POOL_DIR, f"pools_{locale}_{seed}_{size}.json")
+
+def build_pools(locale, seed, size):
+    fake = Faker(locale)
+    fake.seed_instance(seed)
+    return {name: [provider(fake) for _ in range(size)] for name, provider in POOL_PROVIDERS.items()}
+
+def load_pools(locale="en_US", seed=12345, size=DEFAULT_POOL_SIZE):
+    path = pool_path(locale, seed, size)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+
+    print(f"Building Faker pools ({size} values per field) to {path}...")
+    pools = build_pools(locale, seed, size)
+    os.makedirs(POOL_DIR, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, mode='w', encoding='utf-8') as file:
+        json.dump(pools, file)
+    os.replace(tmp_path, path)
+    return pools
+
+# UNIQUE FIELDS
+def unique_email(first_name, last_name, domain, row_id):
+    first = re.sub(r"[^a-z0-9]", "", first_name.lower())
+    last = re.sub(r"[^a-z0-9]", "", last_name.lower())
+    return f"{first}.{last}{row_id}@{domain}"
+
+def unique_image_id(prefix, row_id):
+    # Keep the "?#?#..." shape: overwrite the tail with row_id in mixed radix
+    tail = []
+    value = row_id
+    for _ in range(IMAGE_ID_TAIL // 2):
+        value, digit = divmod(value, 10)
+        value, letter = divmod(value, 26)
+        tail.append(LETTERS[letter] + DIGITS[digit])
+    return prefix[:-IMAGE_ID_TAIL] + "".join(reversed(tail))
@@ -0,0 +1,711 @@
+import argparse
+import csv
+import random
+import os
+import sys
+from array import array
+from datetime import timedelta
+
+from sharding import (derive_seed, shard_ranges, parse_as_of, run_shards, part_filename,
+                      write_pickled_part, iter_pickled_parts)
+import numpy_backend
+import faker_pools
+import distributions
+from sinks import FORMATS, CSVSink, ItemsJSON, build_sinks, batches
+
+# GENERATOR CORE
+# One row-producing engine for every output format. Rows are produced lazily,
+# entity by entity, and fanned out in batches to all requested sinks, so the
+# Faker cost is paid once no matter how many formats are written.
+
+try:
+    from faker import Faker
+except ImportError:
+    print("Error: The 'faker' library is not installed.")
+    print("Please run: pip install faker")
+    exit()
+
+# CONFIGURATION
+SEED = 12345
+fake = Faker()
+Faker.seed(SEED) 
+
+# Reference "now" for invoice dates and dates of birth (see --as-of)
+AS_OF = parse_as_of(None)
+INVOICE_WINDOW = timedelta(days=730)
+
+# "python" draws every value with `random`; "numpy" bulk-draws the numeric columns
+BACKEND = "python"
+
+# Faker value pools for --faker-mode pool; None means every value comes from Faker
+POOLS = None
+
+# Transaction workload shape (see --product-skew etc.); the defaults are uniform.
+# SKEW holds the alias tables built from it right before transactions are generated.
+WORKLOAD = {"product_skew": 0.0, "user_skew": 0.0, "seasonality": "flat", "basket_sizes": None}
+SKEW = {}
+
+# How shards hand rows back to the parent: raw CSV (CSV-only runs) or pickled rows
+PART_FORMAT = "pickle"
+PART_DIR = "."
+BATCH_SIZE = 10000
+
+# GLOBAL CACHES
+# Products and users are kept as compact id-indexed columns (index = id - 1)
+# instead of lists of dicts, so transactions can be streamed at any count.
+category_cache = [] 
+color_names = []
+color_index = {}
+product_prices = array('d')
+product_colors = array('I')
+product_categories = array('I')
+user_columns = {
+    "name": [], "address": [], "city": [], "state": [], "country": [], "postcode": []
+}
+
+# CONSTANTS
+CO2_RATINGS = [
+    "None", "A (Lowest Impact)", "B (Low Impact)", 
+    "C (Moderate Impact)", "D (Higher Impact)", "E (Highest Impact)"
+]
+
+CATEGORY_STRUCTURE = {
+    "Hand Tools": [
+        "Hammer", "Claw Hammer", "Mallet", "Sledgehammer",
+        "Wood Saw", "Hand Saw", "Hacksaw", "Chisel", "File",
+        "Adjustable wrench", "Wrench", "Pipe Wrench", "Torque Wrench",
+        "Open-end spanners (Set)", "Phillips Screwdriver", "Screwdriver", 
+        "Pliers", "Combination Pliers", "Bolt Cutters", "Long Nose Pliers", "Slip Joint Pliers",
+        "Utility Knife", "Tape Measure", "Level"
+    ],
+    "Power Tools": [
+        "Sheet Sander", "Belt Sander", "Random Orbit Sander", "Sander",
+        "Cordless Drill", "Cordless Drill 18V", "Drill Bits", "Drill",
+        "Grinder", "Angle Grinder", "Circular Saw", "Jigsaw", "Reciprocating Saw", "Saw",
+        "Heat Gun", "Router", "Planer"
+    ],
+    "Rentals": [
+        "Crane", "Excavator", "Bulldozer", "Jackhammer", 
+        "Concrete Mixer", "Generator", "Welding Machine", "Air Compressor", "Pressure Washer"
+    ],
+    "Other": [
+        "Safety Goggles", "Work Gloves", "Tool Box", "Ladder", "Extension Cord", "Wheelbarrow"
+    ]
+}
+
+HEADERS = {
+    "categories": ["id", "parent_id", "name", "slug"],
+    "users": ["id", "first_name", "last_name", "address", "city", "state", 
+              "country", "postcode", "phone", "dob", "email", "password", "role"],
+    "products": ["id", "name", "description", "stock", "price", "brand_id", 
+                 "category_id", "product_image_id", "is_location_offer", "is_rental", "co2_rating"],
+    "transactions": ["id", "user_id", "invoice_date", "invoice_number", 
+                     "billing_address", "billing_city", "billing_state", "billing_country", "billing_postcode",
+                     "total", "payment_method", "payment_account_name", "payment_account_number", 
+                     "created_at", "status", "purchased_items"],
+}
+
+TRANSACTION_STATUSES = [
+    "AWAITING_FULFILLMENT", "ON_HOLD", 
+    "AWAITING_SHIPMENT", "SHIPPED", "COMPLETED"
+]
+
+PAYMENT_METHODS = ["Cash on Delivery", "Credit Card", "Bank Transfer", "Gift Card", "Buy Now Pay Later"]
+
+ADJECTIVES = ["durable", "lightweight", "heavy-duty", "ergonomic", "precision-engineered", 
+              "compact", "versatile", "high-performance", "reliable", "industry-standard"]
+USE_CASES = ["professional construction", "home DIY projects", "industrial applications", 
+             "precision tasks", "heavy lifting", "everyday repairs"]
+
+# LOOKUP HELPERS
+def intern_color(color):
+    idx = color_index.get(color)
+    if idx is None:
+        idx = len(color_names)
+        color_index[color] = idx
+        color_names.append(color)
+    return idx
+
+def product_record(idx):
+    # Rebuild the {"id", "name", "price"} dict used in purchased_items on demand
+    name = f"{color_names[product_colors[idx]].capitalize()} {category_cache[product_categories[idx]]['name']}"
+    return {"id": idx + 1, "name": name, "price": product_prices[idx]}
+
+def years_before(moment, years):
+    try:
+        return moment.replace(year=moment.year - years)
+    except ValueError:  # 29 Feb
+        return moment.replace(year=moment.year - years, day=28)
+
+def dob_window():
+    # Same window as fake.date_of_birth(minimum_age=18, maximum_age=70), anchored on AS_OF
+    today = AS_OF.date()
+    return years_before(today, 71) + timedelta(days=1), years_before(today, 18)
+
+def date_of_birth():
+    date_start, date_end = dob_window()
+    return fake.date_between_dates(date_start=date_start, date_end=date_end)
+
+def invoice_datetime():
+    if "days" not in SKEW:
+        return fake.date_time_between(start_date=AS_OF - INVOICE_WINDOW, end_date=AS_OF)
+    day = distributions.alias_draw(SKEW["days"], random.random)
+    hour = distributions.alias_draw(SKEW["hours"], random.random)
+    return AS_OF - INVOICE_WINDOW + timedelta(days=day, hours=hour, seconds=random.randrange(3600))
+
+# WORKLOAD SAMPLING
+# Uniform draws unless the matching alias table is in SKEW
+
+def build_skew():
+    SKEW.clear()
+    if WORKLOAD["product_skew"] > 0:
+        weights = distributions.zipf_weights(len(product_prices), WORKLOAD["product_skew"],
+                                             random.Random(f"{SEED}:products"))
+        SKEW["products"] = distributions.build_alias(weights)
+    if WORKLOAD["user_skew"] > 0:
+        weights = distributions.zipf_weights(len(user_columns["name"]), WORKLOAD["user_skew"],
+                                             random.Random(f"{SEED}:users"))
+        SKEW["users"] = distributions.build_alias(weights)
+    if WORKLOAD["basket_sizes"]:
+        SKEW["basket"] = distributions.build_alias(WORKLOAD["basket_sizes"])
+    if WORKLOAD["seasonality"] != "flat":
+        days = INVOICE_WINDOW.days
+        profile = WORKLOAD["seasonality"]
+        SKEW["days"] = distributions.build_alias(distributions.day_weights(AS_OF - INVOICE_WINDOW, days, profile))
+        SKEW["hours"] = distributions.build_alias(distributions.hour_weights(profile))
+
+def draw_user(user_count):
+    if "users" not in SKEW:
+        return random.randrange(user_count)
+    return distributions.alias_draw(SKEW["users"], random.random)
+
+def draw_basket(product_count):
+    if "basket" in SKEW:
+        num_items = min(distributions.alias_draw(SKEW["basket"], random.random) + 1, product_count)
+    else:
+        num_items = random.randint(1, 5)
+    if "products" not in SKEW:
+        return random.sample(range(product_count), num_items)
+    return distributions.distinct_draws(SKEW["products"], num_items, random.random)
+
+# TEXT FIELDS
+# Live Faker calls, or indexed sampling from POOLS in pool mode
+
+def person_fields(i):
+    if POOLS is None:
+        return (
+            fake.first_name(), fake.last_name(), fake.street_address(), fake.city(),
+            fake.state(), fake.country(), fake.postcode(), fake.numerify('(###) ###-####'),
+            date_of_birth().strftime("%Y-%m-%d"), fake.email()
+        )
+
+    fname = random.choice(POOLS["first_name"])
+    lname = random.choice(POOLS["last_name"])
+    date_start, date_end = dob_window()
+    dob = date_start + timedelta(days=random.randrange((date_end - date_start).days + 1))
+    return (
+        fname, lname, random.choice(POOLS["street_address"]), random.choice(POOLS["city"]),
+        random.choice(POOLS["state"]), random.choice(POOLS["country"]),
+        random.choice(POOLS["postcode"]), random.choice(POOLS["phone"]),
+        dob.strftime("%Y-%m-%d"),
+        faker_pools.unique_email(fname, lname, random.choice(POOLS["email_domain"]), i)
+    )
+
+def color_name():
+    if POOLS is None:
+        return fake.color_name()
+    return random.choice(POOLS["color_name"])
+
+def image_id(i):
+    if POOLS is None:
+        return "01J" + fake.bothify(text='?#?#?#?#?#?#?#?#?#?#?#?#').upper()
+    return "01J" + faker_pools.unique_image_id(random.choice(POOLS["image_id"]), i)
+
+# WORKER STATE
+def export_state():
+    return {
+        "as_of": AS_OF,
+        "backend": BACKEND,
+        "pools": POOLS,
+        "part_format": PART_FORMAT,
+        "skew": SKEW,
+        "categories": category_cache,
+        "color_names": color_names,
+        "product_prices": product_prices,
+        "product_colors": product_colors,
+        "product_categories": product_categories,
+        "user_columns": user_columns,
+    }
+
+def load_state(state):
+    # Pool initializer: copy the parent's lookups into a worker process
+    global AS_OF, BACKEND, POOLS, PART_FORMAT
+    AS_OF = state["as_of"]
+    BACKEND = state["backend"]
+    POOLS = state["pools"]
+    PART_FORMAT = state["part_format"]
+    skew = dict(state["skew"])
+    SKEW.clear()
+    SKEW.update(skew)
+    # Under fork the state may alias these very objects, so copy before clearing
+    colors = list(state["color_names"])
+    category_cache[:] = state["categories"]
+    color_names[:] = []
+    color_index.clear()
+    for color in colors:
+        intern_color(color)
+    product_prices[:] = state["product_prices"]
+    product_colors[:] = state["product_colors"]
+    product_categories[:] = state["product_categories"]
+    for key in user_columns:
+        user_columns[key][:] = state["user_columns"][key]
+
+# ROW PRODUCERS
+# Each producer yields CSV rows for ids [start, stop) and records the lookups
+# later entities need into `columns`, which the shard hands back to the parent.
+
+def user_rows(start, stop, columns):
+    for i in range(start, stop):
+        (fname, lname, addr, city, state, country, postcode,
+         clean_phone, dob_sql, email) = person_fields(i)
+
+        columns["name"].append(f"{fname} {lname}")
+        columns["address"].append(addr)
+        columns["city"].append(city)
+        columns["state"].append(state)
+        columns["country"].append(country)
+        columns["postcode"].append(postcode)
+
+        yield [
+            i, fname, lname, addr, city, state, country, postcode,
+            clean_phone, dob_sql, email, 
+            "9e2ed9cb4bf54a6b9dc4669a1d295466b2585c4346092bffb5333098431cd61d", 
+            "user"
+        ]
+
+def product_rows(start, stop, columns):
+    for i in range(start, stop):
+        cat_idx = random.randrange(len(category_cache))
+        cat_id = category_cache[cat_idx]['id']
+        cat_name = category_cache[cat_idx]['name']
+        
+        color = color_name()
+        name = f"{color.capitalize()} {cat_name}"
+        price = round(random.uniform(5.00, 200.00), 2)
+        
+        adj = random.choice(ADJECTIVES)
+        use = random.choice(USE_CASES)
+        description = f"This {adj} {name} is designed for {use}. It features a robust build quality ensuring long-lasting performance in any environment."
+
+        mock_image_id = image_id(i)
+
+        columns["price"].append(price)
+        columns["color"].append(color)
+        columns["category"].append(cat_idx)
+
+        yield [
+            i, name, description,
+            random.randint(0, 100), price,
+            random.randint(1, 10), cat_id,
+            mock_image_id,
+            random.choice([0, 1]), random.choice([0, 1]),
+            random.choice(CO2_RATINGS)
+        ]
+
+def transaction_rows(start, stop, columns):
+    product_count = len(product_prices)
+    user_count = len(user_columns["name"])
+
+    for i in range(start, stop):
+        user_idx = draw_user(user_count)
+        
+        cart_items = [product_record(p) for p in draw_basket(product_count)]
+        cart_total = sum(item['price'] for item in cart_items)
+        items_json = ItemsJSON(cart_items)
+        
+        inv_date = invoice_datetime()
+        inv_date_str = inv_date.strftime("%Y-%m-%d %H:%M:%S")
+
+        yield [
+            i,
+            user_idx + 1,
+            inv_date_str,
+            f"INV-{inv_date.year}{i:08d}",
+            user_columns['address'][user_idx], user_columns['city'][user_idx], 
+            user_columns['state'][user_idx], user_columns['country'][user_idx], 
+            user_columns['postcode'][user_idx],
+            round(cart_total, 2),
+            random.choice(PAYMENT_METHODS),
+            user_columns['name'][user_idx],
+            fake.bothify(text='#########???').upper(),
+            inv_date_str,
+            random.choice(TRANSACTION_STATUSES),
+            items_json
+        ]
+
+# NUMPY ROW PRODUCERS
+# Same rows as above, but numeric columns come from numpy_backend in bulk.
+
+def product_rows_numpy(start, stop, columns, rng):
+    for chunk_start, chunk_stop in numpy_backend.chunks(start, stop):
+        cols = numpy_backend.product_columns(
+            rng, chunk_stop - chunk_start, len(category_cache),
+            len(ADJECTIVES), len(USE_CASES), len(CO2_RATINGS)
+        )
+        for j, i in enumerate(range(chunk_start, chunk_stop)):
+            cat_idx = cols["category"][j]
+            color = color_name()
+            name = f"{color.capitalize()} {category_cache[cat_idx]['name']}"
+            price = cols["price"][j]
+            description = f"This {ADJECTIVES[cols['adjective'][j]]} {name} is designed for {USE_CASES[cols['use_case'][j]]}. It features a robust build quality ensuring long-lasting performance in any environment."
+            mock_image_id = image_id(i)
+
+            columns["price"].append(price)
+            columns["color"].append(color)
+            columns["category"].append(cat_idx)
+
+            yield [
+                i, name, description,
+                cols["stock"][j], price,
+                cols["brand_id"][j], category_cache[cat_idx]['id'],
+                mock_image_id,
+                cols["is_location_offer"][j], cols["is_rental"][j],
+                CO2_RATINGS[cols["co2"][j]]
+            ]
+
+def transaction_rows_numpy(start, stop, columns, rng):
+    window_start = AS_OF - INVOICE_WINDOW
+    for chunk_start, chunk_stop in numpy_backend.chunks(start, stop):
+        cols = numpy_backend.transaction_columns(
+            rng, chunk_stop - chunk_start, len(user_columns["name"]), len(product_prices),
+            int(INVOICE_WINDOW.total_seconds()), len(PAYMENT_METHODS), len(TRANSACTION_STATUSES),
+            SKEW
+        )
+        for j, i in enumerate(range(chunk_start, chunk_stop)):
+            user_idx = cols["user"][j]
+            cart_items = [product_record(p) for p in cols["items"][j]]
+            cart_total = sum(item['price'] for item in cart_items)
+            inv_date = window_start + timedelta(seconds=cols["offset_seconds"][j])
+            inv_date_str = inv_date.strftime("%Y-%m-%d %H:%M:%S")
+
+            yield [
+                i,
+                user_idx + 1,
+                inv_date_str,
+                f"INV-{inv_date.year}{i:08d}",
+                user_columns['address'][user_idx], user_columns['city'][user_idx], 
+                user_columns['state'][user_idx], user_columns['country'][user_idx], 
+                user_columns['postcode'][user_idx],
+                round(cart_total, 2),
+                PAYMENT_METHODS[cols["payment"][j]],
+                user_columns['name'][user_idx],
+                fake.bothify(text='#########???').upper(),
+                inv_date_str,
+                TRANSACTION_STATUSES[cols["status"][j]],
+                ItemsJSON(cart_items)
+            ]
+
+NUMPY_PRODUCERS = {
+    "products": product_rows_numpy,
+    "transactions": transaction_rows_numpy,
+}
+
+ROW_PRODUCERS = {
+    "users": (user_rows, lambda: {key: [] for key in user_columns}),
+    "products": (product_rows, lambda: {"price": array('d'), "color": [], "category": array('I')}),
+    "transactions": (transaction_rows, lambda: None),
+}
+
+def shard_rows(entity, start, stop, seed, columns):
+    producer, _ = ROW_PRODUCERS[entity]
+
+    # Each shard has its own deterministic random streams
+    fake.seed_instance(seed)
+    random.seed(seed)
+
+    if BACKEND == "numpy" and entity in NUMPY_PRODUCERS:
+        return NUMPY_PRODUCERS[entity](start, stop, columns, numpy_backend.shard_rng(seed))
+    return producer(start, stop, columns)
+
+def run_shard(task):
+    entity, start, stop, seed, part_file = task
+    columns = ROW_PRODUCERS[entity][1]()
+    rows = shard_rows(entity, start, stop, seed, columns)
+
+    if PART_FORMAT == "pickle":
+        write_pickled_part(part_file, rows)
+    else:
+        with open(part_file, mode='w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows(rows)
+    return columns
+
+# PIPELINE
+def fan_out(sinks, entity, rows):
+    # Single pass over the rows: every batch goes to every sink
+    headers = HEADERS[entity]
+    for sink in sinks:
+        sink.open_table(entity, headers)
+    for batch in batches(rows, BATCH_SIZE):
+        for sink in sinks:
+            sink.write_batch(batch)
+    for sink in sinks:
+        sink.close_table()
+
+def merge_columns(entity, columns):
+    if entity == "users":
+        user_columns["name"].extend(columns["name"])
+        user_columns["address"].extend(columns["address"])
+        for key in ("city", "state", "country", "postcode"):
+            user_columns[key].extend(sys.intern(value) for value in columns[key])
+    elif entity == "products":
+        product_prices.extend(columns["price"])
+        product_colors.extend(intern_color(color) for color in columns["color"])
+        product_categories.extend(columns["category"])
+
+def generate_entity(sinks, entity, count, workers, first_id=1):
+    global PART_FORMAT
+    print(f"Generating {count} {entity} (ids {first_id}..{first_id + count - 1})...")
+
+    # Appended ranges get their own seeds, so growing a data set is reproducible too
+    seed_key = entity if first_id == 1 else f"{entity}+{first_id}"
+
+    tasks = []
+    for shard, (start, stop) in enumerate(shard_ranges(count, workers, first_id)):
+        part_file = part_filename(os.path.join(PART_DIR, entity), shard)
+        tasks.append((entity, start, stop, derive_seed(SEED, seed_key, shard), part_file))
+
+    if len(tasks) == 1:
+        # In-process: stream rows straight from the producer into the sinks
+        entity, start, stop, seed, _ = tasks[0]
+        columns = ROW_PRODUCERS[entity][1]()
+        fan_out(sinks, entity, shard_rows(entity, start, stop, seed, columns))
+        results = [columns]
+    else:
+        # A lone CSV sink can concatenate the shards' CSV output byte for byte
+        csv_only = len(sinks) == 1 and isinstance(sinks[0], CSVSink)
+        PART_FORMAT = "csv" if csv_only else "pickle"
+        results = run_shards(run_shard, tasks, workers, load_state, (export_state(),))
+        part_files = [task[-1] for task in tasks]
+        if csv_only:
+            sinks[0].merge_parts(entity, HEADERS[entity], part_files)
+        else:
+            fan_out(sinks, entity, iter_pickled_parts(part_files))
+
+    for columns in results:
+        if columns:
+            merge_columns(entity, columns)
+
+# GENERATION FUNCTIONS
+
+def generate_categories(sinks, count=50):
+    print(f"Generating {count} categories...")
+    global category_cache
+    rows = []
+    
+    current_id = 1
+
+    parents = {}
+    for parent_name in CATEGORY_STRUCTURE.keys():
+        slug = parent_name.lower().replace(" ", "-")
+        rows.append([current_id, None, parent_name, slug])
+        parents[parent_name] = current_id
+        category_cache.append({"id": current_id, "name": parent_name})
+        current_id += 1
+
+    all_children = []
+    for p_name, children in CATEGORY_STRUCTURE.items():
+        for c_name in children:
+            all_children.append((p_name, c_name))
+            
+    remaining_slots = count - len(parents)
+    
+    for i in range(remaining_slots):
+        if i < len(all_children):
+            parent_name, child_name = all_children[i]
+            parent_id = parents[parent_name]
+            name = child_name
+        else:
+            name = f"Specialty Tool {i}"
+            parent_id = parents["Other"]
+
+        slug = name.lower().replace(" ", "-")
+        
+        category_cache.append({"id": current_id, "name": name})
+        rows.append([current_id, parent_id, name, slug])
+        current_id += 1
+
+    fan_out(sinks, "categories", rows)
+
+def generate_users(sinks, count=50, workers=1, first_id=1):
+    generate_entity(sinks, "users", count, workers, first_id)
+
+def generate_products(sinks, count=1000, workers=1, first_id=1):
+    if not category_cache:
+        print("Error: Category cache empty.")
+        return
+    generate_entity(sinks, "products", count, workers, first_id)
+
+def generate_transactions(sinks, count=1000, workers=1, first_id=1):
+    if not product_prices or not user_columns["name"]:
+        print("Error: Caches empty. Script execution order is wrong.")
+        return
+    build_skew()
+    generate_entity(sinks, "transactions", count, workers, first_id)
+
+# APPEND MODE
+# Rebuild only the lookups later entities need from the existing CSV files and
+# return the high-water-mark id of every table.
+
+def read_csv_rows(out_dir, table):
+    path = os.path.join(out_dir, f"{table}.csv")
+    if not os.path.exists(path):
+        print(f"Error: {path} not found. Append mode needs the CSVs of a previous run.")
+        exit()
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        yield from reader
+
+def check_id(table, row_id, expected):
+    if int(row_id) != expected:
+        print(f"Error: {table}.csv ids are not contiguous (expected {expected}, found {row_id}).")
+        exit()
+
+def last_csv_id(out_dir, table):
+    # Only the tail of the file is read: ids are the first column and rows are in id order
+    path = os.path.join(out_dir, f"{table}.csv")
+    if not os.path.exists(path):
+        return 0
+    with open(path, mode='rb') as file:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        block = 65536
+        while True:
+            file.seek(max(0, size - block))
+            lines = file.read().splitlines()
+            if len(lines) > 2 or block >= size:
+                break
+            block *= 2
+    last = lines[-1].split(b",", 1)[0] if len(lines) > 1 else b""
+    return int(last) if last.isdigit() else 0
+
+def load_existing(out_dir):
+    print(f"Loading existing data from {out_dir}...")
+    category_index = {}
+    for row in read_csv_rows(out_dir, "categories"):
+        category_index[int(row[0])] = len(category_cache)
+        category_cache.append({"id": int(row[0]), "name": row[2]})
+
+    user_count = 0
+    for row in read_csv_rows(out_dir, "users"):
+        check_id("users", row[0], user_count + 1)
+        user_columns["name"].append(f"{row[1]} {row[2]}")
+        user_columns["address"].append(row[3])
+        user_columns["city"].append(sys.intern(row[4]))
+        user_columns["state"].append(sys.intern(row[5]))
+        user_columns["country"].append(sys.intern(row[6]))
+        user_columns["postcode"].append(sys.intern(row[7]))
+        user_count += 1
+
+    product_count = 0
+    for row in read_csv_rows(out_dir, "products"):
+        check_id("products", row[0], product_count + 1)
+        cat_idx = category_index[int(row[6])]
+        # name is "<Color> <category name>"; the colour is all product_record needs
+        color = row[1][:-(len(category_cache[cat_idx]["name"]) + 1)]
+        product_prices.append(float(row[4]))
+        product_colors.append(intern_color(color))
+        product_categories.append(cat_idx)
+        product_count += 1
+
+    return {
+        "users": user_count,
+        "products": product_count,
+        "transactions": last_csv_id(out_dir, "transactions"),
+    }
+
+# COMMAND LINE
+def main(default_formats, description):
+    global AS_OF, BACKEND, POOLS, PART_DIR
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--format", nargs="+", choices=sorted(FORMATS), default=default_formats,
+                        help="File formats to write in the same pass (default: %(default)s)")
+    parser.add_argument("--out-dir", default=".",
+                        help="Directory for the generated files")
+    parser.add_argument("--categories", type=int, default=50, help="Number of categories")
+    parser.add_argument("--users", type=int, default=50, help="Number of users")
+    parser.add_argument("--products", type=int, default=1000, help="Number of products")
+    parser.add_argument("--transactions", type=int, default=1000, help="Number of transactions")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes; each entity's id range is split into this many shards")
+    parser.add_argument("--as-of", default=None,
+                        help="Reference date YYYY-MM-DD for invoice dates and ages (default: today)")
+    parser.add_argument("--backend", choices=["python", "numpy"], default="python",
+                        help="Draw numeric product/transaction columns per row (python) or in bulk (numpy)")
+    parser.add_argument("--faker-mode", choices=["live", "pool"], default="live",
+                        help="Call Faker per field (live) or sample from cached value pools (pool)")
+    parser.add_argument("--pool-size", type=int, default=faker_pools.DEFAULT_POOL_SIZE,
+                        help="Values per field in pool mode")
+    parser.add_argument("--locale", default="en_US",
+                        help="Faker locale used to build the pools")
+    parser.add_argument("--product-skew", type=float, default=0.0, metavar="S",
+                        help="Zipf exponent for product popularity in transactions (0 = uniform, e.g. 1.1)")
+    parser.add_argument("--user-skew", type=float, default=0.0, metavar="S",
+                        help="Zipf exponent for how often each user buys (0 = uniform)")
+    parser.add_argument("--seasonality", choices=["flat"] + sorted(distributions.SEASONALITY), default="flat",
+                        help="Month/weekday/hour-of-day profile for invoice dates")
+    parser.add_argument("--basket-sizes", metavar="W1,W2,...",
+                        help="Relative weights of baskets with 1, 2, ... items (default: uniform 1-5)")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="Also load the rows straight into this SQLite file")
+    parser.add_argument("--sql-dump", metavar="PATH",
+                        help="Also write a SQL dump")
+    parser.add_argument("--dump-style", choices=["insert", "copy"], default="insert",
+                        help="Multi-row INSERT statements or PostgreSQL COPY blocks for --sql-dump")
+    parser.add_argument("--no-files", action="store_true",
+                        help="Skip the --format files (e.g. only load --sqlite)")
+    parser.add_argument("--append", action="store_true",
+                        help="Grow the CSVs in --out-dir: the entity counts become the number of new rows")
+    args = parser.parse_args()
+
+    AS_OF = parse_as_of(args.as_of)
+    BACKEND = args.backend
+    if BACKEND == "numpy":
+        numpy_backend.require_numpy()
+    WORKLOAD["product_skew"] = args.product_skew
+    WORKLOAD["user_skew"] = args.user_skew
+    WORKLOAD["seasonality"] = args.seasonality
+    if args.basket_sizes:
+        WORKLOAD["basket_sizes"] = distributions.parse_weights(args.basket_sizes)
+    if args.faker_mode == "pool":
+        POOLS = faker_pools.load_pools(args.locale, SEED, args.pool_size)
+
+    PART_DIR = args.out_dir
+    os.makedirs(args.out_dir, exist_ok=True)
+    formats = [] if args.no_files else args.format
+    if args.append and "csv" not in formats:
+        print("Error: --append grows the CSV files, so --format must include csv.")
+        return
+    sinks = build_sinks(formats, args.out_dir, args.sqlite, args.sql_dump, args.dump_style, args.append)
+    if not sinks:
+        print("Error: Nothing to write. Pass --format, --sqlite or --sql-dump.")
+        return
+
+    try:
+        if args.append:
+            high = load_existing(args.out_dir)
+            generate_users(sinks, args.users, args.workers, high["users"] + 1)
+            generate_products(sinks, args.products, args.workers, high["products"] + 1)
+            generate_transactions(sinks, args.transactions, args.workers, high["transactions"] + 1)
+        else:
+            generate_categories(sinks, args.categories)
+            generate_users(sinks, args.users, args.workers)
+            generate_products(sinks, args.products, args.workers)
+            generate_transactions(sinks, args.transactions, args.workers)
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    written = "3 tables appended" if args.append else "4 tables written"
+    print(f"\nSUCCESS! {written} to: {', '.join(sink.target for sink in sinks)}")
@@ -0,0 +1,116 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# NUMPY BACKEND
+# Draws the numeric / categorical columns of products and transactions in bulk
+# with a NumPy Generator; Faker is only used for the text fields.
+#
+# Seed contract:
+#   * every shard uses np.random.default_rng(shard_seed), where shard_seed is the
+#     same derive_seed(SEED, entity, shard) value that seeds Faker for that shard;
+#   * ids are processed in blocks of CHUNK_SIZE, and inside a block the columns
+#     are drawn in exactly the order of the functions below;
+#   * a configured workload distribution (see distributions.py) replaces the
+#     uniform draw of its column in place, so unskewed columns keep their values;
+#   * so a (seed, workers, as_of) triple always yields the same files, but the
+#     values differ from the default "python" backend, which uses `random`.
+
+CHUNK_SIZE = 65536
+MAX_ITEMS = 5
+
+def require_numpy():
+    if np is None:
+        print("Error: The 'numpy' library is not installed.")
+        print("Please run: pip install numpy")
+        exit()
+
+def shard_rng(seed):
+    return np.random.default_rng(seed)
+
+def chunks(start, stop, size=CHUNK_SIZE):
+    for chunk_start in range(start, stop, size):
+        yield chunk_start, min(chunk_start + size, stop)
+
+def alias_draws(rng, table, size):
+    # Vectorized distributions.alias_draw over the table's arrays (no copies)
+    prob = np.frombuffer(table[0], dtype=np.float64)
+    alias = np.frombuffer(table[1], dtype=np.uint32)
+    u = rng.random(size) * len(prob)
+    idx = u.astype(np.int64)
+    return np.where(u - idx < prob[idx], idx, alias[idx])
+
+def alias_distinct(rng, table, k):
+    picks = []
+    while len(picks) < k:
+        for value in alias_draws(rng, table, 2 * k).tolist():
+            if value not in picks:
+                picks.append(value)
+                if len(picks) == k:
+                    break
+    return picks
+
+def product_columns(rng, n, category_count, adjective_count, use_case_count, co2_count):
+    return {
+        "category": rng.integers(0, category_count, n).tolist(),
+        "price": np.round(rng.uniform(5.00, 200.00, n), 2).tolist(),
+        "adjective": rng.integers(0, adjective_count, n).tolist(),
+        "use_case": rng.integers(0, use_case_count, n).tolist(),
+        "stock": rng.integers(0, 101, n).tolist(),
+        "brand_id": rng.integers(1, 11, n).tolist(),
+        "is_location_offer": rng.integers(0, 2, n).tolist(),
+        "is_rental": rng.integers(0, 2, n).tolist(),
+        "co2": rng.integers(0, co2_count, n).tolist(),
+    }
+
+def sample_products(rng, num_items, product_count, max_items=MAX_ITEMS, table=None):
+    # Distinct product indices per row, like random.sample(range(product_count), k)
+    n = len(num_items)
+    if table is None:
+        picks = rng.integers(0, product_count, (n, max_items))
+    else:
+        picks = alias_draws(rng, table, (n, max_items))
+
+    # Unused slots get unique negative sentinels so only real picks can collide
+    slots = np.arange(max_items)
+    masked = np.where(slots < num_items[:, None], picks, -1 - slots)
+    masked.sort(axis=1)
+    has_dupes = (np.diff(masked, axis=1) == 0).any(axis=1)
+
+    baskets = [row[:k] for row, k in zip(picks.tolist(), num_items.tolist())]
+    for idx in np.flatnonzero(has_dupes).tolist():
+        if table is None:
+            baskets[idx] = rng.choice(product_count, num_items[idx], replace=False).tolist()
+        else:
+            baskets[idx] = alias_distinct(rng, table, int(num_items[idx]))
+    return baskets
+
+def offset_seconds(rng, n, window_seconds, skew):
+    if "days" not in skew:
+        return rng.integers(0, window_seconds + 1, n)
+    days = alias_draws(rng, skew["days"], n)
+    hours = alias_draws(rng, skew["hours"], n)
+    return days * 86400 + hours * 3600 + rng.integers(0, 3600, n)
+
+def transaction_columns(rng, n, user_count, product_count, window_seconds, payment_count, status_count,
+                        skew=None):
+    # skew: the alias tables of generator_core.SKEW ("users", "products", "basket", "days", "hours")
+    skew = skew or {}
+    if "basket" in skew:
+        max_items = min(len(skew["basket"][0]), product_count)
+        num_items = np.minimum(alias_draws(rng, skew["basket"], n) + 1, max_items)
+    else:
+        max_items = MAX_ITEMS
+        num_items = rng.integers(1, MAX_ITEMS + 1, n)
+    if "users" in skew:
+        users = alias_draws(rng, skew["users"], n)
+    else:
+        users = rng.integers(0, user_count, n)
+    return {
+        "user": users.tolist(),
+        "items": sample_products(rng, num_items, product_count, max_items, skew.get("products")),
+        "offset_seconds": offset_seconds(rng, n, window_seconds, skew).tolist(),
+        "payment": rng.integers(0, payment_count, n).tolist(),
+        "status": rng.integers(0, status_count, n).tolist(),
+    }
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import pickle
+import shutil
+from datetime import datetime
+from multiprocessing import Pool
+
+# SHARDING HELPERS
+# Shared by csv_generator.py and toolshop_data_generator.py.
+# Every shard owns a contiguous id range and a seed derived from the global seed,
+# so the output only depends on (seed, workers, as_of) and never on scheduling.
+
+def derive_seed(base_seed, entity, shard_index):
+    key = f"{base_seed}:{entity}:{shard_index}".encode("utf-8")
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
+
+def shard_ranges(count, workers, first_id=1):
+    # Split ids first_id..first_id+count-1 into `workers` contiguous [start, stop) ranges
+    workers = max(1, min(workers, count)) if count > 0 else 1
+    base, extra = divmod(count, workers)
+    ranges = []
+    start = first_id
+    for shard in range(workers):
+        stop = start + base + (1 if shard < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def parse_as_of(value):
+    # Reference "now" for date columns; pinning it makes runs reproducible across days
+    if value:
+        return datetime.strptime(value, "%Y-%m-%d")
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+def run_shards(shard_fn, tasks, workers, initializer=None, initargs=()):
+    # Results come back in task order regardless of which process finishes first.
+    # In-process runs skip the initializer: the caller already holds the state.
+    if workers <= 1 or len(tasks) <= 1:
+        return [shard_fn(task) for task in tasks]
+
+    with Pool(processes=min(workers, len(tasks)), initializer=initializer, initargs=initargs) as pool:
+        return pool.map(shard_fn, tasks, chunksize=1)
+
+def part_filename(filename, shard_index):
+    return f"{filename}.part{shard_index:04d}"
+
+def merge_parts(filename, part_files):
+    # Append shard files (no headers) to the already-written header, then clean up
+    with open(filename, mode='ab') as out:
+        for part in part_files:
+            with open(part, mode='rb') as src:
+                shutil.copyfileobj(src, out, 1024 * 1024)
+            os.remove(part)
+
+# Non-CSV sinks get typed rows: shards pickle them in batches, the parent replays them
+def write_pickled_part(part_file, rows, batch_size=10000):
+    with open(part_file, mode='wb') as file:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                pickle.dump(batch, file, protocol=pickle.HIGHEST_PROTOCOL)
+                batch = []
+        if batch:
+            pickle.dump(batch, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+def iter_pickled_parts(part_files):
+    for part in part_files:
+        with open(part, mode='rb') as file:
+            while True:
+                try:
+                    batch = pickle.load(file)
+                except EOFError:
+                    break
+                yield from batch
+        os.remove(part)
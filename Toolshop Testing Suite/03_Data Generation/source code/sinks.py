@@ -0,0 +1,285 @@
+import csv
+import json
+import os
+from itertools import islice
+
+from sharding import merge_parts
+from sql_sink import SCHEMA, SQLiteSink, SQLDumpSink
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+except ImportError:
+    Workbook = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# OUTPUT SINKS
+# Every sink receives the same rows from the generator core:
+#   open_table(table, headers) -> write_batch(rows) ... -> close_table(), then close()
+# Sinks that can grow an existing output in place accept append=True.
+
+class ItemsJSON(str):
+    # purchased_items as written (JSON text) with its item dicts kept alongside,
+    # so a sink that normalizes the column does not parse the text back
+    def __new__(cls, items, text=None):
+        value = super().__new__(cls, json.dumps(items) if text is None else text)
+        value.items = items
+        return value
+
+    def __reduce__(self):
+        # Worker shards pickle their rows: keep both halves, do not re-encode
+        return ItemsJSON, (self.items, str(self))
+
+def batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+class CSVSink:
+    def __init__(self, out_dir=".", append=False):
+        self.out_dir = out_dir
+        self.append = append
+        self.target = f"csv ({out_dir})"
+
+    def path(self, table):
+        return os.path.join(self.out_dir, f"{table}.csv")
+
+    def open_table(self, table, headers):
+        self.file = open(self.path(table), mode='a' if self.append else 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        if not self.append:
+            self.writer.writerow(headers)
+
+    def write_batch(self, rows):
+        self.writer.writerows(rows)
+
+    def close_table(self):
+        self.file.close()
+
+    def merge_parts(self, table, headers, part_files):
+        # Shards already wrote CSV: append their bytes after the header
+        self.open_table(table, headers)
+        self.close_table()
+        merge_parts(self.path(table), part_files)
+
+    def close(self):
+        pass
+
+class JSONLSink:
+    # One JSON object per line, keyed by the column headers
+    def __init__(self, out_dir=".", append=False):
+        self.out_dir = out_dir
+        self.append = append
+        self.target = f"jsonl ({out_dir})"
+
+    def open_table(self, table, headers):
+        self.headers = headers
+        path = os.path.join(self.out_dir, f"{table}.jsonl")
+        self.file = open(path, mode='a' if self.append else 'w', encoding='utf-8')
+
+    def write_batch(self, rows):
+        headers = self.headers
+        self.file.writelines(
+            json.dumps(dict(zip(headers, row)), ensure_ascii=False) + "\n" for row in rows
+        )
+
+    def close_table(self):
+        self.file.close()
+
+    def close(self):
+        pass
+
+class XLSXSink:
+    # Excel's hard limit per sheet, header row included
+    MAX_SHEET_ROWS = 1048576
+    # Write-only sheets emit column widths before the first row, so widths are
+    # sized from the first WIDTH_SAMPLE_ROWS rows, which are held back until then
+    WIDTH_SAMPLE_ROWS = 10000
+
+    def __init__(self, out_dir=".", append=False):
+        if append:
+            print("Error: xlsx files cannot be appended to; drop xlsx from --format.")
+            exit()
+        if Workbook is None:
+            print("Error: The 'openpyxl' library is not installed.")
+            print("Please run: pip install openpyxl")
+            exit()
+        self.out_dir = out_dir
+        self.target = f"xlsx ({out_dir})"
+
+    def open_table(self, table, headers):
+        self.filename = os.path.join(self.out_dir, f"{table}.xlsx")
+        self.headers = headers
+        self.wb = Workbook(write_only=True)
+        self.ws = None
+        self.pending = []
+        self.row_count = 0
+
+    def add_sheet(self, title):
+        ws = self.wb.create_sheet(title)
+        for idx, width in enumerate(self.widths, start=1):
+            ws.column_dimensions[get_column_letter(idx)].width = width + 2
+
+        header_cells = []
+        for h in self.headers:
+            cell = WriteOnlyCell(ws, value=h)
+            cell.font = Font(bold=True)
+            header_cells.append(cell)
+        ws.append(header_cells)
+        self.ws = ws
+        self.rows_in_sheet = 1
+
+    def start_sheets(self):
+        widths = [len(str(h)) for h in self.headers]
+        for row in self.pending:
+            for idx, value in enumerate(row):
+                length = len(str(value))
+                if length > widths[idx]:
+                    widths[idx] = length
+        self.widths = widths
+        self.sheet_no = 1
+        self.add_sheet("Sheet")
+
+        pending, self.pending = self.pending, []
+        self.append_rows(pending)
+
+    def append_rows(self, rows):
+        for row in rows:
+            if self.rows_in_sheet >= self.MAX_SHEET_ROWS:
+                self.sheet_no += 1
+                print(f"    Sheet row limit reached, continuing in Sheet{self.sheet_no}...")
+                self.add_sheet(f"Sheet{self.sheet_no}")
+            self.ws.append(row)
+            self.rows_in_sheet += 1
+
+    def write_batch(self, rows):
+        self.row_count += len(rows)
+        if self.ws is None:
+            self.pending.extend(rows)
+            if len(self.pending) >= self.WIDTH_SAMPLE_ROWS:
+                self.start_sheets()
+        else:
+            self.append_rows(rows)
+
+    def close_table(self):
+        if self.ws is None:
+            self.start_sheets()
+        print(f"    Saving {self.row_count} rows to {self.filename}...")
+        self.wb.save(self.filename)
+
+    def close(self):
+        pass
+
+class ParquetSink:
+    # Columnar output built from Arrow tables, buffered into large row groups.
+    # purchased_items is normalized into transaction_items.parquet
+    # (transaction_id, product_id, price) instead of a JSON string column, and
+    # low-cardinality text columns are dictionary-encoded. Each row group has its
+    # own dictionary, so call Table.unify_dictionaries() before group_by/joins.
+    ARROW_TYPES = {"INTEGER": "int64", "REAL": "float64", "TEXT": "string"}
+    DICTIONARY_COLUMNS = {"status", "payment_method", "billing_country", "country", "co2_rating"}
+    NORMALIZED_COLUMNS = {"purchased_items"}
+    ROW_GROUP_ROWS = 131072
+
+    def __init__(self, out_dir=".", append=False):
+        if append:
+            print("Error: parquet files cannot be appended to; drop parquet from --format.")
+            exit()
+        if pa is None:
+            print("Error: The 'pyarrow' library is not installed.")
+            print("Please run: pip install pyarrow")
+            exit()
+        self.out_dir = out_dir
+        self.target = f"parquet ({out_dir})"
+
+    def path(self, table):
+        return os.path.join(self.out_dir, f"{table}.parquet")
+
+    def open_table(self, table, headers):
+        types = {name: sql_type.split()[0] for name, sql_type in SCHEMA[table]}
+        self.keep = [idx for idx, h in enumerate(headers) if h not in self.NORMALIZED_COLUMNS]
+
+        fields = []
+        for idx in self.keep:
+            h = headers[idx]
+            if h in self.DICTIONARY_COLUMNS:
+                fields.append(pa.field(h, pa.dictionary(pa.int32(), pa.string())))
+            else:
+                fields.append(pa.field(h, self.ARROW_TYPES[types[h]]))
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(self.path(table), self.schema)
+        self.pending = []
+
+        self.items_idx = headers.index("purchased_items") if "purchased_items" in headers else None
+        self.items_writer = None
+        if self.items_idx is not None:
+            self.items_schema = pa.schema([
+                ("transaction_id", pa.int64()), ("product_id", pa.int64()), ("price", pa.float64()),
+            ])
+            self.items_writer = pq.ParquetWriter(self.path("transaction_items"), self.items_schema)
+
+    def write_batch(self, rows):
+        self.pending.extend(rows)
+        if len(self.pending) >= self.ROW_GROUP_ROWS:
+            self.flush()
+
+    def flush(self):
+        rows, self.pending = self.pending, []
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        arrays = []
+        for idx, field in zip(self.keep, self.schema):
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(columns[idx], type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(columns[idx], type=field.type))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+        if self.items_writer is not None:
+            transaction_ids, product_ids, prices = [], [], []
+            for transaction_id, items_json in zip(columns[0], columns[self.items_idx]):
+                items = getattr(items_json, "items", None)
+                for item in json.loads(items_json) if items is None else items:
+                    transaction_ids.append(transaction_id)
+                    product_ids.append(item["id"])
+                    prices.append(item["price"])
+            self.items_writer.write_table(pa.Table.from_arrays(
+                [pa.array(transaction_ids, pa.int64()), pa.array(product_ids, pa.int64()),
+                 pa.array(prices, pa.float64())],
+                schema=self.items_schema
+            ))
+
+    def close_table(self):
+        self.flush()
+        self.writer.close()
+        if self.items_writer is not None:
+            self.items_writer.close()
+
+    def close(self):
+        pass
+
+FORMATS = {
+    "csv": CSVSink,
+    "xlsx": XLSXSink,
+    "jsonl": JSONLSink,
+    "parquet": ParquetSink,
+}
+
+def build_sinks(formats, out_dir=".", sqlite=None, sql_dump=None, dump_style="insert", append=False):
+    sinks = [FORMATS[name](out_dir, append=append) for name in dict.fromkeys(formats)]
+    if sqlite:
+        sinks.append(SQLiteSink(sqlite, append=append))
+    if sql_dump:
+        sinks.append(SQLDumpSink(sql_dump, style=dump_style, append=append))
+    return sinks
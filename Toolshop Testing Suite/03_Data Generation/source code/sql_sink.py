@@ -0,0 +1,130 @@
+import sqlite3
+
+# SQL SINKS
+# Load generated rows straight into a database instead of CSV/XLSX files.
+# Each entity is written as a single transaction; rows arrive in batches.
+
+SCHEMA = {
+    "categories": [
+        ("id", "INTEGER PRIMARY KEY"), ("parent_id", "INTEGER"), ("name", "TEXT"), ("slug", "TEXT"),
+    ],
+    "users": [
+        ("id", "INTEGER PRIMARY KEY"), ("first_name", "TEXT"), ("last_name", "TEXT"),
+        ("address", "TEXT"), ("city", "TEXT"), ("state", "TEXT"), ("country", "TEXT"),
+        ("postcode", "TEXT"), ("phone", "TEXT"), ("dob", "TEXT"), ("email", "TEXT"),
+        ("password", "TEXT"), ("role", "TEXT"),
+    ],
+    "products": [
+        ("id", "INTEGER PRIMARY KEY"), ("name", "TEXT"), ("description", "TEXT"),
+        ("stock", "INTEGER"), ("price", "REAL"), ("brand_id", "INTEGER"),
+        ("category_id", "INTEGER"), ("product_image_id", "TEXT"),
+        ("is_location_offer", "INTEGER"), ("is_rental", "INTEGER"), ("co2_rating", "TEXT"),
+    ],
+    "transactions": [
+        ("id", "INTEGER PRIMARY KEY"), ("user_id", "INTEGER"), ("invoice_date", "TEXT"),
+        ("invoice_number", "TEXT"), ("billing_address", "TEXT"), ("billing_city", "TEXT"),
+        ("billing_state", "TEXT"), ("billing_country", "TEXT"), ("billing_postcode", "TEXT"),
+        ("total", "REAL"), ("payment_method", "TEXT"), ("payment_account_name", "TEXT"),
+        ("payment_account_number", "TEXT"), ("created_at", "TEXT"), ("status", "TEXT"),
+        ("purchased_items", "TEXT"),
+    ],
+}
+
+def create_table_sql(table, if_not_exists=False):
+    columns = ", ".join(f"{name} {sql_type}" for name, sql_type in SCHEMA[table])
+    guard = "IF NOT EXISTS " if if_not_exists else ""
+    return f"CREATE TABLE {guard}{table} ({columns})"
+
+class SQLiteSink:
+    # append=True keeps existing tables and only inserts the new rows
+    def __init__(self, path, append=False):
+        self.path = path
+        self.append = append
+        self.target = f"sqlite ({path})"
+        # Autocommit mode: transactions are opened and committed explicitly per table
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        # A freshly seeded file: durability during the load is not needed.
+        # Appending keeps the default journal, so a crash cannot corrupt the
+        # rows that were already there
+        if not append:
+            self.conn.execute("PRAGMA journal_mode=MEMORY")
+            self.conn.execute("PRAGMA synchronous=OFF")
+
+    def open_table(self, table, headers):
+        print(f"    Loading {table} into {self.path}...")
+        placeholders = ", ".join("?" for _ in headers)
+        self.insert_sql = f"INSERT INTO {table} ({', '.join(headers)}) VALUES ({placeholders})"
+        self.conn.execute("BEGIN")
+        if not self.append:
+            self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self.conn.execute(create_table_sql(table, if_not_exists=self.append))
+
+    def write_batch(self, rows):
+        self.conn.executemany(self.insert_sql, rows)
+
+    def close_table(self):
+        self.conn.execute("COMMIT")
+
+    def close(self):
+        self.conn.close()
+
+# SQL DUMP
+def sql_literal(value):
+    if value is None or value == "":
+        return "NULL"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+def copy_literal(value):
+    if value is None or value == "":
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+class SQLDumpSink:
+    # style="insert": multi-row INSERT ... VALUES statements (SQLite, MySQL, PostgreSQL)
+    # style="copy":   PostgreSQL COPY ... FROM stdin blocks
+    # append=True adds insert-only statements to the end of an existing dump
+    def __init__(self, path, style="insert", rows_per_insert=1000, append=False):
+        self.path = path
+        self.target = f"sql dump ({path})"
+        self.style = style
+        self.rows_per_insert = rows_per_insert
+        self.append = append
+        self.file = open(path, mode='a' if append else 'w', encoding='utf-8', newline='\n')
+
+    def open_table(self, table, headers):
+        print(f"    Dumping {table} to {self.path}...")
+        self.table = table
+        self.columns = ", ".join(headers)
+
+        out = self.file
+        out.write("BEGIN;\n")
+        if not self.append:
+            out.write(f"DROP TABLE IF EXISTS {table};\n")
+            out.write(create_table_sql(table) + ";\n")
+        if self.style == "copy":
+            out.write(f"COPY {table} ({self.columns}) FROM stdin;\n")
+
+    def write_batch(self, rows):
+        out = self.file
+        if self.style == "copy":
+            for row in rows:
+                out.write("\t".join(copy_literal(value) for value in row) + "\n")
+            return
+
+        for offset in range(0, len(rows), self.rows_per_insert):
+            values = ",\n".join(
+                "(" + ", ".join(sql_literal(value) for value in row) + ")"
+                for row in rows[offset:offset + self.rows_per_insert]
+            )
+            out.write(f"INSERT INTO {self.table} ({self.columns}) VALUES\n{values};\n")
+
+    def close_table(self):
+        if self.style == "copy":
+            self.file.write("\\.\n")
+        self.file.write("COMMIT;\n")
+
+    def close(self):
+        self.file.close()
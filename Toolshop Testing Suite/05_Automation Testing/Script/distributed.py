@@ -0,0 +1,430 @@
+import argparse
+import contextlib
+import importlib
+import ipaddress
+import json
+import os
+import queue
+import socket
+import tempfile
+import threading
+import time
+from multiprocessing import Process
+from multiprocessing.connection import Client, Listener
+
+import pandas as pd
+
+import driver_pool
+import flakiness
+import plan_compiler
+import result_sink
+import results_db
+import run_profiles
+import selection
+import tracing
+from parallel_runner import load_cases
+from suites import BROWSERS, SUITES, result_file
+
+# DISTRIBUTED EXECUTION
+# A coordinator splits a suite's test cases into shards balanced by how long
+# each case took last time, hands them to workers and writes the gathered rows
+# into the usual per-browser CSVs under "Test Result/".
+#
+# Two transports:
+#   socket  coordinator listens on HOST:PORT, workers connect (multiprocessing.connection)
+#   queue   a shared directory: pending/ -> claimed/ -> done/ task files
+#
+#   TOOLSHOP_AUTHKEY=secret python distributed.py coordinator cart --shards 6 --listen 0.0.0.0:6000
+#   TOOLSHOP_AUTHKEY=secret python distributed.py worker --connect coordinator-host:6000
+#   python distributed.py coordinator product --queue /mnt/share/q --local-workers 3
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DURATIONS_FILE = os.path.join(SCRIPT_DIR, ".test_durations.json")
+DEFAULT_DURATION = 10.0  # seconds assumed for a case that never ran
+# The built-in key is only accepted on loopback addresses; anything reachable
+# from other machines needs TOOLSHOP_AUTHKEY set on the coordinator and workers
+AUTHKEY = os.environ.get("TOOLSHOP_AUTHKEY", "toolshop").encode("utf-8")
+POLL_INTERVAL = 0.5
+
+# DURATION HISTORY
+def load_durations():
+    try:
+        with open(DURATIONS_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_durations(history, suite, browser, durations):
+    # Smoothed, so one slow run does not reshuffle every shard
+    known = history.setdefault(suite, {}).setdefault(browser, {})
+    for tc_id, seconds in durations.items():
+        known[tc_id] = round(0.5 * known[tc_id] + 0.5 * seconds, 3) if tc_id in known else round(seconds, 3)
+    tmp_file = f"{DURATIONS_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, mode="w", encoding="utf-8") as file:
+        json.dump(history, file, indent=1)
+    os.replace(tmp_file, DURATIONS_FILE)
+
+# SHARDING
+def balance_shards(records, durations, shards):
+    # Longest-processing-time first: each case goes to the least loaded shard
+    known = [durations[r["TC_ID"]] for r in records if r["TC_ID"] in durations]
+    default = sorted(known)[len(known) // 2] if known else DEFAULT_DURATION
+    weighted = sorted(records, key=lambda r: -durations.get(r["TC_ID"], default))
+
+    loads = [0.0] * shards
+    buckets = [[] for _ in range(shards)]
+    for record in weighted:
+        target = loads.index(min(loads))
+        buckets[target].append(record)
+        loads[target] += durations.get(record["TC_ID"], default)
+    return [(bucket, load) for bucket, load in zip(buckets, loads) if bucket]
+
+def build_tasks(suite, browsers, shards):
+    df = load_cases(suite)
+    history = load_durations()
+    options = selection.active_selection()
+
+    tasks = []
+    for browser in browsers:
+        cases = df
+        if options is not None:
+            # Shards run side by side: the budget is wall time, so it covers every shard
+            budget = options["budget"] * shards if options["budget"] is not None else None
+            cases = selection.select_cases(df, suite, browser, options["failed_only"], budget, browsers)
+        records = json.loads(cases.to_json(orient="records"))
+        durations = history.get(suite, {}).get(browser, {})
+        for idx, (bucket, load) in enumerate(balance_shards(records, durations, shards)):
+            tasks.append({
+                "id": f"{suite}-{browser}-{idx:02d}",
+                "suite": suite,
+                "browser": browser,
+                "rows": bucket,
+                "estimate": round(load, 1),
+            })
+    return tasks, list(df["TC_ID"])
+
+# WORKER SIDE
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def run_shard(task):
+    # The whole bucket runs in one call, on one session and one login; each
+    # case's Duration column feeds the duration history.
+    # The coordinator already selected the cases and records their outcomes.
+    selection.disable()
+    module_name, entry = SUITES[task["suite"]][:2]
+    run = getattr(importlib.import_module(module_name), entry)
+    tmp_file = os.path.join(tempfile.gettempdir(), f"toolshop_{os.getpid()}_{task['id']}.csv")
+
+    rows, durations, spans, error = [], {}, [], None
+    print(f"[Info] {worker_name()} running {task['id']} ({len(task['rows'])} cases, ~{task['estimate']}s)")
+    try:
+        # A fresh file: nothing to resume from an earlier task with the same id
+        result_sink.discard(tmp_file)
+        flakiness.run_with_retries(run, pd.DataFrame(task["rows"]), task["suite"], task["browser"], tmp_file)
+        _, rows = result_sink.read_rows(tmp_file)
+        for row in rows:
+            seconds = flakiness.to_seconds(row.get("Duration"))
+            if seconds is not None:
+                durations[row["TC_ID"]] = seconds
+        spans = tracing.read_spans(tracing.trace_files(tmp_file)[0])
+    except Exception as e:
+        error = str(e)
+    finally:
+        result_sink.discard(tmp_file)
+        tracing.remove_traces(tmp_file)
+
+    return {"id": task["id"], "browser": task["browser"], "rows": rows, "durations": durations,
+            "spans": spans, "error": error, "worker": worker_name()}
+
+def socket_worker(address):
+    host, port = address
+    driver_pool.keep_sessions_warm()
+    with Client((host, port), authkey=AUTHKEY) as conn:
+        while True:
+            conn.send({"ready": worker_name()})
+            task = conn.recv()
+            if task is None:
+                break
+            conn.send(run_shard(task))
+    driver_pool.shutdown()
+
+def queue_worker(queue_dir):
+    pending, claimed, done = queue_dirs(queue_dir)
+    driver_pool.keep_sessions_warm()
+    while not os.path.exists(os.path.join(queue_dir, "STOP")):
+        task_file = claim_task(pending, claimed)
+        if task_file is None:
+            time.sleep(POLL_INTERVAL)
+            continue
+        with open(task_file, encoding="utf-8") as file:
+            task = json.load(file)
+        write_json(os.path.join(done, f"{task['id']}.json"), run_shard(task))
+        # The coordinator may have requeued a slow claim meanwhile
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(task_file)
+    driver_pool.shutdown()
+
+# FILE QUEUE
+def queue_dirs(queue_dir):
+    dirs = [os.path.join(queue_dir, name) for name in ("pending", "claimed", "done")]
+    for path in dirs:
+        os.makedirs(path, exist_ok=True)
+    return dirs
+
+def write_json(path, data):
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, mode="w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(tmp_file, path)
+
+def claim_task(pending, claimed):
+    # rename() is atomic, so exactly one worker wins each task file. rename()
+    # keeps the mtime, so it is reset first: a claim's age counts from the
+    # claim, not from when the task was queued
+    for name in sorted(os.listdir(pending)):
+        if not name.endswith(".json"):
+            continue
+        source = os.path.join(pending, name)
+        target = os.path.join(claimed, f"{name[:-5]}@{worker_name().replace(':', '-')}.json")
+        try:
+            os.utime(source)
+            os.rename(source, target)
+            return target
+        except OSError:
+            continue
+    return None
+
+# COORDINATOR SIDE
+def serve_socket(tasks, address, expected, idle_timeout):
+    todo = queue.Queue()
+    for task in tasks:
+        todo.put(task)
+    results = {}
+    lock = threading.Lock()
+    finished = threading.Event()
+    workers = {"connected": 0, "idle_since": time.monotonic()}
+
+    def handle(conn):
+        task = None
+        with lock:
+            workers["connected"] += 1
+        try:
+            while True:
+                conn.recv()  # "ready"
+                # Idle workers stay until every shard is back: a shard lost with
+                # its worker is requeued and needs someone to pick it up
+                while task is None and not finished.is_set():
+                    try:
+                        task = todo.get(timeout=POLL_INTERVAL)
+                    except queue.Empty:
+                        pass
+                if task is None:
+                    conn.send(None)
+                    return
+                conn.send(task)
+                result = conn.recv()
+                with lock:
+                    results[result["id"]] = result
+                    if len(results) == expected:
+                        finished.set()
+                print(f"[Info] {result['id']} done by {result['worker']} ({len(results)}/{expected})")
+                task = None
+        except (EOFError, OSError):
+            if task is not None:
+                print(f"[WARN] Worker lost while running {task['id']}; requeueing")
+                todo.put(task)
+        finally:
+            with lock:
+                workers["connected"] -= 1
+                if not workers["connected"]:
+                    workers["idle_since"] = time.monotonic()
+            conn.close()
+
+    handlers = []
+    with Listener(address, authkey=AUTHKEY) as listener:
+        print(f"[Info] Coordinator listening on {address[0]}:{address[1]}")
+
+        def accept_loop():
+            while not finished.is_set():
+                try:
+                    conn = listener.accept()
+                except OSError:
+                    return
+                handler = threading.Thread(target=handle, args=(conn,), daemon=True)
+                handlers.append(handler)
+                handler.start()
+
+        threading.Thread(target=accept_loop, daemon=True).start()
+        while not finished.wait(POLL_INTERVAL):
+            with lock:
+                idle = not workers["connected"] and time.monotonic() - workers["idle_since"] > idle_timeout
+            if idle:
+                print(f"[CRITICAL] No worker connected for {idle_timeout}s; giving up")
+                finished.set()
+        # Let connected workers receive their stop message before the socket closes
+        for handler in list(handlers):
+            handler.join(timeout=4 * POLL_INTERVAL)
+
+    missing = sorted(task["id"] for task in tasks if task["id"] not in results)
+    if missing:
+        print(f"[CRITICAL] {len(missing)} shards not run: {', '.join(missing)}")
+    return list(results.values())
+
+def serve_queue(tasks, queue_dir, task_timeout):
+    pending, claimed, done = queue_dirs(queue_dir)
+    stop_file = os.path.join(queue_dir, "STOP")
+    if os.path.exists(stop_file):
+        os.remove(stop_file)
+    for task in tasks:
+        write_json(os.path.join(pending, f"{task['id']}.json"), task)
+    print(f"[Info] {len(tasks)} tasks queued in {queue_dir}")
+
+    results = {}
+    while len(results) < len(tasks):
+        for name in os.listdir(done):
+            if name.endswith(".json") and name[:-5] not in results:
+                with open(os.path.join(done, name), encoding="utf-8") as file:
+                    result = json.load(file)
+                results[result["id"]] = result
+                os.remove(os.path.join(done, name))
+                print(f"[Info] {result['id']} done by {result['worker']} ({len(results)}/{len(tasks)})")
+
+        # A claim older than task_timeout belongs to a dead worker: put it back
+        for name in os.listdir(claimed):
+            path = os.path.join(claimed, name)
+            try:
+                if time.time() - os.path.getmtime(path) > task_timeout:
+                    print(f"[WARN] {name} timed out; requeueing")
+                    os.rename(path, os.path.join(pending, name.split("@")[0] + ".json"))
+            except OSError:
+                pass
+        time.sleep(POLL_INTERVAL)
+
+    open(stop_file, "w").close()
+    return list(results.values())
+
+def gather(suite, browsers, results, tc_order):
+    history = load_durations()
+    by_browser = {browser: [] for browser in browsers}
+    spans = {browser: [] for browser in browsers}
+    for result in sorted(results, key=lambda r: r["id"]):
+        browser = result["browser"]
+        if result["error"]:
+            print(f"[CRITICAL] {result['id']} failed on {result['worker']}: {result['error']}")
+        by_browser[browser].extend(result["rows"])
+        selection.record_run(suite, browser, {
+            row["TC_ID"]: (row.get("Status", ""), row.get("Duration", "")) for row in result["rows"]
+        })
+        spans[browser].extend(result["spans"])
+        save_durations(history, suite, browser, result["durations"])
+
+    order = {tc_id: idx for idx, tc_id in enumerate(tc_order)}
+    out_files = []
+    for browser, rows in by_browser.items():
+        if not rows:
+            continue
+        df = pd.DataFrame(rows)
+        df = df.iloc[df["TC_ID"].map(order).argsort(kind="stable")]
+        out_file = result_file(suite, browser)
+        os.makedirs(os.path.dirname(out_file), exist_ok=True)
+        df = selection.keep_unselected(df, out_file, order)
+        df.to_csv(out_file, index=False, encoding="utf-8")
+        if spans[browser]:
+            tracing.write_spans(spans[browser], out_file)
+        print(f"[Info] Results for {browser} saved to: {out_file}")
+        out_files.append(out_file)
+    results_db.ingest(out_files, label=suite)
+
+def coordinate(args):
+    if not args.queue and not shared_key_ok(parse_address(args.listen)[0]):
+        return
+    # Bad rows stop the run before any shard is handed out
+    if plan_compiler.load_plans(args.suite, load_cases(args.suite)) is None:
+        return
+    tasks, tc_order = build_tasks(args.suite, args.browsers, args.shards)
+    print(f"Coordinating {args.suite}: {len(tasks)} shards over {', '.join(args.browsers)}")
+
+    local = []
+    for _ in range(args.local_workers):
+        target, arg = (queue_worker, args.queue) if args.queue else (socket_worker, parse_address(args.listen))
+        local.append(Process(target=delayed_start, args=(target, arg)))
+    for process in local:
+        process.start()
+
+    if args.queue:
+        results = serve_queue(tasks, args.queue, args.task_timeout)
+    else:
+        results = serve_socket(tasks, parse_address(args.listen), len(tasks), args.idle_timeout)
+
+    for process in local:
+        process.join()
+    gather(args.suite, args.browsers, results, tc_order)
+
+def delayed_start(target, arg):
+    # Local workers may start before the listener is up: retry briefly
+    for _ in range(20):
+        try:
+            return target(arg)
+        except ConnectionRefusedError:
+            time.sleep(POLL_INTERVAL)
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def shared_key_ok(host):
+    if is_loopback(host) or "TOOLSHOP_AUTHKEY" in os.environ:
+        return True
+    print(f"Error: Set TOOLSHOP_AUTHKEY to a shared secret (same value on every machine) "
+          f"to use {host} beyond this machine")
+    return False
+
+def parse_address(value):
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed coordinator/worker runner for the Toolshop UI suites.")
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    coord = sub.add_parser("coordinator", help="Split a suite into shards and gather the results")
+    coord.add_argument("suite", choices=sorted(SUITES))
+    coord.add_argument("--browsers", nargs="+", choices=BROWSERS, default=BROWSERS)
+    coord.add_argument("--shards", type=int, default=4, help="Shards per browser")
+    coord.add_argument("--local-workers", type=int, default=0,
+                       help="Also start this many workers on this machine")
+    coord.add_argument("--task-timeout", type=int, default=1800,
+                       help="Queue mode: requeue a claimed shard after this many seconds")
+    coord.add_argument("--idle-timeout", type=int, default=300,
+                       help="Socket mode: stop when no worker has been connected for this many "
+                            "seconds while shards are left")
+
+    worker = sub.add_parser("worker", help="Run shards handed out by a coordinator")
+
+    for p in (coord, worker):
+        transport = p.add_mutually_exclusive_group()
+        transport.add_argument("--listen" if p is coord else "--connect", default="127.0.0.1:6000",
+                               help="Socket transport address HOST:PORT")
+        transport.add_argument("--queue", metavar="DIR", help="Use a shared directory instead of a socket")
+        run_profiles.add_profile_argument(p)
+    selection.add_selection_arguments(coord)
+
+    args = parser.parse_args()
+    run_profiles.configure(args)
+    if args.role == "coordinator":
+        selection.configure(args)
+
+    if args.role == "coordinator":
+        coordinate(args)
+    elif args.queue:
+        queue_worker(args.queue)
+    elif shared_key_ok(parse_address(args.connect)[0]):
+        socket_worker(parse_address(args.connect))
+
+if __name__ == "__main__":
+    main()
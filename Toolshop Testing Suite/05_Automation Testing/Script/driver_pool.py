@@ -0,0 +1,230 @@
+import atexit
+import json
+import os
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+# Drivers
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from webdriver_manager.firefox import GeckoDriverManager
+from selenium.webdriver.edge.service import Service as EdgeService
+from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+from run_profiles import active_profile
+
+# DRIVER POOL
+# One place to launch browsers for test_cart.py, test_product.py and test_profile.py.
+#   * resolved driver binaries are cached on disk, so webdriver_manager is not
+#     asked to look up the latest driver on every launch;
+#   * in parallel_runner and distributed workers, released sessions stay warm
+#     and are handed out again after clearing storage and cookies; the
+#     sequential scripts, which never ask for the same browser twice, quit them
+#     on release. A browser is only relaunched when it stops responding;
+#   * window size, headless mode, waits and resource use come from the active
+#     run profile (run_profiles.py).
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DRIVER_CACHE_FILE = os.path.join(SCRIPT_DIR, ".driver_cache.json")
+DRIVER_CACHE_MAX_AGE = 7 * 24 * 3600  # re-resolve weekly to follow browser updates
+
+# Forces headless whatever the profile says
+HEADLESS = os.environ.get("TOOLSHOP_HEADLESS", "") == "1"
+
+# Injected into every document when a profile disables animations (Chrome/Edge)
+NO_ANIMATIONS_JS = """
+document.addEventListener('DOMContentLoaded', () => {
+    const style = document.createElement('style');
+    style.textContent = '*, *::before, *::after { transition: none !important; animation: none !important; }';
+    document.head.appendChild(style);
+});
+"""
+
+BROWSERS = {
+    "chrome": (webdriver.Chrome, webdriver.ChromeOptions, ChromeService, ChromeDriverManager),
+    "firefox": (webdriver.Firefox, webdriver.FirefoxOptions, FirefoxService, GeckoDriverManager),
+    "edge": (webdriver.Edge, webdriver.EdgeOptions, EdgeService, EdgeChromiumDriverManager),
+}
+
+idle_drivers = {}   # browser -> [driver, ...] ready to be handed out
+driver_names = {}   # id(driver) -> browser
+launched = []
+warm = False        # keep released sessions for reuse, see keep_sessions_warm()
+
+# DRIVER BINARY CACHE
+def load_driver_cache():
+    try:
+        with open(DRIVER_CACHE_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def driver_binary(browser):
+    cache = load_driver_cache()
+    entry = cache.get(browser)
+    if entry and os.path.exists(entry["path"]) and time.time() - entry["resolved_at"] < DRIVER_CACHE_MAX_AGE:
+        return entry["path"]
+
+    manager = BROWSERS[browser][3]
+    try:
+        path = manager().install()
+    except Exception:
+        # Offline or unsupported: let Selenium Manager find a driver
+        return None
+
+    # Re-read so entries other processes saved meanwhile are kept; a failed
+    # write only means the next launch resolves the driver again
+    cache = load_driver_cache()
+    cache[browser] = {"path": path, "resolved_at": time.time()}
+    tmp_file = f"{DRIVER_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, mode="w", encoding="utf-8") as file:
+            json.dump(cache, file, indent=2)
+        os.replace(tmp_file, DRIVER_CACHE_FILE)
+    except OSError as e:
+        print(f"[WARN] Could not save the driver cache: {e}")
+    return path
+
+# LAUNCH
+def build_options(browser, profile):
+    options = BROWSERS[browser][1]()
+    win_width, win_height = profile["window"]
+    headless = profile["headless"] or HEADLESS
+
+    if browser == "firefox":
+        options.add_argument(f"--width={win_width}")
+        options.add_argument(f"--height={win_height}")
+        if headless:
+            options.add_argument("-headless")
+        if profile["block_images"]:
+            options.set_preference("permissions.default.image", 2)
+        if profile["disable_animations"]:
+            options.set_preference("ui.prefersReducedMotion", 1)
+    else:
+        options.add_argument(f"--window-size={win_width},{win_height}")
+        if headless:
+            options.add_argument("--headless=new")
+        if profile["block_images"]:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+        if profile["disable_animations"]:
+            options.add_argument("--force-prefers-reduced-motion")
+        for arg in profile["chromium_args"]:
+            options.add_argument(arg)
+    return options
+
+def make_room(profile):
+    # Stay under max_sessions by quitting idle sessions first
+    for pool in idle_drivers.values():
+        while pool and len(launched) >= profile["max_sessions"]:
+            quit_driver(pool.pop())
+    if len(launched) >= profile["max_sessions"]:
+        raise RuntimeError(f"max_sessions ({profile['max_sessions']}) reached; release a session first")
+
+def launch_driver(browser):
+    if browser not in BROWSERS:
+        raise ValueError(f"Invalid browser value: {browser}")
+    profile = active_profile()
+    make_room(profile)
+    headless = profile["headless"] or HEADLESS
+    print(f"    [Setup] Launching {browser.upper()}{' (headless)' if headless else ''}...")
+
+    driver_cls, _, service_cls, _ = BROWSERS[browser]
+    path = driver_binary(browser)
+    service = service_cls(path) if path else service_cls()
+    try:
+        driver = driver_cls(service=service, options=build_options(browser, profile))
+    except Exception as final_e:
+        print(f"\n[CRITICAL] Could not launch {browser}. Error: {final_e}")
+        raise
+
+    driver.set_window_position(0, 0)
+    driver.implicitly_wait(profile["implicit_wait"])
+    driver.set_page_load_timeout(profile["page_load_timeout"])
+    if profile["disable_animations"] and browser != "firefox":
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NO_ANIMATIONS_JS})
+    driver_names[id(driver)] = browser
+    launched.append(driver)
+    return driver
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    driver_names.pop(id(driver), None)
+    if driver in launched:
+        launched.remove(driver)
+
+# SESSIONS
+def is_healthy(driver):
+    try:
+        return driver.execute_script("return 1;") == 1 and bool(driver.window_handles)
+    except WebDriverException:
+        return False
+
+def clean_session(driver, base_url):
+    # Fresh-visitor state: one tab on base_url, no storage, no cookies
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.get(base_url)
+    driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    driver.delete_all_cookies()
+
+def acquire(browser, base_url=None):
+    # A warm, cleaned session if one is idle, otherwise a new browser
+    pool = idle_drivers.setdefault(browser, [])
+    while pool:
+        driver = pool.pop()
+        if not is_healthy(driver):
+            quit_driver(driver)
+            continue
+        if base_url:
+            try:
+                clean_session(driver, base_url)
+            except WebDriverException:
+                quit_driver(driver)
+                continue
+        print(f"    [Setup] Reusing warm {browser.upper()} session")
+        return driver
+
+    driver = launch_driver(browser)
+    if base_url:
+        driver.get(base_url)
+    return driver
+
+def keep_sessions_warm():
+    # For workers that run several shards or tasks of the same browser
+    global warm
+    warm = True
+
+def release(driver):
+    # Only kept when something will reuse it and the pool stays within
+    # max_sessions; launched already counts this driver
+    browser = driver_names.get(id(driver))
+    if (not warm or browser is None or len(launched) > active_profile()["max_sessions"]
+            or not is_healthy(driver)):
+        quit_driver(driver)
+        return
+    idle_drivers.setdefault(browser, []).append(driver)
+
+def ensure_healthy(driver, base_url=None):
+    # Returns (driver, relaunched); callers redo their login after a relaunch
+    if is_healthy(driver):
+        return driver, False
+    browser = driver_names.get(id(driver))
+    print(f"    [Warning] {str(browser).upper()} session is not responding, relaunching...")
+    quit_driver(driver)
+    return acquire(browser, base_url), True
+
+def shutdown():
+    for driver in list(launched):
+        quit_driver(driver)
+    idle_drivers.clear()
+
+atexit.register(shutdown)
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+from waits import wait_for_app_idle
+
+# STATE FIXTURES
+# Puts a session into a known state through the Toolshop REST API and web
+# storage instead of the UI: carts are deleted with one API call, and logins
+# fetch a token once per account and inject it into localStorage.
+# Every helper returns False when the API cannot be reached, so callers can
+# fall back to their UI flow.
+
+API_URL = os.environ.get("TOOLSHOP_API_URL", "http://localhost:8091")
+API_TIMEOUT = 5
+
+# Keys used by the Angular app
+TOKEN_STORAGE_KEY = "auth-token"
+CART_ID_KEY = "cart_id"
+
+# Renew cached tokens this many seconds before they expire
+TOKEN_MARGIN = 30
+
+token_cache = {}  # email -> (token, expires_at)
+
+# API HELPERS
+def api_request(method, path, payload=None, token=None):
+    # Returns (status, parsed JSON or None); status 0 means the API is unreachable
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(API_URL + path, data=data, method=method)
+    request.add_header("Accept", "application/json")
+    if data is not None:
+        request.add_header("Content-Type", "application/json")
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+
+    try:
+        with urllib.request.urlopen(request, timeout=API_TIMEOUT) as response:
+            body = response.read()
+            return response.status, json.loads(body) if body else None
+    except urllib.error.HTTPError as e:
+        return e.code, None
+    except (urllib.error.URLError, OSError, ValueError):
+        return 0, None
+
+def api_token(email, password):
+    cached = token_cache.get(email)
+    if cached and cached[1] > time.time():
+        return cached[0]
+
+    status, data = api_request("POST", "/users/login", {"email": email, "password": password})
+    if status != 200 or not data or "access_token" not in data:
+        print(f"    [WARN] API login failed for {email} (status {status})")
+        return None
+
+    expires_in = int(data.get("expires_in", 300))
+    token_cache[email] = (data["access_token"], time.time() + expires_in - TOKEN_MARGIN)
+    return data["access_token"]
+
+# BROWSER FIXTURES
+def open_origin(driver, base_url):
+    # Storage is per origin, so make sure a page of the app is loaded
+    if not driver.current_url.startswith(base_url.split("#")[0]):
+        driver.get(base_url)
+
+def inject_login(driver, base_url, landing_url, email, password):
+    token = api_token(email, password)
+    if not token:
+        return False
+
+    open_origin(driver, base_url)
+    driver.execute_script(
+        "window.localStorage.clear();"
+        "window.sessionStorage.clear();"
+        "window.localStorage.setItem(arguments[0], arguments[1]);",
+        TOKEN_STORAGE_KEY, token,
+    )
+    # The app reads the token at bootstrap: land on the page, then reload it
+    driver.get(landing_url)
+    driver.refresh()
+    wait_for_app_idle(driver, label="api login")
+    return True
+
+def reset_guest_state(driver, base_url):
+    # Delete the server-side cart, drop storage and cookies, reload once
+    open_origin(driver, base_url)
+    cart_id = driver.execute_script(
+        "return window.sessionStorage.getItem(arguments[0]) || window.localStorage.getItem(arguments[0]);",
+        CART_ID_KEY,
+    )
+
+    deleted = True
+    if cart_id:
+        status, _ = api_request("DELETE", f"/carts/{cart_id}")
+        deleted = status in (200, 204, 404)
+
+    driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    driver.delete_all_cookies()
+    driver.get(base_url)
+    driver.refresh()
+    wait_for_app_idle(driver, label="api reset")
+    return deleted
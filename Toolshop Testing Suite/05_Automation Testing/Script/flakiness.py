@@ -0,0 +1,173 @@
+import argparse
+import os
+import sqlite3
+import time
+
+import result_sink
+import run_profiles
+import selection
+import tracing
+
+# RETRIES AND FLAKINESS
+# Wraps a per-browser runner (run_tests_by_name, run_admin_tests_for_browser,
+# run_profile_tests_for_browser): failing test cases are run again, up to the
+# run profile's "retries" extra attempts, or "flaky_retries" for cases whose
+# flakiness score is already at or above "flaky_threshold". The results file
+# keeps the last attempt of every case plus Attempts and Flaky columns.
+#
+# Every attempt (status, seconds) goes into .flakiness.db (SQLite) with a rolling
+# flakiness score per suite/browser/TC_ID: an exponential average of runs
+# where the attempts disagreed. "python flakiness.py" lists the flakiest cases.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILE = os.path.join(SCRIPT_DIR, ".flakiness.db")
+SCORE_WEIGHT = 0.2  # weight of the newest run in the rolling score
+RETRY_STATUSES = {"FAIL", "SCRIPT_ERROR"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    run_at REAL, suite TEXT, browser TEXT, tc_id TEXT,
+    attempt INTEGER, status TEXT, duration REAL
+);
+CREATE INDEX IF NOT EXISTS attempts_case ON attempts (suite, browser, tc_id);
+CREATE TABLE IF NOT EXISTS flakiness (
+    suite TEXT, browser TEXT, tc_id TEXT,
+    score REAL, runs INTEGER, flaky_runs INTEGER, last_status TEXT, updated_at REAL,
+    PRIMARY KEY (suite, browser, tc_id)
+);
+"""
+
+# STORE
+def connect():
+    # Shards of a parallel run write at the same time: wait for the lock
+    conn = sqlite3.connect(DB_FILE, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+def scores(suite, browser):
+    conn = connect()
+    try:
+        rows = conn.execute(
+            "SELECT tc_id, score FROM flakiness WHERE suite = ? AND browser = ?", (suite, browser)
+        ).fetchall()
+    finally:
+        conn.close()
+    return dict(rows)
+
+def record_attempts(suite, browser, attempts):
+    # attempts: {TC_ID: [(status, duration), ...]} in attempt order
+    now = time.time()
+    conn = connect()
+    try:
+        with conn:
+            for tc_id, outcomes in attempts.items():
+                conn.executemany(
+                    "INSERT INTO attempts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(now, suite, browser, tc_id, idx + 1, status, to_seconds(duration))
+                     for idx, (status, duration) in enumerate(outcomes)],
+                )
+                flaky = len({status for status, _ in outcomes}) > 1
+                old = conn.execute(
+                    "SELECT score, runs, flaky_runs FROM flakiness WHERE suite = ? AND browser = ? AND tc_id = ?",
+                    (suite, browser, tc_id),
+                ).fetchone()
+                score, runs, flaky_runs = old or (0.0, 0, 0)
+                conn.execute(
+                    "INSERT OR REPLACE INTO flakiness VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (suite, browser, tc_id, round((1 - SCORE_WEIGHT) * score + SCORE_WEIGHT * flaky, 4),
+                     runs + 1, flaky_runs + flaky, outcomes[-1][0], now),
+                )
+    finally:
+        conn.close()
+
+def to_seconds(duration):
+    try:
+        return float(duration)
+    except (TypeError, ValueError):
+        return None
+
+# RETRIES
+def retry_file(out_file, attempt):
+    stem, ext = os.path.splitext(out_file)
+    return f"{stem}.retry{attempt}{ext or '.csv'}"
+
+def allowed_attempts(tc_id, known_scores, profile):
+    if known_scores.get(tc_id, 0.0) >= profile["flaky_threshold"]:
+        return 1 + profile["flaky_retries"]
+    return 1 + profile["retries"]
+
+def run_with_retries(run, df, suite, browser, out_file):
+    run(df, browser, out_file)
+    _, rows = result_sink.read_rows(out_file)
+    if not rows:
+        return
+
+    profile = run_profiles.active_profile()
+    known_scores = scores(suite, browser)
+    final = {row["TC_ID"]: row for row in rows}
+    attempts = {tc_id: [(row.get("Status", ""), row.get("Duration", ""))] for tc_id, row in final.items()}
+
+    attempt = 1
+    while True:
+        attempt += 1
+        again = [tc_id for tc_id, row in final.items()
+                 if row.get("Status") in RETRY_STATUSES
+                 and len(attempts[tc_id]) < allowed_attempts(tc_id, known_scores, profile)]
+        if not again:
+            break
+
+        print(f"\n[Info] Retrying {len(again)} failed {suite} cases on {browser} (attempt {attempt})")
+        part = retry_file(out_file, attempt)
+        # The retry pass re-runs exactly these cases, without re-selecting them
+        was_disabled, selection.disabled = selection.disabled, True
+        try:
+            run(df[df["TC_ID"].isin(again)], browser, part)
+            _, retried = result_sink.read_rows(part)
+        finally:
+            selection.disabled = was_disabled
+            result_sink.discard(part)
+            tracing.remove_traces(part)
+
+        for row in retried:
+            final[row["TC_ID"]] = row
+            attempts[row["TC_ID"]].append((row.get("Status", ""), row.get("Duration", "")))
+
+    for tc_id, row in final.items():
+        row["Attempts"] = len(attempts[tc_id])
+        row["Flaky"] = "yes" if len({status for status, _ in attempts[tc_id]}) > 1 else ""
+    result_sink.rewrite(out_file, list(final.values()))
+    record_attempts(suite, browser, attempts)
+
+    flaky = sum(1 for row in final.values() if row["Flaky"])
+    if flaky:
+        print(f"[WARN] {flaky} {suite} cases on {browser} changed status between attempts")
+
+# REPORT
+def main():
+    parser = argparse.ArgumentParser(description="List the flakiest test cases per suite and browser.")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--suite", default=None)
+    args = parser.parse_args()
+
+    if not os.path.exists(DB_FILE):
+        print("Error: No flakiness data yet. Run a suite first.")
+        return
+
+    query = "SELECT suite, browser, tc_id, score, runs, flaky_runs, last_status FROM flakiness"
+    params = ()
+    if args.suite:
+        query += " WHERE suite = ?"
+        params = (args.suite,)
+    query += " ORDER BY score DESC, flaky_runs DESC LIMIT ?"
+    conn = connect()
+    try:
+        rows = conn.execute(query, params + (args.top,)).fetchall()
+    finally:
+        conn.close()
+
+    print("suite     browser  TC_ID            score  flaky/runs  last")
+    for suite, browser, tc_id, score, runs, flaky_runs, last_status in rows:
+        print(f"{suite:<9} {browser:<8} {tc_id:<16} {score:>5.2f}  {flaky_runs:>5}/{runs:<4}  {last_status}")
+
+if __name__ == "__main__":
+    main()
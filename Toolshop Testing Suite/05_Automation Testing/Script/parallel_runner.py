@@ -0,0 +1,137 @@
+import argparse
+import importlib
+import os
+from multiprocessing import Pool
+
+import pandas as pd
+
+import driver_pool
+import flakiness
+import plan_compiler
+import result_sink
+import results_db
+import run_profiles
+import selection
+import tracing
+from suites import BROWSERS, DATA_DIR, RESULT_DIR, SUITES, data_path, result_file
+
+# PARALLEL RUNNER
+# Runs a suite on several browsers at once, optionally splitting the test-case
+# CSV into shards per browser. Every (browser, shard) task runs in a fresh
+# process with its own driver, so sessions never share cookies or storage.
+# Shards write part files that are merged, in data-file order, into the usual
+# per-browser CSVs under "Test Result/".
+#
+#   python parallel_runner.py cart
+#   python parallel_runner.py product --browsers chrome firefox --shards 2
+
+# HELPER FUNCTIONS
+def load_cases(suite):
+    data_file = SUITES[suite][2]
+    df = pd.read_csv(data_path(data_file))
+    return df.fillna("")
+
+def shard_cases(df, shard, shards):
+    # Round-robin keeps every flow type spread over all shards
+    return df.iloc[shard::shards]
+
+def part_file(suite, browser, shard):
+    return f"{result_file(suite, browser)}.part{shard:02d}"
+
+# WORKER
+def run_task(task):
+    suite, browser, shard, shards = task
+    module_name, entry, _, _, _ = SUITES[suite]
+    out_file = part_file(suite, browser, shard)
+
+    # Retries of this task reuse its session
+    driver_pool.keep_sessions_warm()
+    try:
+        module = importlib.import_module(module_name)
+        df = shard_cases(load_cases(suite), shard, shards)
+        print(f"[Info] {suite}/{browser} shard {shard + 1}/{shards}: {len(df)} test cases (pid {os.getpid()})")
+        flakiness.run_with_retries(getattr(module, entry), df, suite, browser, out_file)
+        return task, None
+    except Exception as e:
+        return task, str(e)
+    finally:
+        # Pool workers exit without running atexit handlers
+        driver_pool.shutdown()
+
+# MERGE
+def merge_results(suite, browser, shards, tc_order):
+    frames, spans = [], []
+    for shard in range(shards):
+        part = part_file(suite, browser, shard)
+        if not os.path.exists(part):
+            print(f"[WARN] Missing results for {suite}/{browser} shard {shard + 1}")
+            continue
+        try:
+            frames.append(pd.read_csv(part, keep_default_na=False))
+        except pd.errors.EmptyDataError:
+            pass
+        result_sink.discard(part)
+        spans.extend(tracing.read_spans(tracing.trace_files(part)[0]))
+        tracing.remove_traces(part)
+
+    if not frames:
+        return None
+
+    merged = pd.concat(frames, ignore_index=True)
+    merged["_order"] = merged["TC_ID"].map(tc_order)
+    merged = merged.sort_values("_order", kind="stable").drop(columns="_order")
+
+    out_file = result_file(suite, browser)
+    merged = selection.keep_unselected(merged, out_file, tc_order)
+    merged.to_csv(out_file, index=False, encoding="utf-8")
+    if spans:
+        tracing.write_spans(spans, out_file)
+    print(f"[Info] Results for {browser} saved to: {out_file}")
+    return out_file
+
+def run_parallel(suite, browsers, shards=1, workers=None):
+    df = load_cases(suite)
+    # Compiled once here: bad rows stop the run before any worker starts, and
+    # the workers pick the plans up from the cache
+    if plan_compiler.load_plans(suite, df) is None:
+        return []
+    tc_order = {tc_id: idx for idx, tc_id in enumerate(df["TC_ID"])}
+    shards = max(1, min(shards, len(df)))
+
+    tasks = [(suite, browser, shard, shards) for browser in browsers for shard in range(shards)]
+    # Every worker holds one browser: the profile caps how many run at once
+    workers = min(workers or len(tasks), len(tasks), run_profiles.active_profile()["max_sessions"])
+    os.makedirs(os.path.dirname(result_file(suite, browsers[0])), exist_ok=True)
+
+    print(f"Running {suite} on {', '.join(browsers)} ({shards} shard(s) each, {workers} processes)...")
+    # One task per process: a crashed browser cannot leak state into the next task
+    with Pool(processes=workers, maxtasksperchild=1) as pool:
+        outcomes = pool.map(run_task, tasks, chunksize=1)
+
+    for (_, browser, shard, _), error in outcomes:
+        if error:
+            print(f"[CRITICAL] {suite}/{browser} shard {shard + 1} failed: {error}")
+
+    out_files = [merge_results(suite, browser, shards, tc_order) for browser in browsers]
+    results_db.ingest([path for path in out_files if path], label=suite)
+    return out_files
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Toolshop UI suite on several browsers in parallel.")
+    parser.add_argument("suite", choices=sorted(SUITES), help="Which test script to run")
+    parser.add_argument("--browsers", nargs="+", choices=BROWSERS, default=BROWSERS,
+                        help="Browsers to run (default: all)")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Split the test cases of every browser over this many processes")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Max processes at once (default: browsers x shards, capped by the profile)")
+    run_profiles.add_profile_argument(parser)
+    selection.add_selection_arguments(parser)
+    args = parser.parse_args()
+    run_profiles.configure(args)
+    selection.configure(args)
+
+    run_parallel(args.suite, args.browsers, args.shards, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import hashlib
+import os
+import pickle
+import re
+from collections import namedtuple
+
+# TEST PLANS
+# Compiles the rows of cart_data.csv, product_data.csv and profile_data.csv
+# into plans before any browser starts: every row is checked once, its flow is
+# turned into a list of step tuples (action, *arguments) and its expectations
+# into typed fields. The runners' loops only execute the steps and compare.
+#
+# A row that cannot be compiled (unknown Flow_Type, quantity that is not a
+# number, ...) stops the suite with one "Error:" line per bad row, before any
+# browser launches.
+#
+# Each script compiles once and hands the plans to every browser run (and its
+# retries). Plans are also cached by the content hash of their row, in memory
+# and in .plan_cache.pickle, so parallel shards and local distributed workers
+# reuse what was compiled first.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(SCRIPT_DIR, ".plan_cache.pickle")
+PLAN_VERSION = 2  # bump when a plan layout or step changes: old cache entries are ignored
+MAX_CACHED_ROWS = 2000  # per suite, newest kept
+
+CartPlan = namedtuple("CartPlan", [
+    "tc_id", "desc", "flow", "product", "steps",
+    "expected_qtys",   # Expected_Qty as written ("10" or "10,10"), for the per-line check
+    "expected_total",  # int, 0 = nothing may be in the cart
+    "expected_error",  # expected toast text, "" when none or when the row checks a price
+    "expected_price",  # float grand total, None when not checked
+    "stepper",         # (operation, expected value) for UIStepper rows, else None
+])
+ProductPlan = namedtuple("ProductPlan", [
+    "tc_id", "desc", "flow", "target", "steps", "expected_error",
+    "step_error",      # prefix of the SCRIPT_ERROR reported when a step raises, "" = critical
+])
+ProfilePlan = namedtuple("ProfilePlan", [
+    "tc_id", "desc", "field", "value", "steps", "expected_error",
+    "refresh_check",   # True: type without saving, reload, expect the old value back
+])
+
+class PlanError(ValueError):
+    pass
+
+# HELPER FUNCTIONS
+def text(value):
+    return str(value).strip()
+
+def flag(value, column):
+    value = text(value).lower()
+    if value in ("", "false", "no", "0"):
+        return False
+    if value in ("true", "yes", "1", "x"):
+        return True
+    raise PlanError(f"{column} must be True/False, got '{value}'")
+
+# CART
+CART_COLUMNS = ["TC_ID", "Description", "Flow_Type", "Product_Name", "Input_Value",
+                "Expected_Qty", "Expected_Error"]
+CART_FLOWS = {"Simple", "CheckCart", "Cumulative", "MultiProd", "ComplexReset", "Refresh",
+              "NewTab", "UIStepper"}
+
+def compile_cart(row):
+    flow = text(row["Flow_Type"])
+    product = text(row["Product_Name"])
+    inp = str(row["Input_Value"])
+    if flow not in CART_FLOWS:
+        raise PlanError(f"unknown Flow_Type '{flow}'")
+    if not product:
+        raise PlanError("Product_Name is empty")
+
+    expected_qtys = str(row["Expected_Qty"])
+    if not expected_qtys.strip():
+        expected_qtys = "0"
+    try:
+        expected_total = sum(int(qty) for qty in expected_qtys.split(","))
+    except ValueError:
+        raise PlanError(f"Expected_Qty '{expected_qtys}' is not a number or a list of numbers")
+
+    # A number in Expected_Error is the expected grand total, not a message
+    expected_error = text(row["Expected_Error"])
+    expected_price = None
+    if expected_error and expected_error.replace(".", "", 1).isdigit():
+        expected_price = float(expected_error)
+        expected_error = ""
+
+    values = inp.split(",")
+    steps = []
+    stepper = None
+    if flow in ("Simple", "CheckCart"):
+        steps = [("add", inp, product, True)]
+    elif flow == "Cumulative":
+        for value in values:
+            steps += [("add", value, product, True), ("idle", "cumulative step")]
+    elif flow == "MultiProd":
+        products = product.split(",")
+        for idx, value in enumerate(values):
+            current = products[idx] if idx < len(products) else products[0]
+            steps += [("home",), ("add", value, current.strip(), True)]
+    elif flow == "ComplexReset":
+        if len(values) < 3:
+            raise PlanError(f"ComplexReset needs 'add,delete,add' quantities, got '{inp}'")
+        steps = [("add", values[0], product, False), ("open_cart",), ("remove_first", product),
+                 ("home",), ("add", values[2], product, True)]
+    elif flow == "Refresh":
+        steps = [("add", inp, product, False), ("refresh",)]
+    elif flow == "UIStepper":
+        if inp not in ("+", "-"):
+            raise PlanError(f"UIStepper Input_Value must be '+' or '-', got '{inp}'")
+        steps = [("stepper", product, inp)]
+        stepper = (inp, 2 if inp == "+" else 4)
+    # NewTab: nothing to do in the page, only the cart is checked
+
+    return CartPlan(str(row["TC_ID"]), row["Description"], flow, product, tuple(steps),
+                    expected_qtys, expected_total, expected_error, expected_price, stepper)
+
+# PRODUCT
+PRODUCT_COLUMNS = ["TC_ID", "Description", "Flow_Type", "Target_Product", "Name", "Price", "Stock",
+                   "Description_Input", "Brand", "Category", "Image", "CO2", "Check_Location",
+                   "Check_Rental", "Expected_Error"]
+PRODUCT_INPUTS = [("name", "Name"), ("price", "Price"), ("stock", "Stock"),
+                  ("description", "Description_Input")]
+PRODUCT_SELECTS = [("brand_id", "Brand"), ("category_id", "Category"),
+                   ("product_image_id", "Image"), ("co2_rating", "CO2")]
+PRODUCT_CHECKS = [("is_location_offer", "Check_Location"), ("is_rental", "Check_Rental")]
+
+def compile_product(row):
+    flow = text(row["Flow_Type"])
+    target = text(row["Target_Product"])
+    step_error = ""
+
+    if flow == "Add":
+        # Empty cells leave the form default; a single space clears the field
+        steps = [("open_add_form",)]
+        steps += [("input", field, str(row[column])) for field, column in PRODUCT_INPUTS
+                  if str(row[column]) != ""]
+        steps += [("select", field, text(row[column])) for field, column in PRODUCT_SELECTS
+                  if text(row[column])]
+        steps.append(("scroll_bottom",))
+        steps += [("check", field) for field, column in PRODUCT_CHECKS if flag(row[column], column)]
+        steps.append(("submit", False))
+    elif flow == "Edit":
+        if not target:
+            raise PlanError("Edit needs a Target_Product")
+        steps = [("open_edit", target)]
+        for field, column in PRODUCT_INPUTS:
+            value = str(row[column])
+            if value.strip() if field == "stock" else value:
+                steps.append(("input", field, value))
+        steps.append(("submit", True))
+        step_error = f"Could not find product '{target}' to Edit"
+    else:
+        raise PlanError(f"unknown Flow_Type '{flow}'")
+
+    return ProductPlan(str(row["TC_ID"]), row["Description"], flow, target, tuple(steps),
+                       text(row["Expected_Error"]), step_error)
+
+# PROFILE
+PROFILE_COLUMNS = ["TC_ID", "Description", "Field_Name", "Input_Value", "Expected_Error"]
+FIELD_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+def compile_profile(row):
+    desc = row["Description"]
+    field = text(row["Field_Name"])
+    value = str(row["Input_Value"])
+    if not FIELD_NAME.fullmatch(field):
+        raise PlanError(f"Field_Name '{field}' is not a form field name")
+
+    refresh_check = "Refresh" in desc or "Persistence" in desc
+    if refresh_check:
+        # Typed but never saved: the reload must bring the stored value back
+        steps = [("type", f"[data-test='{field}']", field, value), ("reload",)]
+    else:
+        selector = f"[data-test='{field}']"
+        if "_" in field:
+            selector = f"[data-test='{field.replace('_', '-')}']"
+        steps = [("type", selector, field, value), ("save",)]
+
+    return ProfilePlan(str(row["TC_ID"]), desc, field, value, tuple(steps),
+                       text(row["Expected_Error"]), refresh_check)
+
+COMPILERS = {
+    "cart": (CART_COLUMNS, compile_cart),
+    "product": (PRODUCT_COLUMNS, compile_product),
+    "profile": (PROFILE_COLUMNS, compile_profile),
+}
+
+# CACHE
+_cache = None  # {suite: {row hash: plan}}
+
+def load_cache():
+    global _cache
+    if _cache is None:
+        _cache = {}
+        try:
+            with open(CACHE_FILE, "rb") as file:
+                stored = pickle.load(file)
+            if stored.get("version") == PLAN_VERSION:
+                _cache = stored["plans"]
+        except Exception:
+            pass
+    return _cache
+
+def save_cache():
+    for suite, plans in _cache.items():
+        if len(plans) > MAX_CACHED_ROWS:
+            _cache[suite] = dict(list(plans.items())[-MAX_CACHED_ROWS:])
+    tmp_file = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "wb") as file:
+            pickle.dump({"version": PLAN_VERSION, "plans": _cache}, file)
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError as e:
+        print(f"[WARN] Could not save compiled plans: {e}")
+
+def row_hash(values):
+    return hashlib.sha1("\x1f".join(str(value) for value in values).encode("utf-8")).hexdigest()
+
+# COMPILE
+def compile_plans(suite, df):
+    # -> (plans in df order, ["TC_ID: problem", ...])
+    columns, compile_row = COMPILERS[suite]
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        return [], [f"missing column(s): {', '.join(missing)}"]
+
+    cached = load_cache().setdefault(suite, {})
+    plans, errors, seen, compiled = [], [], set(), 0
+    for values in df[columns].itertuples(index=False, name=None):
+        row = dict(zip(columns, values))
+        tc_id = str(row["TC_ID"])
+        if not tc_id.strip():
+            errors.append("(row without TC_ID): TC_ID is empty")
+            continue
+        if tc_id in seen:
+            errors.append(f"{tc_id}: TC_ID used more than once")
+            continue
+        seen.add(tc_id)
+
+        key = row_hash(values)
+        plan = cached.get(key)
+        if plan is None:
+            try:
+                plan = compile_row(row)
+            except PlanError as e:
+                errors.append(f"{tc_id}: {e}")
+                continue
+            cached[key] = plan
+            compiled += 1
+        plans.append(plan)
+
+    if compiled:
+        save_cache()
+    return plans, errors
+
+def select_plans(plans, df):
+    # Plans compiled up front, in the order and subset of df (after selection
+    # and resuming), without hashing the rows again
+    by_id = {plan.tc_id: plan for plan in plans}
+    return [by_id[str(tc_id)] for tc_id in df["TC_ID"]]
+
+def load_plans(suite, df):
+    # The runners' entry point: plans for every row of df, or None after
+    # reporting the rows that cannot run
+    plans, errors = compile_plans(suite, df)
+    if errors:
+        print(f"Error: {len(errors)} {suite} test case(s) cannot run, fix the data file first:")
+        for error in errors:
+            print(f"    {error}")
+        return None
+    return plans
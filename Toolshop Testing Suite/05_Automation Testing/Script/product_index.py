@@ -0,0 +1,108 @@
+import json
+import os
+import time
+
+import fixtures
+
+# PRODUCT INDEX
+# Product name -> product id, so tests can open "#/product/<id>" directly
+# instead of paging through the listing. Built once from the API (or filled in
+# from the listing pages a search walks through), cached on disk next to the
+# scripts and refreshed when stale. A wrong entry is dropped on first use.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_FILE = os.path.join(SCRIPT_DIR, ".product_index.json")
+INDEX_MAX_AGE = 24 * 3600
+MAX_API_PAGES = 200
+
+product_ids = {}
+loaded = False
+
+# Every product card on the current listing page as [name, id]
+CARDS_JS = """
+return Array.from(document.querySelectorAll("a.card")).map(card => {
+    const title = card.querySelector("[data-test='product-name']");
+    const id = (card.getAttribute("data-test") || "").replace(/^product-/, "")
+        || (card.getAttribute("href") || "").split("/product/").pop();
+    return [title ? title.textContent.trim() : "", id];
+}).filter(pair => pair[0] && pair[1]);
+"""
+
+# DISK CACHE
+def save_index():
+    tmp_file = f"{INDEX_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, mode="w", encoding="utf-8") as file:
+        json.dump({"api_url": fixtures.API_URL, "built_at": time.time(), "products": product_ids}, file)
+    os.replace(tmp_file, INDEX_FILE)
+
+def read_index():
+    try:
+        with open(INDEX_FILE, encoding="utf-8") as file:
+            cached = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if cached.get("api_url") != fixtures.API_URL or time.time() - cached.get("built_at", 0) > INDEX_MAX_AGE:
+        return None
+    return cached.get("products")
+
+def build_from_api():
+    products = {}
+    page = 1
+    while page <= MAX_API_PAGES:
+        status, data = fixtures.api_request("GET", f"/products?page={page}")
+        if status != 200 or not data:
+            break
+        for product in data.get("data", []):
+            # Keep the first product of a name, like the listing search does
+            products.setdefault(product["name"].strip(), str(product["id"]))
+        if page >= data.get("last_page", page):
+            break
+        page += 1
+    return products
+
+def load_index():
+    global loaded
+    loaded = True
+    cached = read_index()
+    if cached is not None:
+        product_ids.update(cached)
+        return
+
+    products = build_from_api()
+    if products:
+        print(f"    [Info] Product index built from the API ({len(products)} products)")
+        product_ids.update(products)
+        save_index()
+
+# LOOKUPS
+def lookup(name):
+    if not loaded:
+        load_index()
+    return product_ids.get(name)
+
+def remember(name, product_id, overwrite=True):
+    if not name or not product_id:
+        return
+    if not overwrite and name in product_ids:
+        return
+    if product_ids.get(name) != product_id:
+        product_ids[name] = product_id
+        save_index()
+
+def forget(name):
+    if product_ids.pop(name, None) is not None:
+        save_index()
+
+def record_cards(driver):
+    # Learn every product shown on the current listing page in one call
+    try:
+        cards = driver.execute_script(CARDS_JS) or []
+    except Exception:
+        return
+    changed = False
+    for name, product_id in cards:
+        if name not in product_ids:
+            product_ids[name] = product_id
+            changed = True
+    if changed:
+        save_index()
@@ -0,0 +1,143 @@
+import csv
+import json
+import os
+import time
+
+import tracing
+
+# STREAMING RESULTS
+# Each test case is appended to the results file as soon as it finishes
+# (CSV, or JSON lines when the file ends in .jsonl), so a killed run keeps
+# everything it already did. Lines are flushed right away and fsync'ed every
+# FSYNC_EVERY rows or FSYNC_INTERVAL seconds.
+#
+# While a run is in progress a "<results>.inprogress" marker sits next to the
+# file. It is removed once every expected test case has a row. When the next
+# run finds the marker, it keeps the rows and skips those test cases;
+# otherwise it starts a fresh file.
+
+FSYNC_EVERY = 10
+FSYNC_INTERVAL = 2.0
+
+def marker_file(out_file):
+    return out_file + ".inprogress"
+
+def discard(out_file):
+    for path in (out_file, marker_file(out_file)):
+        if os.path.exists(path):
+            os.remove(path)
+
+def drop_partial_line(out_file):
+    # A process killed mid-write can leave half a line at the end
+    with open(out_file, "rb+") as file:
+        data = file.read()
+        if data and not data.endswith(b"\n"):
+            file.truncate(data.rfind(b"\n") + 1)
+
+def read_rows(out_file):
+    if not os.path.exists(out_file):
+        return None, []
+    with open(out_file, encoding="utf-8", newline="") as file:
+        if out_file.endswith(".jsonl"):
+            return None, [json.loads(line) for line in file if line.strip()]
+        reader = csv.DictReader(file)
+        return reader.fieldnames, list(reader)
+
+def rewrite(out_file, rows):
+    # Replaces a finished results file in one step (used after retries)
+    tmp_file = f"{out_file}.{os.getpid()}.tmp"
+    with open(tmp_file, mode="w", encoding="utf-8", newline="") as file:
+        if out_file.endswith(".jsonl"):
+            for row in rows:
+                file.write(json.dumps(row) + "\n")
+        elif rows:
+            fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+            writer = csv.DictWriter(file, fieldnames=fieldnames, restval="")
+            writer.writeheader()
+            writer.writerows(rows)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_file, out_file)
+
+class ResultWriter:
+    def __init__(self, out_file, expected_ids=()):
+        self.out_file = out_file
+        self.jsonl = out_file.endswith(".jsonl")
+        self.expected = set(expected_ids)
+        self.completed = set()
+        self.outcomes = {}  # TC_ID -> (Status, Duration)
+        self.fieldnames = None
+        self.writer = None
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+
+        resume = os.path.exists(marker_file(out_file)) and os.path.exists(out_file)
+        if resume:
+            drop_partial_line(out_file)
+            self.fieldnames, rows = read_rows(out_file)
+            self.completed = {row["TC_ID"] for row in rows}
+            self.outcomes = {row["TC_ID"]: (row.get("Status", ""), row.get("Duration", "")) for row in rows}
+            resume = bool(rows)
+
+        folder = os.path.dirname(out_file)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        open(marker_file(out_file), "w").close()
+        self.file = open(out_file, mode="a" if resume else "w", encoding="utf-8", newline="", buffering=1)
+        if not resume:
+            self.fieldnames = None
+
+    def pending(self, df):
+        # The test cases still to run when resuming an interrupted run
+        if not self.completed:
+            return df
+        print(f"[Info] Resuming {self.out_file}: {len(self.completed)} test cases already done")
+        return df[~df["TC_ID"].isin(self.completed)]
+
+    def append(self, row):
+        row = dict(row)
+        row.setdefault("Duration", tracing.test_elapsed())
+
+        if self.jsonl:
+            self.file.write(json.dumps(row) + "\n")
+        else:
+            if self.writer is None:
+                header = self.fieldnames is None
+                self.fieldnames = self.fieldnames or list(row)
+                self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames,
+                                             extrasaction="ignore", restval="")
+                if header:
+                    self.writer.writeheader()
+            self.writer.writerow(row)
+
+        self.file.flush()
+        self.completed.add(row["TC_ID"])
+        self.outcomes[row["TC_ID"]] = (row.get("Status", ""), row["Duration"])
+        self.unsynced += 1
+        if self.unsynced >= FSYNC_EVERY or time.monotonic() - self.synced_at >= FSYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.sync()
+        self.file.close()
+        if self.expected <= self.completed:
+            os.remove(marker_file(self.out_file))
+        else:
+            print(f"[WARN] {len(self.expected - self.completed)} test cases have no result; "
+                  f"the next run resumes {self.out_file}")
+
+    def abandon(self):
+        # Nothing ran (the browser did not launch): no empty file or marker is
+        # left behind, unless it holds rows of an earlier interrupted run
+        if self.file.closed:
+            return
+        self.file.close()
+        if not self.completed:
+            discard(self.out_file)
@@ -0,0 +1,235 @@
+import argparse
+import csv
+import glob
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+from suites import BROWSERS, RESULT_DIR, SUITES
+
+# RESULT DATABASE
+# Loads result CSVs into one indexed SQLite file (results.db next to
+# "Test Result/") and answers the usual questions straight from it:
+#
+#   python results_db.py ingest                 every CSV under "Test Result/" (or given paths)
+#   python results_db.py runs                   ingested runs
+#   python results_db.py matrix                 pass rate per suite x browser, latest run
+#   python results_db.py divergence             cases whose status differs between browsers
+#   python results_db.py trend ATC-EP-01        status and duration of one case over runs
+#   python results_db.py changes                what changed since the previous run
+#
+# One ingest = one run id. A file whose content was already ingested is
+# skipped, so ingesting twice does not create an empty run.
+
+DB_FILE = os.path.join(RESULT_DIR, "results.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT, ingested_at REAL, label TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    sha1 TEXT PRIMARY KEY, run_id INTEGER, suite TEXT, browser TEXT, path TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER, suite TEXT, browser TEXT, tc_id TEXT,
+    status TEXT, duration REAL, attempts INTEGER, flaky INTEGER, details TEXT,
+    PRIMARY KEY (run_id, suite, browser, tc_id)
+);
+CREATE INDEX IF NOT EXISTS results_case ON results (suite, tc_id, browser, run_id);
+CREATE INDEX IF NOT EXISTS results_suite_browser ON results (suite, browser, run_id);
+"""
+
+# Result file name -> (suite, browser)
+FILE_PATTERNS = [
+    (re.compile("^" + re.escape(pattern).replace(re.escape("{browser}"), "(?P<browser>[a-z]+)") + "$"), suite)
+    for suite, (_, _, _, _, pattern) in SUITES.items()
+]
+
+def connect():
+    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+    conn = sqlite3.connect(DB_FILE, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+def identify(path):
+    name = os.path.basename(path)
+    for regex, suite in FILE_PATTERNS:
+        match = regex.match(name)
+        if match and match.group("browser") in BROWSERS:
+            return suite, match.group("browser")
+    return None
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+# INGEST
+def ingest(paths=None, label=""):
+    if paths is None:
+        paths = sorted(glob.glob(os.path.join(RESULT_DIR, "**", "*.csv"), recursive=True))
+    conn = connect()
+    try:
+        with conn:
+            run_id = None
+            for path in paths:
+                found = identify(path)
+                if found is None:
+                    continue
+                suite, browser = found
+                with open(path, "rb") as file:
+                    content = file.read()
+                sha1 = hashlib.sha1(content).hexdigest()
+                if conn.execute("SELECT 1 FROM files WHERE sha1 = ?", (sha1,)).fetchone():
+                    continue
+
+                if run_id is None:
+                    run_id = conn.execute("INSERT INTO runs (ingested_at, label) VALUES (?, ?)",
+                                          (time.time(), label)).lastrowid
+                rows = list(csv.DictReader(content.decode("utf-8-sig").splitlines()))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, suite, browser, row["TC_ID"], row.get("Status", ""),
+                      to_float(row.get("Duration")), int(to_float(row.get("Attempts")) or 1),
+                      int(row.get("Flaky", "") == "yes"), row.get("Details", ""))
+                     for row in rows],
+                )
+                conn.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?)", (sha1, run_id, suite, browser, path))
+                print(f"[Info] Ingested {len(rows)} rows of {suite}/{browser} from {path}")
+    finally:
+        conn.close()
+
+    if run_id is None:
+        print("[Info] Nothing new to ingest")
+    return run_id
+
+# QUERIES
+def latest_runs(conn, suite=None, back=0):
+    # {(suite, browser): run_id} of the latest run (back=1: the one before) per suite/browser
+    rows = conn.execute(
+        "SELECT suite, browser, run_id FROM results "
+        "WHERE (? IS NULL OR suite = ?) GROUP BY suite, browser, run_id ORDER BY run_id DESC",
+        (suite, suite),
+    ).fetchall()
+    seen, picked = {}, {}
+    for row_suite, browser, run_id in rows:
+        key = (row_suite, browser)
+        seen[key] = seen.get(key, -1) + 1
+        if seen[key] == back:
+            picked[key] = run_id
+    return picked
+
+def show_runs(conn, args):
+    print("run  ingested             label  suites/browsers  rows")
+    for run_id, ingested_at, label, pairs, count in conn.execute(
+        "SELECT r.run_id, r.ingested_at, r.label, COUNT(DISTINCT x.suite || x.browser), COUNT(x.tc_id) "
+        "FROM runs r LEFT JOIN results x ON x.run_id = r.run_id GROUP BY r.run_id ORDER BY r.run_id"
+    ):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ingested_at))
+        print(f"{run_id:<4} {stamp}  {label or '-':<6} {pairs:<16} {count}")
+
+def show_matrix(conn, args):
+    latest = latest_runs(conn, args.suite)
+    suites = sorted({suite for suite, _ in latest})
+    print("suite     " + "".join(f"{browser:>10}" for browser in BROWSERS))
+    for suite in suites:
+        cells = []
+        for browser in BROWSERS:
+            run_id = latest.get((suite, browser))
+            if run_id is None:
+                cells.append(f"{'-':>10}")
+                continue
+            passed, total = conn.execute(
+                "SELECT SUM(status = 'PASS'), COUNT(*) FROM results WHERE run_id = ? AND suite = ? AND browser = ?",
+                (run_id, suite, browser),
+            ).fetchone()
+            cells.append(f"{passed}/{total}".rjust(10))
+        print(f"{suite:<10}" + "".join(cells))
+
+def show_divergence(conn, args):
+    latest = latest_runs(conn, args.suite)
+    statuses = {}
+    for (suite, browser), run_id in latest.items():
+        for tc_id, status in conn.execute(
+            "SELECT tc_id, status FROM results WHERE run_id = ? AND suite = ? AND browser = ?",
+            (run_id, suite, browser),
+        ):
+            statuses.setdefault((suite, tc_id), {})[browser] = status
+
+    diverging = [(key, by_browser) for key, by_browser in sorted(statuses.items())
+                 if len(set(by_browser.values())) > 1]
+    print("suite     TC_ID            " + "".join(f"{browser:>10}" for browser in BROWSERS))
+    for (suite, tc_id), by_browser in diverging:
+        print(f"{suite:<9} {tc_id:<16} " + "".join(f"{by_browser.get(b, '-'):>10}" for b in BROWSERS))
+    print(f"[Info] {len(diverging)} cases differ between browsers")
+
+def show_trend(conn, args):
+    rows = conn.execute(
+        "SELECT run_id, suite, browser, status, duration, attempts FROM results "
+        "WHERE tc_id = ? AND (? IS NULL OR browser = ?) ORDER BY suite, browser, run_id",
+        (args.tc_id, args.browser, args.browser),
+    ).fetchall()
+    if not rows:
+        print(f"Error: No results for {args.tc_id}")
+        return
+    print("run  suite     browser   status        duration  attempts")
+    for run_id, suite, browser, status, duration, attempts in rows:
+        shown = f"{duration:.2f}s" if duration is not None else "-"
+        print(f"{run_id:<4} {suite:<9} {browser:<9} {status:<13} {shown:>8}  {attempts}")
+
+def show_changes(conn, args):
+    latest = latest_runs(conn, args.suite)
+    previous = latest_runs(conn, args.suite, back=1)
+    changed = 0
+    for key in sorted(latest):
+        if key not in previous:
+            continue
+        suite, browser = key
+        for tc_id, old, new in conn.execute(
+            "SELECT COALESCE(n.tc_id, o.tc_id), o.status, n.status FROM "
+            "(SELECT tc_id, status FROM results WHERE run_id = ? AND suite = ? AND browser = ?) n "
+            "LEFT JOIN (SELECT tc_id, status FROM results WHERE run_id = ? AND suite = ? AND browser = ?) o "
+            "USING (tc_id) WHERE o.status IS NULL OR o.status != n.status",
+            (latest[key], suite, browser, previous[key], suite, browser),
+        ):
+            print(f"{suite:<9} {browser:<8} {tc_id:<16} {old or 'new':<13} -> {new}")
+            changed += 1
+    print(f"[Info] {changed} changes since the previous run")
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest and query Toolshop UI test results.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="Load result CSVs as a new run")
+    p.add_argument("paths", nargs="*")
+    p.add_argument("--label", default="")
+    sub.add_parser("runs", help="List ingested runs")
+    for name, help_text in (("matrix", "Pass rate per suite and browser"),
+                            ("divergence", "Cases passing on one browser and failing on another"),
+                            ("changes", "Status changes since the previous run")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--suite", choices=sorted(SUITES), default=None)
+    p = sub.add_parser("trend", help="Status and duration of one case across runs")
+    p.add_argument("tc_id")
+    p.add_argument("--browser", choices=BROWSERS, default=None)
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        ingest(args.paths or None, args.label)
+        return
+
+    if not os.path.exists(DB_FILE):
+        print("Error: No results database yet. Run: python results_db.py ingest")
+        return
+    conn = connect()
+    try:
+        {"runs": show_runs, "matrix": show_matrix, "divergence": show_divergence,
+         "trend": show_trend, "changes": show_changes}[args.command](conn, args)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+
+# RUN PROFILES
+# Browser footprint and wait policy for a run, chosen by name from
+# run_profiles.json with --profile NAME on any script (or TOOLSHOP_PROFILE).
+# The name travels in the environment, so parallel workers inherit it.
+#
+#   headless / window [w, h] / block_images / disable_animations
+#   implicit_wait      seconds for find_element
+#   wait_scale         multiplier for the explicit waits in waits.py
+#   page_load_timeout  seconds for driver.get
+#   max_sessions       browsers alive at once (per process, and parallel_runner workers)
+#   chromium_args      extra Chrome/Edge switches
+#   retries            extra attempts for a failing test case (flakiness.py); 0 except
+#                      in "ci", since many FAILs are real bugs in the app under test.
+#                      --retries N (or TOOLSHOP_RETRIES) overrides it for one run
+#   flaky_retries      extra attempts when the case is already known to be flaky
+#   flaky_threshold    flakiness score from which a case counts as known-flaky
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILE_FILE = os.path.join(SCRIPT_DIR, "run_profiles.json")
+DEFAULT_PROFILE = "local"
+
+DEFAULTS = {
+    "headless": False,
+    "window": [1200, 800],
+    "block_images": False,
+    "disable_animations": False,
+    "implicit_wait": 5,
+    "wait_scale": 1.0,
+    "page_load_timeout": 60,
+    "max_sessions": 3,
+    "chromium_args": [],
+    "retries": 0,
+    "flaky_retries": 0,
+    "flaky_threshold": 0.3,
+}
+
+loaded_profiles = {}
+
+def load_profiles():
+    if not loaded_profiles:
+        try:
+            with open(PROFILE_FILE, encoding="utf-8") as file:
+                loaded_profiles.update(json.load(file))
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not read {PROFILE_FILE}: {e}")
+            loaded_profiles[DEFAULT_PROFILE] = {}
+    return loaded_profiles
+
+def active_profile_name():
+    return os.environ.get("TOOLSHOP_PROFILE", DEFAULT_PROFILE)
+
+def active_profile():
+    profiles = load_profiles()
+    name = active_profile_name()
+    if name not in profiles:
+        print(f"Error: Unknown run profile '{name}'. Choose from: {', '.join(sorted(profiles))}")
+        exit()
+    profile = {**DEFAULTS, **profiles[name]}
+    if os.environ.get("TOOLSHOP_RETRIES"):
+        profile["retries"] = int(os.environ["TOOLSHOP_RETRIES"])
+    return profile
+
+def select_profile(name):
+    os.environ["TOOLSHOP_PROFILE"] = name
+    profile = active_profile()
+    print(f"[Info] Run profile: {name} (headless={profile['headless']}, max_sessions={profile['max_sessions']})")
+    return profile
+
+def add_profile_argument(parser):
+    parser.add_argument("--profile", default=None,
+                        help=f"Run profile from run_profiles.json (default: $TOOLSHOP_PROFILE or {DEFAULT_PROFILE})")
+    parser.add_argument("--retries", type=int, default=None, metavar="N",
+                        help="Extra attempts for a failing test case (default: the profile's)")
+
+def configure(args):
+    # Kept in the environment so parallel worker processes see it too
+    if args.retries is not None:
+        os.environ["TOOLSHOP_RETRIES"] = str(args.retries)
+    if args.profile:
+        select_profile(args.profile)
+
+def apply_cli_profile():
+    # For the scripts without their own argument parser
+    parser = argparse.ArgumentParser(add_help=False)
+    add_profile_argument(parser)
+    args, _ = parser.parse_known_args()
+    configure(args)
@@ -0,0 +1,224 @@
+import argparse
+import json
+import os
+import time
+
+import pandas as pd
+
+from suites import BROWSERS, SUITES, result_file
+
+# TEST SELECTION
+# Orders (and optionally trims) a suite's test cases from what happened before:
+#   1. failed   last result on this browser was not PASS
+#   2. flaky    never run here, mixed statuses in recent runs, or failing on
+#               another browser
+#   3. stable   passed the recent runs everywhere
+# --failed-only keeps only group 1; --budget SECONDS fills the time budget in
+# that order using each case's last duration. Without any selection flag every
+# case runs in data-file order, as before.
+#
+# History: the last HISTORY_LENGTH outcomes per suite/browser/TC_ID in
+# .case_history.json, recorded by the runners; cases it does not know yet are
+# seeded from the result CSVs (cwd and "Test Result/"). A selected run
+# rewrites the "Test Result/" CSVs with its own rows and keeps the previous rows
+# of the cases it skipped.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(SCRIPT_DIR, ".case_history.json")
+LOCK_FILE = HISTORY_FILE + ".lock"
+HISTORY_LENGTH = 5
+DEFAULT_DURATION = 10.0  # seconds assumed for a case without a recorded duration
+LOCK_TIMEOUT = 10
+
+FAILED, FLAKY, STABLE = 0, 1, 2
+GROUP_NAMES = ["failed", "flaky", "stable"]
+
+# Set in worker processes that receive an already selected list of cases
+disabled = False
+
+# HISTORY FILE
+def acquire_lock():
+    # Lock file created exclusively; works the same on Windows and Linux
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        try:
+            os.close(os.open(LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            if time.monotonic() > deadline:
+                # Left behind by a killed process
+                os.remove(LOCK_FILE)
+                deadline = time.monotonic() + LOCK_TIMEOUT
+            time.sleep(0.05)
+        except OSError:
+            return False
+
+def release_lock():
+    try:
+        os.remove(LOCK_FILE)
+    except OSError:
+        pass
+
+def load_history():
+    try:
+        with open(HISTORY_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def record_run(suite, browser, outcomes):
+    # outcomes: {TC_ID: (status, duration)} of the run that just ended
+    if disabled or not outcomes:
+        return
+    locked = acquire_lock()
+    try:
+        history = load_history()
+        cases = history.setdefault(suite, {}).setdefault(browser, {})
+        for tc_id, (status, duration) in outcomes.items():
+            case = cases.setdefault(tc_id, {"statuses": [], "duration": None})
+            case["statuses"] = (case["statuses"] + [status])[-HISTORY_LENGTH:]
+            if duration not in ("", None):
+                case["duration"] = round(float(duration), 3)
+
+        tmp_file = f"{HISTORY_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, mode="w", encoding="utf-8") as file:
+            json.dump(history, file, indent=1)
+        os.replace(tmp_file, HISTORY_FILE)
+    finally:
+        if locked:
+            release_lock()
+
+def seed_from_results(suite, browser):
+    # Last result CSV rows of a suite/browser as history entries
+    cases = {}
+    for path in (SUITES[suite][4].format(browser=browser), result_file(suite, browser)):
+        if not os.path.exists(path):
+            continue
+        try:
+            rows = pd.read_csv(path, keep_default_na=False).to_dict("records")
+        except Exception:
+            continue
+        for row in rows:
+            duration = row.get("Duration", "")
+            cases.setdefault(str(row["TC_ID"]), {
+                "statuses": [str(row.get("Status", ""))],
+                "duration": float(duration) if duration not in ("", None) else None,
+            })
+    return cases
+
+def case_history(suite, browsers):
+    # {browser: {TC_ID: {"statuses": [...], "duration": seconds}}}
+    history = load_history().get(suite, {})
+    merged = {}
+    for browser in browsers:
+        cases = seed_from_results(suite, browser)
+        cases.update(history.get(browser, {}))
+        merged[browser] = cases
+    return merged
+
+# SELECTION
+def classify(tc_id, browser, history):
+    own = history.get(browser, {}).get(tc_id, {}).get("statuses", [])
+    if own and own[-1] != "PASS":
+        return FAILED
+    if not own or len(set(own)) > 1:
+        return FLAKY
+    for other, cases in history.items():
+        statuses = cases.get(tc_id, {}).get("statuses", [])
+        if other != browser and statuses and statuses[-1] != "PASS":
+            return FLAKY
+    return STABLE
+
+def select_cases(df, suite, browser, failed_only=False, budget=None, all_browsers=None):
+    history = case_history(suite, sorted(set(all_browsers or BROWSERS) | {browser}))
+    known = history.get(browser, {})
+    ranked = []
+    for position, tc_id in enumerate(df["TC_ID"]):
+        duration = known.get(tc_id, {}).get("duration")
+        duration = DEFAULT_DURATION if duration is None else duration
+        ranked.append((classify(tc_id, browser, history), position, duration))
+
+    counts = [sum(1 for group, _, _ in ranked if group == g) for g in (FAILED, FLAKY, STABLE)]
+    if failed_only:
+        ranked = [item for item in ranked if item[0] == FAILED]
+
+    # Most valuable group first, data-file order inside a group
+    ranked.sort()
+    chosen, planned = [], 0.0
+    for group, position, duration in ranked:
+        if budget is not None and planned + duration > budget:
+            continue
+        chosen.append(position)
+        planned += duration
+
+    summary = ", ".join(f"{count} {name}" for count, name in zip(counts, GROUP_NAMES))
+    limit = f" of a {budget:.0f}s budget" if budget is not None else ""
+    print(f"[Info] Selection for {suite} on {browser}: {summary} -> running {len(chosen)} "
+          f"(est. {planned:.0f}s{limit})")
+    return df.iloc[chosen]
+
+# CLI
+def add_selection_arguments(parser):
+    parser.add_argument("--select", action="store_true",
+                        help="Run failed cases first, then flaky ones, then the rest")
+    parser.add_argument("--failed-only", action="store_true",
+                        help="Only run cases whose last result on the browser was not PASS")
+    parser.add_argument("--budget", type=float, default=None, metavar="SECONDS",
+                        help="Run the most valuable cases that fit in this many seconds per browser")
+
+def configure(args):
+    # Kept in the environment so parallel worker processes see it too
+    if args.select or args.failed_only or args.budget is not None:
+        os.environ["TOOLSHOP_SELECT"] = "1"
+    if args.failed_only:
+        os.environ["TOOLSHOP_FAILED_ONLY"] = "1"
+    if args.budget is not None:
+        os.environ["TOOLSHOP_BUDGET"] = str(args.budget)
+
+def apply_cli_selection():
+    # For the scripts without their own argument parser
+    parser = argparse.ArgumentParser(add_help=False)
+    add_selection_arguments(parser)
+    args, _ = parser.parse_known_args()
+    configure(args)
+
+def active_selection():
+    if disabled or os.environ.get("TOOLSHOP_SELECT") != "1":
+        return None
+    budget = os.environ.get("TOOLSHOP_BUDGET")
+    return {
+        "failed_only": os.environ.get("TOOLSHOP_FAILED_ONLY") == "1",
+        "budget": float(budget) if budget else None,
+    }
+
+def apply(df, suite, browser):
+    # Called by the runners: df unchanged unless a selection flag was given
+    options = active_selection()
+    if options is None:
+        return df
+    return select_cases(df, suite, browser, **options)
+
+def keep_unselected(df, out_file, order):
+    # df: the rows of this run, written to out_file next. After a selected run
+    # the cases it skipped keep their previous rows; order: {TC_ID: position}
+    if active_selection() is None or not os.path.exists(out_file):
+        return df
+    try:
+        previous = pd.read_csv(out_file, keep_default_na=False)
+    except Exception:
+        return df
+    if "TC_ID" not in previous.columns:
+        return df
+    ran = set(df["TC_ID"].astype(str))
+    kept = previous[~previous["TC_ID"].astype(str).isin(ran)]
+    if kept.empty:
+        return df
+
+    merged = pd.concat([df, kept], ignore_index=True)
+    positions = merged["TC_ID"].astype(str).map(lambda tc_id: order.get(tc_id, len(order)))
+    print(f"[Info] Keeping the previous results of {len(kept)} unselected cases in {out_file}")
+    return merged.iloc[positions.argsort(kind="stable")]
+
+def disable():
+    global disabled
+    disabled = True
@@ -0,0 +1,31 @@
+import os
+
+# SUITES
+# Where every UI suite lives: its script, per-browser entry point, data file and
+# result file. Shared by the runners and the result tools; kept free of
+# Selenium and pandas imports so the tools start fast.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, "..", "Data")
+RESULT_DIR = os.path.join(SCRIPT_DIR, "..", "Test Result")
+
+BROWSERS = ["chrome", "firefox", "edge"]
+
+# suite -> (module, per-browser entry point, data file, result folder, result file)
+SUITES = {
+    "cart": ("test_cart", "run_tests_by_name", "cart_data.csv", "Cart", "cart_results_{browser}.csv"),
+    "product": ("test_product", "run_admin_tests_for_browser", "product_data.csv", "Product",
+                "results_product_{browser}.csv"),
+    "profile": ("test_profile", "run_profile_tests_for_browser", "profile_data.csv", "Profile",
+                "results_profile_{browser}.csv"),
+}
+
+def data_path(data_file):
+    # The scripts read their CSV from the working directory; fall back to ../Data
+    if os.path.exists(data_file):
+        return data_file
+    return os.path.join(DATA_DIR, data_file)
+
+def result_file(suite, browser):
+    _, _, _, folder, pattern = SUITES[suite]
+    return os.path.join(RESULT_DIR, folder, pattern.format(browser=browser))
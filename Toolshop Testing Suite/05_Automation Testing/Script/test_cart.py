@@ -1,18 +1,21 @@
+import functools
 import pandas as pd
-import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-# Drivers
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+import driver_pool
+import run_profiles
+import fixtures
+import tracing
+from result_sink import ResultWriter
+import selection
+import flakiness
+import plan_compiler
+import product_index
+from waits import (wait_until, wait_for_app_idle, wait_for_url, wait_for_value,
+                   wait_for_value_change, wait_for_removal, print_wait_summary)
 
 # CONFIGURATION
 BASE_URL = "http://localhost:4200/#/"
@@ -25,95 +28,92 @@ BROWSERS = [
     ("edge", 3, "cart_results_edge.csv"),
 ]
 
-# SETUP DRIVER (MULTI-BROWSER)
-def setup_driver(browser_choice, browser_name):
-    print(f"    [Setup] Launching {browser_name.upper()} (code={browser_choice})...")
-    
-    win_width = 1200
-    win_height = 800
-    driver = None
-
-    try:
-        if browser_choice == 1:  # Chrome
-            options = webdriver.ChromeOptions()
-            options.add_argument(f"--window-size={win_width},{win_height}")
-            try:
-                service = ChromeService(ChromeDriverManager().install())
-            except Exception:
-                service = ChromeService()
-            driver = webdriver.Chrome(service=service, options=options)
-
-        elif browser_choice == 2:  # Firefox
-            options = webdriver.FirefoxOptions()
-            options.add_argument(f"--width={win_width}")
-            options.add_argument(f"--height={win_height}")
-            try:
-                service = FirefoxService(GeckoDriverManager().install())
-            except Exception:
-                service = FirefoxService()
-            driver = webdriver.Firefox(service=service, options=options)
-
-        elif browser_choice == 3:  # Edge
-            options = webdriver.EdgeOptions()
-            options.add_argument(f"--window-size={win_width},{win_height}")
-            try:
-                service = EdgeService(EdgeChromiumDriverManager().install())
-            except Exception:
-                service = EdgeService()
-            driver = webdriver.Edge(service=service, options=options)
-
-        else:
-            raise ValueError("Invalid browser_choice")
-
-        driver.set_window_position(0, 0)
-        driver.implicitly_wait(5)
-        return driver
-
-    except Exception as final_e:
-        print(f"\n[CRITICAL] Could not launch browser. Error: {final_e}")
-        raise
+# The whole cart table in one round trip: row text, quantity input value,
+# line price text and the grand total text
+CART_SNAPSHOT_JS = """
+const cell = (root, selector) => root.querySelector(selector);
+const rows = Array.from(document.querySelectorAll("tbody tr")).map(row => {
+    const qty = cell(row, "input.form-control");
+    const line = cell(row, "td[data-test='line-price']");
+    return {
+        text: row.innerText,
+        qty: qty ? qty.value : null,
+        line_price: line ? line.innerText : null,
+    };
+});
+const total = cell(document, "td[data-test='cart-total']");
+return { rows: rows, total: total ? total.innerText : null };
+"""
 
 # HELPER FUNCTIONS
 def force_click(driver, element):
     driver.execute_script("arguments[0].click();", element)
 
+@tracing.traced
 def reset_app_state(driver):
+    # Fast path: delete the cart through the API and reload with empty storage
     try:
-        driver.get(BASE_URL)
-        driver.execute_script("window.localStorage.clear();")
-        driver.execute_script("window.sessionStorage.clear();")
-        driver.delete_all_cookies()
+        if fixtures.reset_guest_state(driver, BASE_URL):
+            return
+    except Exception as e:
+        print(f"        [Warning] API reset failed, using the UI: {e}")
+
+    try:
+        driver_pool.clean_session(driver, BASE_URL)
         driver.refresh()
-        time.sleep(1)
+        wait_for_app_idle(driver, label="reset: reload")
 
         try:
             cart_badge = driver.find_element(By.CSS_SELECTOR, "[data-test='cart-quantity']")
             if int(cart_badge.text) > 0:
                 nav_cart = driver.find_element(By.CSS_SELECTOR, "[data-test='nav-cart']")
                 force_click(driver, nav_cart)
-                time.sleep(1)
+                wait_for_url(driver, "checkout", label="reset: open cart")
+                wait_for_app_idle(driver, label="reset: open cart")
                 deletes = driver.find_elements(By.CSS_SELECTOR, ".fa-remove")
                 for btn in deletes:
                     force_click(driver, btn)
-                    time.sleep(0.5)
+                    wait_for_removal(driver, btn, label="reset: delete item")
                 driver.get(BASE_URL)
         except Exception:
             pass
     except Exception as e:
         print(f"        [Warning] Reset failed: {e}")
 
+@tracing.traced
 def go_home(driver):
     try:
         logo = driver.find_element(By.CSS_SELECTOR, "a.navbar-brand")
         force_click(driver, logo)
-        time.sleep(1)
+        wait_for_app_idle(driver, label="go home")
     except Exception:
         driver.get(BASE_URL)
 
+@tracing.traced
+def open_product_by_id(driver, product_id, product_name):
+    driver.get(f"{BASE_URL}product/{product_id}")
+    wait_for_url(driver, f"/product/{product_id}", label="open product (index)")
+    wait_for_app_idle(driver, label="open product (index)")
+    try:
+        title = driver.find_element(By.CSS_SELECTOR, "[data-test='product-name']").text.strip()
+    except Exception:
+        title = ""
+    if title == product_name:
+        return True
+
+    # Stale entry (e.g. the database was reseeded): forget it and search instead
+    product_index.forget(product_name)
+    return False
+
+@tracing.traced
 def find_and_click_product(driver, product_name):
     if not product_name:
         return
 
+    product_id = product_index.lookup(product_name)
+    if product_id and open_product_by_id(driver, product_id, product_name):
+        return
+
     if "/product/" in driver.current_url or "checkout" in driver.current_url:
         go_home(driver)
 
@@ -121,50 +121,62 @@ def find_and_click_product(driver, product_name):
     current_page = 1
 
     while current_page <= max_pages:
+        product_index.record_cards(driver)
         try:
             xpath = f"//h5[@data-test='product-name' and normalize-space(text())='{product_name}']"
             product_title = driver.find_element(By.XPATH, xpath)
             product_card = product_title.find_element(By.XPATH, "./ancestor::a[@class='card']")
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", product_card)
-            time.sleep(0.5)
             force_click(driver, product_card)
-            time.sleep(1)
+            wait_for_url(driver, "/product/", label="open product")
+            wait_for_app_idle(driver, label="open product")
+            product_index.remember(product_name, driver.current_url.split("/product/")[-1])
             return
         except Exception:
             pass
 
         try:
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5)
             next_link = driver.find_element(By.CSS_SELECTOR, "li.pagination-next a")
             parent_li = next_link.find_element(By.XPATH, "./..")
             if "disabled" in parent_li.get_attribute("class"):
                 raise Exception(f"Product '{product_name}' not found (Reached Last Page).")
+            first_card = driver.find_element(By.CSS_SELECTOR, "h5[data-test='product-name']")
             force_click(driver, next_link)
             driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(2)
+            # The next page is in once the old cards are gone and the request has settled
+            wait_for_removal(driver, first_card, label="next page")
+            wait_for_app_idle(driver, label="next page")
             current_page += 1
         except Exception as e:
             raise Exception(f"Pagination failed looking for '{product_name}': {e}")
 
+def cart_snapshot(driver):
+    return driver.execute_script(CART_SNAPSHOT_JS) or {"rows": [], "total": None}
+
+def parse_price(text):
+    return float(text.replace('$', '').replace(',', '').strip())
+
+@tracing.traced
 def get_cart_total_price(driver):
     try:
-        total_element = driver.find_element(By.CSS_SELECTOR, "td[data-test='cart-total']")
-        price_text = total_element.text.replace('$', '').replace(',', '').strip()
-        return float(price_text)
+        return parse_price(cart_snapshot(driver)["total"])
     except Exception:
         return 0.0
 
+@tracing.traced
 def verify_cart_table_details(driver, product_names_str, expected_qtys_str, check_line_bugs):
     try:
         if "checkout" not in driver.current_url:
             nav_cart = driver.find_element(By.CSS_SELECTOR, "[data-test='nav-cart']")
             force_click(driver, nav_cart)
             WebDriverWait(driver, 3).until(EC.url_contains("checkout"))
-            time.sleep(2)
+            wait_for_app_idle(driver, label="cart table")
+            wait_until(driver, EC.presence_of_element_located((By.CSS_SELECTOR, "tbody tr")),
+                       3, "cart table", required=False)
 
         prods = [p.strip() for p in str(product_names_str).split(',')]
-        rows = driver.find_elements(By.CSS_SELECTOR, "tbody tr")
+        rows = cart_snapshot(driver)["rows"]
 
         if not rows:
             return False, "Table Empty", 0, []
@@ -177,16 +189,17 @@ def verify_cart_table_details(driver, product_names_str, expected_qtys_str, chec
         for prod in prods:
             found_row = False
             for row in rows:
-                if prod in row.text:
+                if prod in row["text"]:
                     found_row = True
-                    val = row.find_element(By.CSS_SELECTOR, "input.form-control").get_attribute("value")
+                    val = row["qty"]
+                    if val is None:
+                        raise Exception(f"No quantity input in the row of {prod}")
                     qty = float(val) if '.' in val else int(val)
                     total_found_qty += qty
 
                     if check_line_bugs:
                         try:
-                            line_price_el = row.find_element(By.CSS_SELECTOR, "td[data-test='line-price']")
-                            line_total = float(line_price_el.text.replace('$', '').strip())
+                            line_total = parse_price(row["line_price"])
                             if line_total == 0.00 and qty > 0:
                                 line_item_issues.append(f"Line Total Bug: {prod} shows $0.00")
                         except Exception:
@@ -204,6 +217,7 @@ def verify_cart_table_details(driver, product_names_str, expected_qtys_str, chec
     except Exception as e:
         return False, f"Error: {e}", 0, []
 
+@tracing.traced
 def add_item_and_capture_toast(driver, quantity, product_name):
     found_toast_text = None
     is_error_red = False
@@ -225,9 +239,8 @@ def add_item_and_capture_toast(driver, quantity, product_name):
         qty_input.click()
         qty_input.send_keys(Keys.CONTROL + "a")
         qty_input.send_keys(Keys.DELETE)
-        time.sleep(0.2)
         qty_input.send_keys(str(quantity))
-        time.sleep(0.5)
+        wait_for_value(driver, qty_input, quantity, label="quantity typed")
 
         add_btn = driver.find_element(By.CSS_SELECTOR, "[data-test='add-to-cart']")
         force_click(driver, add_btn)
@@ -255,6 +268,7 @@ def add_item_and_capture_toast(driver, quantity, product_name):
         print(f"        [Error] Add Item Failed: {e}")
         return None, False
 
+@tracing.traced
 def handle_stepper(driver, product_name, operation):
     try:
         if "/product/" not in driver.current_url:
@@ -273,62 +287,115 @@ def handle_stepper(driver, product_name, operation):
             qty_input.send_keys("5")
             btn = driver.find_element(By.CSS_SELECTOR, ".fa-minus").find_element(By.XPATH, "./..")
 
+        before = qty_input.get_attribute("value")
         force_click(driver, btn)
-        time.sleep(0.5)
+        wait_for_value_change(driver, qty_input, before, label="stepper")
         return int(qty_input.get_attribute("value"))
     except Exception:
         return 0
 
-# MAIN TEST RUNNER 
-def run_tests_for_browser(df, browser_name, browser_choice, output_file):
-    print(f"\n================= Running on {browser_name.upper()} =================\n")
-    results = []  # will store dict rows for CSV
+# STEP ACTIONS
+# Compiled cart steps (plan_compiler.compile_cart). Each action gets the driver,
+# the test case state and the step arguments.
+def step_add(driver, state, quantity, product_name, keep_toast):
+    toast_text, is_red = add_item_and_capture_toast(driver, quantity, product_name)
+    if keep_toast:
+        state["toast"], state["red"] = toast_text, is_red
 
-    driver = setup_driver(browser_choice, browser_name)
+def step_idle(driver, state, label):
+    wait_for_app_idle(driver, label=label)
 
+def step_home(driver, state):
+    go_home(driver)
+
+def step_open_cart(driver, state):
+    nav_cart = driver.find_element(By.CSS_SELECTOR, "[data-test='nav-cart']")
+    force_click(driver, nav_cart)
+    wait_for_url(driver, "checkout", label="open cart")
+    wait_for_app_idle(driver, label="open cart")
+
+def step_remove_first(driver, state, product_name):
     try:
-        print(f"Starting execution of {len(df)} test cases on {browser_name}...")
+        deletes = driver.find_elements(By.CSS_SELECTOR, ".fa-remove")
+        if deletes:
+            force_click(driver, deletes[0])
+            wait_for_removal(driver, deletes[0], label="delete item")
+
+        in_table, _, _, _ = verify_cart_table_details(driver, product_name, "0", False)
+        if in_table:
+            state["fail"] = "Delete Button Failed: Item still in cart"
+    except Exception:
+        pass
+
+def step_refresh(driver, state):
+    driver.refresh()
+    wait_for_app_idle(driver, label="refresh")
+
+def step_stepper(driver, state, product_name, operation):
+    state["stepper"] = handle_stepper(driver, product_name, operation)
+
+STEP_ACTIONS = {
+    "add": step_add,
+    "idle": step_idle,
+    "home": step_home,
+    "open_cart": step_open_cart,
+    "remove_first": step_remove_first,
+    "refresh": step_refresh,
+    "stepper": step_stepper,
+}
+
+def run_steps(driver, plan):
+    # Stops early when a step already decided the test case failed
+    state = {"toast": None, "red": False, "fail": None, "stepper": 0}
+    for action, *args in plan.steps:
+        STEP_ACTIONS[action](driver, state, *args)
+        if state["fail"]:
+            break
+    return state
 
-        for index, row in df.iterrows():
-            tc_id = row["TC_ID"]
-            desc = row["Description"]
-            flow = row["Flow_Type"]
-            inp = row["Input_Value"]
-            prod_name = str(row["Product_Name"]).strip()
+# MAIN TEST RUNNER 
+def run_tests_for_browser(df, browser_name, browser_choice, output_file, plans=None):
+    print(f"\n================= Running on {browser_name.upper()} =================\n")
+    df = selection.apply(df, "cart", browser_name)
+    if plans is None:
+        # Bad rows stop the run here, before a browser is launched
+        plans = plan_compiler.load_plans("cart", df)
+        if plans is None:
+            return
+    # Rows are streamed to output_file as each test case finishes
+    results = ResultWriter(output_file, df["TC_ID"])
+    df = results.pending(df)
+    plans = plan_compiler.select_plans(plans, df)
 
-            try:
-                if "," in str(row["Expected_Qty"]):
-                    exp_qtys_str = str(row["Expected_Qty"])
-                    exp_qty_total = sum([int(x) for x in exp_qtys_str.split(",")])
-                else:
-                    exp_qtys_str = str(row["Expected_Qty"])
-                    exp_qty_total = int(row["Expected_Qty"])
-            except Exception:
-                exp_qty_total = 0
-                exp_qtys_str = "0"
+    print(f"    [Setup] {browser_name.upper()} (code={browser_choice})")
+    tracing.start_run("cart", browser_name, output_file)
+    driver = None
 
-            exp_err = str(row["Expected_Error"]).strip()
+    try:
+        driver = driver_pool.acquire(browser_name, BASE_URL)
+        print(f"Starting execution of {len(plans)} test cases on {browser_name}...")
 
-            # PRICE CHECK
-            check_price = False
-            if exp_err and exp_err.replace(".", "", 1).isdigit():
-                check_price = True
+        for plan in plans:
+            tc_id = plan.tc_id
+            desc = plan.desc
+            exp_err = plan.expected_error
+            check_price = plan.expected_price is not None
 
             print(f"\n--- Running {tc_id}: {desc} ---")
+            tracing.start_test(tc_id, plan.flow)
 
+            driver, _ = driver_pool.ensure_healthy(driver, BASE_URL)
             reset_app_state(driver)
 
             actual_price = 0.0
-            last_toast_text = None
-            is_toast_red = False
             status = "PASS"
             report_messages = []
 
-            if flow == "UIStepper":
-                target = 2 if inp == "+" else 4
-                end_v = handle_stepper(driver, prod_name, inp)
+            if plan.stepper:
+                operation, target = plan.stepper
+                end_v = run_steps(driver, plan)["stepper"]
                 if end_v == target:
-                    msg = f"Stepper '{inp}' worked"
+                    msg = f"Stepper '{operation}' worked"
                     print(f"    [PASS] {msg}")
                     results.append({
                         "TC_ID": tc_id,
@@ -338,7 +405,7 @@ def run_tests_for_browser(df, browser_name, browser_choice, output_file):
                         "Details": msg
                     })
                 else:
-                    msg = f"Stepper '{inp}' stuck/wrong (Exp: {target} vs Act: {end_v})"
+                    msg = f"Stepper '{operation}' stuck/wrong (Exp: {target} vs Act: {end_v})"
                     print(f"    [FAIL] {msg}")
                     results.append({
                         "TC_ID": tc_id,
@@ -352,71 +419,28 @@ def run_tests_for_browser(df, browser_name, browser_choice, output_file):
             # Normal flows
             try:
                 # INTERACTION
-                if flow == "Simple" or flow == "CheckCart":
-                    last_toast_text, is_toast_red = add_item_and_capture_toast(driver, inp, prod_name)
-
-                elif flow == "Cumulative":
-                    steps = str(inp).split(",")
-                    for val in steps:
-                        last_toast_text, is_toast_red = add_item_and_capture_toast(driver, val, prod_name)
-                        time.sleep(1)
-
-                elif flow == "MultiProd":
-                    qtys = str(inp).split(",")
-                    prods = prod_name.split(",")
-                    for i in range(len(qtys)):
-                        go_home(driver)
-                        curr_qty = qtys[i] if i < len(qtys) else qtys[0]
-                        curr_prod = prods[i] if i < len(prods) else prods[0]
-                        last_toast_text, is_toast_red = add_item_and_capture_toast(driver, curr_qty, curr_prod.strip())
-
-                elif flow == "ComplexReset":
-                    steps = str(inp).split(",")
-                    add_item_and_capture_toast(driver, steps[0], prod_name)
-
-                    nav_cart = driver.find_element(By.CSS_SELECTOR, "[data-test='nav-cart']")
-                    force_click(driver, nav_cart)
-                    time.sleep(1)
-
-                    try:
-                        deletes = driver.find_elements(By.CSS_SELECTOR, ".fa-remove")
-                        if deletes:
-                            force_click(driver, deletes[0])
-                        time.sleep(1)
-
-                        in_table, _, _, _ = verify_cart_table_details(driver, prod_name, "0", False)
-                        if in_table:
-                            msg = "Delete Button Failed: Item still in cart"
-                            print(f"    [FAIL] {msg}")
-                            results.append({
-                                "TC_ID": tc_id,
-                                "Description": desc,
-                                "Browser": browser_name,
-                                "Status": "FAIL",
-                                "Details": msg
-                            })
-                            continue
-
-                    except Exception:
-                        pass
-
-                    go_home(driver)
-                    last_toast_text, is_toast_red = add_item_and_capture_toast(driver, steps[2], prod_name)
-
-                elif flow == "Refresh":
-                    add_item_and_capture_toast(driver, inp, prod_name)
-                    driver.refresh()
-                    time.sleep(2)
+                state = run_steps(driver, plan)
+                last_toast_text, is_toast_red = state["toast"], state["red"]
+                if state["fail"]:
+                    print(f"    [FAIL] {state['fail']}")
+                    results.append({
+                        "TC_ID": tc_id,
+                        "Description": desc,
+                        "Browser": browser_name,
+                        "Status": "FAIL",
+                        "Details": state["fail"]
+                    })
+                    continue
 
                 # VERIFICATION
                 should_check_line_bugs = check_price  # Only check $0.00 bug if price check is relevant
 
                 # 1. TABLE CHECK
                 found, msg, qty_val, line_bugs = verify_cart_table_details(
-                    driver, prod_name, exp_qtys_str, should_check_line_bugs
+                    driver, plan.product, plan.expected_qtys, should_check_line_bugs
                 )
 
-                if exp_qty_total == 0:
+                if plan.expected_total == 0:
                     if found and qty_val > 0:
                         status = "FAIL"
                         report_messages.append(
@@ -438,10 +462,10 @@ def run_tests_for_browser(df, browser_name, browser_choice, output_file):
                         status = "FAIL"
                         report_messages.append(msg)
                     else:
-                        if qty_val != exp_qty_total:
+                        if qty_val != plan.expected_total:
                             status = "FAIL"
                             report_messages.append(
-                                f"Qty Mismatch (Exp:{exp_qty_total} vs Act:{qty_val})"
+                                f"Qty Mismatch (Exp:{plan.expected_total} vs Act:{qty_val})"
                             )
                         else:
                             report_messages.append("Qty updates correctly")
@@ -452,7 +476,7 @@ def run_tests_for_browser(df, browser_name, browser_choice, output_file):
 
                 # 2. TOAST CHECK
                 if not check_price:
-                    if exp_err and not exp_err.replace(".", "", 1).isdigit():
+                    if exp_err:
                         if not last_toast_text or exp_err not in str(last_toast_text):
                             status = "FAIL"
                             report_messages.append(
@@ -468,17 +492,14 @@ def run_tests_for_browser(df, browser_name, browser_choice, output_file):
                 # 3. GRAND TOTAL CHECK
                 if check_price:
                     actual_price = get_cart_total_price(driver)
-                    try:
-                        exp_price = float(exp_err)
-                        if actual_price != exp_price:
-                            status = "FAIL"
-                            report_messages.append(
-                                f"Grand Total Mismatch (Exp:${exp_price} vs Act:${actual_price})"
-                            )
-                        else:
-                            report_messages.append(f"Grand Total Correct (${actual_price})")
-                    except Exception:
-                        pass
+                    exp_price = plan.expected_price
+                    if actual_price != exp_price:
+                        status = "FAIL"
+                        report_messages.append(
+                            f"Grand Total Mismatch (Exp:${exp_price} vs Act:${actual_price})"
+                        )
+                    else:
+                        report_messages.append(f"Grand Total Correct (${actual_price})")
 
                 # Final log for this TC
                 if status == "FAIL":
@@ -508,14 +529,23 @@ def run_tests_for_browser(df, browser_name, browser_choice, output_file):
                 })
 
     finally:
-        print(f"\nTest Run Complete on {browser_name}. Closing Browser...")
-        driver.quit()
-
-        # Export results for this browser
-        df_results = pd.DataFrame(results)
-        df_results.to_csv(output_file, index=False, encoding="utf-8")
+        print(f"\nTest Run Complete on {browser_name}. Releasing Browser...")
+        if driver is not None:
+            driver_pool.release(driver)
+        print_wait_summary()
+        tracing.finish_run()
+        if driver is None:
+            results.abandon()
+        else:
+            results.close()
+        selection.record_run("cart", browser_name, results.outcomes)
         print(f"[Info] Results for {browser_name} saved to: {output_file}")
 
+def run_tests_by_name(df, browser_name, output_file, plans=None):
+    # Same as run_tests_for_browser, keyed by the name used in BROWSERS
+    browser_choice = next(choice for name, choice, _ in BROWSERS if name == browser_name)
+    run_tests_for_browser(df, browser_name, browser_choice, output_file, plans)
+
 def main():
     try:
         df = pd.read_csv(DATA_FILE)
@@ -524,9 +554,17 @@ def main():
         print("Error: CSV file not found.")
         return
 
+    # Compiled once for all browsers: a bad row stops the run before any launch
+    plans = plan_compiler.load_plans("cart", df)
+    if plans is None:
+        return
+    run = functools.partial(run_tests_by_name, plans=plans)
+
     for browser_name, browser_choice, output_file in BROWSERS:
-        run_tests_for_browser(df, browser_name, browser_choice, output_file)
+        flakiness.run_with_retries(run, df, "cart", browser_name, output_file)
 
 
 if __name__ == "__main__":
+    run_profiles.apply_cli_profile()
+    selection.apply_cli_selection()
     main()
\ No newline at end of file
@@ -1,25 +1,22 @@
-import re
-import time
+import functools
 import pandas as pd
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (
-    NoSuchElementException,
-    StaleElementReferenceException,
-    TimeoutException,
-)
-
-# Drivers
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from selenium.common.exceptions import NoSuchElementException
+
+import driver_pool
+import run_profiles
+import fixtures
+import tracing
+from result_sink import ResultWriter
+import selection
+import flakiness
+import plan_compiler
+from waits import wait_until, wait_for_app_idle, wait_for_dom_quiet, wait_for_value, print_wait_summary
+from text_match import read_messages, match_messages
 
 # CONFIGURATION
 LOGIN_URL = "http://localhost:4200/#/auth/login"
@@ -30,78 +27,26 @@ DATA_FILE = "product_data.csv"
 ADMIN_EMAIL = "admin@practicesoftwaretesting.com"
 ADMIN_PASS = "welcome01"
 
-# TEXT HELPERS
-def normalize_text(s: str) -> str:
-    if s is None:
-        return ""
-    s = s.lower()
-    s = re.sub(r"[^\w\s]", " ", s)          # remove punctuation
-    s = re.sub(r"\b(the|field)\b", " ", s)  # drop filler words
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-def page_contains_text(driver, text: str) -> bool:
-    try:
-        return normalize_text(text) in normalize_text(driver.page_source)
-    except Exception:
-        return False
-
-# DRIVER SETUP (MULTI-BROWSER)
-def setup_driver(browser: str):
-    print(f"\n========== Launching {browser.upper()} ==========")
-
-    win_width = 1200
-    win_height = 800
-    driver = None
-
-    try:
-        if browser == "chrome":
-            options = webdriver.ChromeOptions()
-            options.add_argument(f"--window-size={win_width},{win_height}")
-            try:
-                service = ChromeService(ChromeDriverManager().install())
-            except Exception:
-                service = ChromeService()
-            driver = webdriver.Chrome(service=service, options=options)
-
-        elif browser == "firefox":
-            options = webdriver.FirefoxOptions()
-            options.add_argument(f"--width={win_width}")
-            options.add_argument(f"--height={win_height}")
-            try:
-                service = FirefoxService(GeckoDriverManager().install())
-            except Exception:
-                service = FirefoxService()
-            driver = webdriver.Firefox(service=service, options=options)
-
-        elif browser == "edge":
-            options = webdriver.EdgeOptions()
-            options.add_argument(f"--window-size={win_width},{win_height}")
-            try:
-                service = EdgeService(EdgeChromiumDriverManager().install())
-            except Exception:
-                service = EdgeService()
-            driver = webdriver.Edge(service=service, options=options)
-
-        else:
-            raise ValueError(f"Invalid browser value: {browser}")
-
-        driver.set_window_position(0, 0)
-        driver.implicitly_wait(5)
-        return driver
-
-    except Exception as final_e:
-        print(f"\n[CRITICAL] Could not launch {browser}. Error: {final_e}")
-        raise
+# Toast keywords, matched together with the expected error
+ERROR_WORDS = ["required", "must be", "wrong", "invalid"]
+SUCCESS_WORDS = ["product saved"]
 
 # HELPER FUNCTIONS 
 def force_click(driver, element):
     driver.execute_script("arguments[0].click();", element)
 
+@tracing.traced
 def admin_login(driver):
+    # Fast path: API token injected into localStorage
+    try:
+        if fixtures.inject_login(driver, LOGIN_URL, BASE_URL + "admin/dashboard", ADMIN_EMAIL, ADMIN_PASS):
+            print("    [Info] Admin Login Successful (API token)")
+            return
+    except Exception as e:
+        print(f"    [WARN] API login failed, using the form: {e}")
+
     try:
         driver.get(LOGIN_URL)
-        time.sleep(1)
 
         email_in = WebDriverWait(driver, 5).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test='email']"))
@@ -124,6 +69,7 @@ def admin_login(driver):
         print(f"    [Error] Login Failed: {e}")
         raise
 
+@tracing.traced
 def go_to_products_page(driver):
     try:
         driver.get(BASE_URL + "admin/products")
@@ -135,6 +81,7 @@ def go_to_products_page(driver):
     except Exception:
         print("    [Error] Could not reach Products Page")
 
+@tracing.traced
 def smart_input(driver, field_name, value):
     # Normalize CSV value
     if value is None:
@@ -167,14 +114,12 @@ def smart_input(driver, field_name, value):
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", el)
         except Exception:
             pass
-        time.sleep(0.05)
 
         # click into the field
         try:
             el.click()
         except Exception:
             pass
-        time.sleep(0.05)
 
         # a) standard clear()
         try:
@@ -212,16 +157,12 @@ def smart_input(driver, field_name, value):
         except Exception:
             pass
 
-        time.sleep(0.1)
-
         # 3. Type the new value
         if to_type != "":
             el.send_keys(to_type)
-            time.sleep(0.1)
 
             # Extra JS set fallback if typing failed
-            current_val = el.get_attribute("value")
-            if current_val != to_type:
+            if not wait_for_value(driver, el, to_type, timeout=0.5, label="smart_input typed"):
                 driver.execute_script(
                     "arguments[0].value = arguments[1];"
                     "arguments[0].dispatchEvent(new Event('input', { bubbles: true }));",
@@ -232,6 +173,7 @@ def smart_input(driver, field_name, value):
     except Exception as e:
         print(f"    [WARN] smart_input failed for '{field_name}': {e}")
 
+@tracing.traced
 def smart_select(driver, field_name, value):
     if value is None:
         return
@@ -270,6 +212,7 @@ def smart_select(driver, field_name, value):
     except Exception:
         pass
 
+@tracing.traced
 def smart_check(driver, field_name, should_check):
     if not should_check:
         return
@@ -285,363 +228,336 @@ def smart_check(driver, field_name, should_check):
     except Exception:
         pass
 
-def capture_toasts(driver):
-    toasts_found = []
-    has_success = False
-    has_error = False
+@tracing.traced
+def capture_toasts(driver, exp_err=""):
+    # One script call per poll: waits up to 3 seconds for any message, then
+    # classifies every message against all patterns in a single pass.
+    # Returns (toasts, has_success, has_error, toasts matching exp_err, inline match)
+    messages = wait_until(driver, read_messages, timeout=3, label="toasts", required=False) or []
+
+    patterns = [exp_err] + ERROR_WORDS + SUCCESS_WORDS
+    error_ids = set(range(1, 1 + len(ERROR_WORDS)))
+    success_ids = set(range(1 + len(ERROR_WORDS), len(patterns)))
+
+    toasts_found, expected_toasts = [], []
+    has_success = has_error = inline_match = False
+    for kind, text, classes, _, hits in match_messages(messages, patterns):
+        if kind == "inline":
+            inline_match = inline_match or 0 in hits
+            continue
 
-    selector = (
-        ".toast, .toast-message, .toast-container .toast, "
-        ".alert, [role='alert']"
-    )
+        toasts_found.append(text)
+        if 0 in hits:
+            expected_toasts.append(text)
 
-    try:
-        # Wait up to 3 seconds for ANY toast/alert to show up
-        try:
-            WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-            )
-        except TimeoutException:
-            # none visible within timeout
-            pass
+        # Success detection
+        if "success" in classes or hits & success_ids:
+            has_success = True
 
-        elems = driver.find_elements(By.CSS_SELECTOR, selector)
+        # Error/validation detection
+        if "danger" in classes or "error" in classes or "invalid" in classes or hits & error_ids:
+            has_error = True
 
-    except Exception:
-        return toasts_found, has_success, has_error
+    return toasts_found, has_success, has_error, expected_toasts, inline_match
 
-    for t in elems:
-        try:
-            if not t.is_displayed():
-                continue
-            text = t.text.strip()
-            if not text:
-                continue
-
-            toasts_found.append(text)
-
-            classes = (t.get_attribute("class") or "").lower()
-            txt = text.lower()
-
-            # Success detection
-            if (
-                "success" in classes
-                or "alert-success" in classes
-                or "bg-success" in classes
-                or "product saved" in txt
-            ):
-                has_success = True
-
-            # Error/validation detection
-            if (
-                "danger" in classes
-                or "alert-danger" in classes
-                or "error" in classes
-                or "invalid" in classes
-                or any(k in txt for k in ["required", "must be", "wrong", "invalid"])
-            ):
-                has_error = True
-
-        except StaleElementReferenceException:
-            continue
-        except Exception:
-            continue
+# STEP ACTIONS
+# Compiled product steps (plan_compiler.compile_product)
+def step_open_add_form(driver):
+    add_btn = driver.find_element(
+        By.CSS_SELECTOR, "[data-test='product-add']"
+    )
+    force_click(driver, add_btn)
 
-    return toasts_found, has_success, has_error
+    # Wait for the Name field to appear
+    WebDriverWait(driver, 5).until(
+        EC.presence_of_element_located(
+            (By.CSS_SELECTOR, "[data-test='name']")
+        )
+    )
 
-# MAIN TEST LOOP
-def run_admin_tests():
-    # Load data once
-    try:
-        df = pd.read_csv(DATA_FILE)
-        df = df.fillna("")
-    except Exception:
-        print(f"Error: Could not find {DATA_FILE}")
-        return
+def step_open_edit(driver, target_prod):
+    # Always start from the product list page
+    go_to_products_page(driver)
 
-    browsers = ["chrome", "firefox", "edge"]
+    # Row whose 2nd cell (Name column) matches target_prod exactly
+    row_xpath = (
+        "//app-products-list//table//tbody"
+        f"//tr[td[2][normalize-space(.)='{target_prod}']]"
+    )
 
-    for browser in browsers:
-        results = []
+    row_el = WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.XPATH, row_xpath))
+    )
 
-        driver = setup_driver(browser)
+    # Find the Edit button inside that row
+    try:
+        edit_btn = row_el.find_element(
+            By.CSS_SELECTOR, "a[data-test^='product-edit']"
+        )
+    except NoSuchElementException:
+        edit_btn = row_el.find_element(
+            By.XPATH, ".//a[normalize-space(text())='Edit']"
+        )
 
-        try:
-            admin_login(driver)
-            print(f"Starting execution of {len(df)} test cases on {browser.upper()}...")
+    driver.execute_script(
+        "arguments[0].scrollIntoView({block: 'center'});",
+        edit_btn,
+    )
+    force_click(driver, edit_btn)
+    WebDriverWait(driver, 5).until(
+        EC.presence_of_element_located(
+            (By.CSS_SELECTOR, "[data-test='name']")
+        )
+    )
+    wait_for_app_idle(driver, label="edit form")
 
-            for index, row in df.iterrows():
-                tc_id = row["TC_ID"]
-                desc = row["Description"]
-                flow = row["Flow_Type"]
-                target_prod = str(row["Target_Product"]).strip()
-                exp_err = str(row["Expected_Error"]).strip()
+def step_scroll_bottom(driver):
+    driver.execute_script(
+        "window.scrollTo(0, document.body.scrollHeight);"
+    )
 
-                print(f"\n--- {browser.upper()} | {tc_id}: {desc} ---")
+def step_check(driver, field_name):
+    smart_check(driver, field_name, True)
 
-                go_to_products_page(driver)
+def step_submit(driver, scroll):
+    save_btn = driver.find_element(
+        By.CSS_SELECTOR, "[data-test='product-submit']"
+    )
+    if scroll:
+        driver.execute_script(
+            "arguments[0].scrollIntoView({block: 'center'});",
+            save_btn,
+        )
+    force_click(driver, save_btn)
+
+STEP_ACTIONS = {
+    "open_add_form": step_open_add_form,
+    "open_edit": step_open_edit,
+    "input": smart_input,
+    "select": smart_select,
+    "scroll_bottom": step_scroll_bottom,
+    "check": step_check,
+    "submit": step_submit,
+}
+
+def run_steps(driver, plan):
+    for action, *args in plan.steps:
+        STEP_ACTIONS[action](driver, *args)
 
-                status = "PASS"
-                fail_reason = ""
-                pass_message = ""
-                joined_toasts = ""
-                actual_error_seen = ""
+# MAIN TEST LOOP
+def run_admin_tests_for_browser(df, browser, out_file, plans=None):
+    df = selection.apply(df, "product", browser)
+    if plans is None:
+        # Bad rows stop the run here, before a browser is launched
+        plans = plan_compiler.load_plans("product", df)
+        if plans is None:
+            return
+    # Rows are streamed to out_file as each test case finishes
+    results = ResultWriter(out_file, df["TC_ID"])
+    df = results.pending(df)
+    plans = plan_compiler.select_plans(plans, df)
 
-                try:
-                    # HANDLE FLOWS
-                    if flow == "Add":
-                        add_btn = driver.find_element(
-                            By.CSS_SELECTOR, "[data-test='product-add']"
-                        )
-                        force_click(driver, add_btn)
+    print(f"\n========== Launching {browser.upper()} ==========")
+    tracing.start_run("product", browser, out_file)
+    driver = None
 
-                        # Wait for the Name field to appear
-                        WebDriverWait(driver, 5).until(
-                            EC.presence_of_element_located(
-                                (By.CSS_SELECTOR, "[data-test='name']")
-                            )
-                        )
+    try:
+        driver = driver_pool.acquire(browser, BASE_URL)
+        admin_login(driver)
+        print(f"Starting execution of {len(plans)} test cases on {browser.upper()}...")
 
-                        # Fill Text Fields
-                        smart_input(driver, "name", row["Name"])
-                        smart_input(driver, "price", row["Price"])
-                        smart_input(driver, "stock", row["Stock"])
-                        smart_input(driver, "description", row["Description_Input"])
+        for plan in plans:
+            tc_id = plan.tc_id
+            desc = plan.desc
+            flow = plan.flow
+            exp_err = plan.expected_error
 
-                        # Fill Dropdowns
-                        smart_select(driver, "brand_id", row["Brand"])
-                        smart_select(driver, "category_id", row["Category"])
-                        smart_select(driver, "product_image_id", row["Image"])
-                        smart_select(driver, "co2_rating", row["CO2"])
+            print(f"\n--- {browser.upper()} | {tc_id}: {desc} ---")
+            tracing.start_test(tc_id, flow)
 
-                        driver.execute_script(
-                            "window.scrollTo(0, document.body.scrollHeight);"
-                        )
-                        time.sleep(0.5)
+            driver, relaunched = driver_pool.ensure_healthy(driver, BASE_URL)
+            if relaunched:
+                admin_login(driver)
 
-                        # Fill Checkboxes
-                        smart_check(driver, "is_location_offer", row["Check_Location"])
-                        smart_check(driver, "is_rental", row["Check_Rental"])
+            go_to_products_page(driver)
 
-                        save_btn = driver.find_element(
-                            By.CSS_SELECTOR, "[data-test='product-submit']"
-                        )
-                        force_click(driver, save_btn)
+            status = "PASS"
+            fail_reason = ""
+            pass_message = ""
+            joined_toasts = ""
+            actual_error_seen = ""
 
-                    elif flow == "Edit":
-                        try:
-                            # Always start from the product list page
-                            go_to_products_page(driver)
+            try:
+                # RUN STEPS
+                try:
+                    run_steps(driver, plan)
+                except Exception as e:
+                    # Edit rows report a missing product; anything else is critical
+                    if not plan.step_error:
+                        raise
+                    msg = f"{plan.step_error}: {e}"
+                    print(f"    [FAIL] {msg}")
+                    status = "SCRIPT_ERROR"
+                    fail_reason = msg
+
+                # VERIFICATION
+                max_attempts = 3
+                attempt_delay = 0.7  # max seconds to wait for the page to settle between attempts
+
+                toasts = []
+                has_success = False
+                has_error = False
+                matched_toasts = []
+                match_in_page = False
+
+                for attempt in range(max_attempts):
+                    toasts, has_success, has_error, matched_toasts, match_in_page = capture_toasts(
+                        driver, exp_err
+                    )
+                    joined_toasts = " | ".join(toasts)
+                    match_in_toasts = bool(matched_toasts)
+
+                    # If we expect an error and we've seen it → stop retrying.
+                    if exp_err and (match_in_toasts or match_in_page):
+                        break
+
+                    # If we don't expect an error and we already have success or error flags, no need to wait more.
+                    if not exp_err and (has_success or has_error):
+                        break
+
+                    if attempt < max_attempts - 1:
+                        wait_for_dom_quiet(driver, timeout=attempt_delay, label="toast retry")
+
+                # After retries, decide PASS/FAIL
+                if status != "SCRIPT_ERROR":  # only evaluate if earlier logic didn't blow up
+                    if exp_err:
+                        # Decided on the last capture: the retries already re-read the page
+                        if match_in_toasts or match_in_page:
+                            # Only show the toast(s) that match expected error, if any
+                            if match_in_toasts:
+                                shown = " | ".join(matched_toasts)
+                            else:
+                                # Inline-only error; show expected text as what we looked for
+                                shown = exp_err
 
-                            # Row whose 2nd cell (Name column) matches target_prod exactly
-                            row_xpath = (
-                                "//app-products-list//table//tbody"
-                                f"//tr[td[2][normalize-space(.)='{target_prod}']]"
+                            actual_error_seen = shown
+                            pass_message = (
+                                f"[PASS] Expected error present. Seen: {shown}"
                             )
-
-                            row_el = WebDriverWait(driver, 10).until(
-                                EC.presence_of_element_located((By.XPATH, row_xpath))
+                        else:
+                            status = "FAIL"
+                            fail_reason = (
+                                f"Expected Error '{exp_err}' NOT found "
+                                f"(Got: '{joined_toasts or 'NO TOASTS/ERROR TEXT FOUND'}')"
                             )
-
-                            # Find the Edit button inside that row
-                            try:
-                                edit_btn = row_el.find_element(
-                                    By.CSS_SELECTOR, "a[data-test^='product-edit']"
+                    else:
+                        # We expect success
+                        if has_success:
+                            if has_error:
+                                pass_message = (
+                                    f"[PASS] Success + Error both shown: {joined_toasts}"
                                 )
-                            except NoSuchElementException:
-                                edit_btn = row_el.find_element(
-                                    By.XPATH, ".//a[normalize-space(text())='Edit']"
+                            else:
+                                pass_message = (
+                                    f"[PASS] Success: {joined_toasts or 'No toast text'}"
                                 )
-
-                            driver.execute_script(
-                                "arguments[0].scrollIntoView({block: 'center'});",
-                                edit_btn,
+                        elif has_error:
+                            status = "FAIL"
+                            fail_reason = (
+                                f"Unexpected Error: '{joined_toasts or 'NO TEXT'}'"
                             )
-                            time.sleep(0.3)
-                            force_click(driver, edit_btn)
-                            time.sleep(0.5)
-
-                            # Now we are on the edit form – update fields if provided
-                            if row["Name"]:
-                                smart_input(driver, "name", row["Name"])
-                            if row["Price"]:
-                                smart_input(driver, "price", row["Price"])
-                            if str(row["Stock"]).strip() != "":
-                                smart_input(driver, "stock", row["Stock"])
-                            if row["Description_Input"]:
-                                smart_input(driver, "description", row["Description_Input"])
-
-                            save_btn = driver.find_element(
-                                By.CSS_SELECTOR, "[data-test='product-submit']"
-                            )
-                            driver.execute_script(
-                                "arguments[0].scrollIntoView({block: 'center'});",
-                                save_btn,
-                            )
-                            time.sleep(0.3)
-                            force_click(driver, save_btn)
-
-                        except Exception as e:
-                            msg = f"Could not find product '{target_prod}' to Edit: {e}"
-                            print(f"    [FAIL] {msg}")
-                            status = "SCRIPT_ERROR"
-                            fail_reason = msg
-
-                    # VERIFICATION
-                    max_attempts = 3
-                    attempt_delay = 0.7  # seconds
-
-                    toasts = []
-                    has_success = False
-                    has_error = False
-
-                    for attempt in range(max_attempts):
-                        toasts, has_success, has_error = capture_toasts(driver)
-                        joined_toasts = " | ".join(toasts)
-
-                        norm_expected = normalize_text(exp_err)
-                        norm_page = normalize_text(driver.page_source)
-                        norm_toasts_list = [normalize_text(t) for t in toasts]
-
-                        match_in_toasts = bool(
-                            exp_err
-                            and norm_expected
-                            and any(norm_expected in nt for nt in norm_toasts_list)
-                        )
-                        match_in_page = bool(
-                            exp_err and norm_expected and norm_expected in norm_page
-                        )
-
-                        # If we expect an error and we've seen it → stop retrying.
-                        if exp_err and (match_in_toasts or match_in_page):
-                            break
-
-                        # If we don't expect an error and we already have success or error flags, no need to wait more.
-                        if not exp_err and (has_success or has_error):
-                            break
-
-                        if attempt < max_attempts - 1:
-                            time.sleep(attempt_delay)
+                        else:
+                            pass_message = "[PASS] No toasts shown (silent success)."
 
-                    # After retries, decide PASS/FAIL
-                    if status != "SCRIPT_ERROR":  # only evaluate if earlier logic didn't blow up
-                        if exp_err:
-                            norm_expected = normalize_text(exp_err)
-                            norm_page = normalize_text(driver.page_source)
-                            norm_toasts_list = [normalize_text(t) for t in toasts]
+                # Print final line for this test case
+                if status == "FAIL":
+                    print(f"    [FAIL] {fail_reason}")
+                elif status == "SCRIPT_ERROR":
+                    print(f"    [SCRIPT_ERROR] {fail_reason}")
+                else:
+                    print(f"    {pass_message}")
 
-                            match_in_toasts = bool(
-                                norm_expected
-                                and any(norm_expected in nt for nt in norm_toasts_list)
+                # RESET PAGE FOR NEXT TEST CASE
+                try:
+                    if flow == "Add":
+                        # Prefer Back link if present
+                        try:
+                            back_link = driver.find_element(
+                                By.CSS_SELECTOR, "[data-test='back']"
                             )
-                            match_in_page = bool(
-                                norm_expected and norm_expected in norm_page
+                            back_link.click()
+                        except Exception:
+                            driver.get(BASE_URL + "admin/products")
+
+                        WebDriverWait(driver, 5).until(
+                            EC.presence_of_element_located(
+                                (By.CSS_SELECTOR, "[data-test='product-add']")
                             )
+                        )
+                    else:
+                        # For Edit, ensure we're on the list
+                        go_to_products_page(driver)
+                except Exception as nav_e:
+                    print(f"    [WARN] Could not reset page cleanly: {nav_e}")
+                    driver.get(BASE_URL + "admin/products")
+
+            except Exception as e:
+                print(f"    [CRITICAL FAIL] Script error: {e}")
+                status = "SCRIPT_ERROR"
+                fail_reason = str(e)
+                driver.refresh()
+                go_to_products_page(driver)
 
-                            if match_in_toasts or match_in_page:
-                                # Only show the toast(s) that match expected error, if any
-                                if match_in_toasts:
-                                    matched_toasts = [
-                                        t
-                                        for t, nt in zip(toasts, norm_toasts_list)
-                                        if norm_expected in nt
-                                    ]
-                                    shown = " | ".join(matched_toasts)
-                                else:
-                                    # Inline-only error; show expected text as what we looked for
-                                    shown = exp_err
-
-                                actual_error_seen = shown
-                                pass_message = (
-                                    f"[PASS] Expected error present. Seen: {shown}"
-                                )
-                            else:
-                                status = "FAIL"
-                                fail_reason = (
-                                    f"Expected Error '{exp_err}' NOT found "
-                                    f"(Got: '{joined_toasts or 'NO TOASTS/ERROR TEXT FOUND'}')"
-                                )
-                        else:
-                            # We expect success
-                            if has_success:
-                                if has_error:
-                                    pass_message = (
-                                        f"[PASS] Success + Error both shown: {joined_toasts}"
-                                    )
-                                else:
-                                    pass_message = (
-                                        f"[PASS] Success: {joined_toasts or 'No toast text'}"
-                                    )
-                            elif has_error:
-                                status = "FAIL"
-                                fail_reason = (
-                                    f"Unexpected Error: '{joined_toasts or 'NO TEXT'}'"
-                                )
-                            else:
-                                pass_message = "[PASS] No toasts shown (silent success)."
+            # Record result row
+            results.append(
+                {
+                    "TC_ID": tc_id,
+                    "Description": desc,
+                    "Browser": browser,
+                    "Flow_Type": flow,
+                    "Status": status,
+                    "Expected_Error": exp_err,
+                    "Actual_Error_Seen": actual_error_seen,
+                    "Toasts": joined_toasts,
+                    "Details": fail_reason if status != "PASS" else pass_message,
+                }
+            )
 
-                    # Print final line for this test case
-                    if status == "FAIL":
-                        print(f"    [FAIL] {fail_reason}")
-                    elif status == "SCRIPT_ERROR":
-                        print(f"    [SCRIPT_ERROR] {fail_reason}")
-                    else:
-                        print(f"    {pass_message}")
-
-                    # RESET PAGE FOR NEXT TEST CASE
-                    try:
-                        if flow == "Add":
-                            # Prefer Back link if present
-                            try:
-                                back_link = driver.find_element(
-                                    By.CSS_SELECTOR, "[data-test='back']"
-                                )
-                                back_link.click()
-                            except Exception:
-                                driver.get(BASE_URL + "admin/products")
+    finally:
+        print(f"\nTest Run Complete for {browser.upper()}. Releasing Browser...")
+        if driver is not None:
+            driver_pool.release(driver)
+        print_wait_summary()
+        tracing.finish_run()
+        if driver is None:
+            results.abandon()
+        else:
+            results.close()
+        selection.record_run("product", browser, results.outcomes)
+        print(f"[INFO] Results saved to {out_file}")
 
-                            WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located(
-                                    (By.CSS_SELECTOR, "[data-test='product-add']")
-                                )
-                            )
-                        else:
-                            # For Edit, ensure we're on the list
-                            go_to_products_page(driver)
-                    except Exception as nav_e:
-                        print(f"    [WARN] Could not reset page cleanly: {nav_e}")
-                        driver.get(BASE_URL + "admin/products")
+def run_admin_tests():
+    # Load data once
+    try:
+        df = pd.read_csv(DATA_FILE)
+        df = df.fillna("")
+    except Exception:
+        print(f"Error: Could not find {DATA_FILE}")
+        return
 
-                except Exception as e:
-                    print(f"    [CRITICAL FAIL] Script error: {e}")
-                    status = "SCRIPT_ERROR"
-                    fail_reason = str(e)
-                    driver.refresh()
-                    go_to_products_page(driver)
-
-                # Record result row
-                results.append(
-                    {
-                        "TC_ID": tc_id,
-                        "Description": desc,
-                        "Browser": browser,
-                        "Flow_Type": flow,
-                        "Status": status,
-                        "Expected_Error": exp_err,
-                        "Actual_Error_Seen": actual_error_seen,
-                        "Toasts": joined_toasts,
-                        "Details": fail_reason if status != "PASS" else pass_message,
-                    }
-                )
+    # Compiled once for all browsers: a bad row stops the run before any launch
+    plans = plan_compiler.load_plans("product", df)
+    if plans is None:
+        return
+    run = functools.partial(run_admin_tests_for_browser, plans=plans)
 
-        finally:
-            print(f"\nTest Run Complete for {browser.upper()}. Closing Browser...")
-            driver.quit()
+    browsers = ["chrome", "firefox", "edge"]
 
-            # Save CSV report for this browser
-            out_file = f"results_product_{browser}.csv"
-            pd.DataFrame(results).to_csv(out_file, index=False)
-            print(f"[INFO] Results saved to {out_file}")
+    for browser in browsers:
+        flakiness.run_with_retries(run, df, "product", browser,
+                                   f"results_product_{browser}.csv")
 
 if __name__ == "__main__":
+    run_profiles.apply_cli_profile()
+    selection.apply_cli_selection()
     run_admin_tests()
\ No newline at end of file
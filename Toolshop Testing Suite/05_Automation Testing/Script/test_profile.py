@@ -1,80 +1,46 @@
+import functools
 import pandas as pd
-import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-# Drivers
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+import driver_pool
+import run_profiles
+import fixtures
+import tracing
+from result_sink import ResultWriter
+import selection
+import flakiness
+import plan_compiler
+from waits import wait_for_app_idle, wait_for_value, print_wait_summary
 
 # CONFIGURATION
 LOGIN_URL = "http://localhost:4200/#/auth/login"
+ACCOUNT_URL = "http://localhost:4200/#/account"
 DATA_FILE = "profile_data.csv"
 
-# DRIVER SETUP (MULTI-BROWSER)
-def setup_driver(browser: str):
-    print(f"\n========== Launching {browser.upper()} ==========")
-
-    win_width = 1200
-    win_height = 800
-
-    driver = None
-
-    try:
-        if browser == "chrome":
-            options = webdriver.ChromeOptions()
-            options.add_argument(f"--window-size={win_width},{win_height}")
-            try:
-                service = ChromeService(ChromeDriverManager().install())
-            except Exception:
-                service = ChromeService()
-            driver = webdriver.Chrome(service=service, options=options)
-
-        elif browser == "firefox":
-            options = webdriver.FirefoxOptions()
-            options.add_argument(f"--width={win_width}")
-            options.add_argument(f"--height={win_height}")
-            try:
-                service = FirefoxService(GeckoDriverManager().install())
-            except Exception:
-                service = FirefoxService()
-            driver = webdriver.Firefox(service=service, options=options)
-
-        elif browser == "edge":
-            options = webdriver.EdgeOptions()
-            options.add_argument(f"--window-size={win_width},{win_height}")
-            try:
-                service = EdgeService(EdgeChromiumDriverManager().install())
-            except Exception:
-                service = EdgeService()
-            driver = webdriver.Edge(service=service, options=options)
-
-        else:
-            raise ValueError(f"Invalid browser value: {browser}")
-
-        driver.set_window_position(0, 0)
-        driver.implicitly_wait(5)
-        return driver
-
-    except Exception as final_e:
-        print(f"\n[CRITICAL] Could not launch {browser}. Error: {final_e}")
-        raise
+# Customer Credentials
+CUSTOMER_EMAIL = "customer@practicesoftwaretesting.com"
+CUSTOMER_PASS = "welcome01"
 
 # HELPER FUNCTIONS
 def force_click(driver, element):
     driver.execute_script("arguments[0].click();", element)
 
+@tracing.traced
 def login(driver):
+    # Fast path: API token injected into localStorage
+    try:
+        if fixtures.inject_login(driver, LOGIN_URL, ACCOUNT_URL, CUSTOMER_EMAIL, CUSTOMER_PASS):
+            WebDriverWait(driver, 5).until(EC.url_contains("account"))
+            print("    [Info] Login Successful (API token)")
+            return
+    except Exception as e:
+        print(f"    [WARN] API login failed, using the form: {e}")
+
     try:
         driver.get(LOGIN_URL)
-        time.sleep(1)
 
         email_in = WebDriverWait(driver, 5).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test='email']"))
@@ -82,8 +48,8 @@ def login(driver):
         pass_in = driver.find_element(By.CSS_SELECTOR, "[data-test='password']")
 
         # CREDENTIALS
-        email_in.send_keys("customer@practicesoftwaretesting.com")
-        pass_in.send_keys("welcome01")
+        email_in.send_keys(CUSTOMER_EMAIL)
+        pass_in.send_keys(CUSTOMER_PASS)
 
         submit_btn = driver.find_element(By.CSS_SELECTOR, "[data-test='login-submit']")
         force_click(driver, submit_btn)
@@ -96,31 +62,35 @@ def login(driver):
         print(f"    [Error] Login Failed: {e}")
         raise
 
+@tracing.traced
 def ensure_profile_page(driver):
     try:
         # If not on profile page, navigate there
         if "/account/profile" not in driver.current_url:
             driver.get(driver.current_url.split("#")[0] + "#/account/profile")
-            time.sleep(1)
 
-        # Wait for form to load
+        # Wait for form to load, then for the profile request to fill it
         WebDriverWait(driver, 3).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test='first-name']"))
         )
+        wait_for_app_idle(driver, label="profile loaded")
     except Exception:
         # Fallback force navigation
         driver.get("http://localhost:4200/#/account/profile")
-        time.sleep(1)
+        wait_for_app_idle(driver, label="profile loaded")
 
+@tracing.traced
 def clear_and_type(element, text):
+    driver = element.parent
     element.click()
     element.send_keys(Keys.CONTROL + "a")
     element.send_keys(Keys.DELETE)
-    time.sleep(0.1)
+    wait_for_value(driver, element, "", label="field cleared")
     if text and str(text).lower() != "nan":
         element.send_keys(str(text))
-    time.sleep(0.2)
+        wait_for_value(driver, element, str(text), label="field typed")
 
+@tracing.traced
 def capture_toast(driver):
     found_text = None
     is_red = False
@@ -152,185 +122,215 @@ def capture_toast(driver):
 
     return found_text, is_red
 
-# MAIN TEST RUNNER
-def run_profile_tests():
-    # Load data once
+def find_field(driver, selector, field_name):
     try:
-        df = pd.read_csv(DATA_FILE)
-        df = df.fillna("")
+        return driver.find_element(By.CSS_SELECTOR, selector)
     except Exception:
-        print(f"Error: Could not find {DATA_FILE}")
-        return
+        return driver.find_element(By.ID, field_name)
+
+# STEP ACTIONS
+# Compiled profile steps (plan_compiler.compile_profile)
+def step_type(driver, selector, field_name, value):
+    clear_and_type(find_field(driver, selector, field_name), value)
+
+def step_reload(driver):
+    driver.refresh()
+    wait_for_app_idle(driver, label="reload")
+    ensure_profile_page(driver)
+
+def step_save(driver):
+    save_btn = driver.find_element(
+        By.XPATH, "//button[normalize-space()='Update Profile']"
+    )
+    driver.execute_script(
+        "arguments[0].scrollIntoView({block: 'center'});", save_btn
+    )
+    force_click(driver, save_btn)
+
+STEP_ACTIONS = {
+    "type": step_type,
+    "reload": step_reload,
+    "save": step_save,
+}
+
+def run_steps(driver, plan):
+    for action, *args in plan.steps:
+        STEP_ACTIONS[action](driver, *args)
 
-    browsers = ["chrome", "firefox", "edge"]
+# MAIN TEST RUNNER
+def run_profile_tests_for_browser(df, browser, out_file, plans=None):
+    df = selection.apply(df, "profile", browser)
+    if plans is None:
+        # Bad rows stop the run here, before a browser is launched
+        plans = plan_compiler.load_plans("profile", df)
+        if plans is None:
+            return
+    # Rows are streamed to out_file as each test case finishes
+    results = ResultWriter(out_file, df["TC_ID"])
+    df = results.pending(df)
+    plans = plan_compiler.select_plans(plans, df)
 
-    for browser in browsers:
-        results = []
+    print(f"\n========== Launching {browser.upper()} ==========")
+    tracing.start_run("profile", browser, out_file)
+    driver = None
+
+    try:
+        driver = driver_pool.acquire(browser, LOGIN_URL)
+        # 1. Login
+        login(driver)
 
-        driver = setup_driver(browser)
+        print(f"Starting execution of {len(plans)} test cases on {browser.upper()}...")
 
-        try:
-            # 1. Login
-            login(driver)
+        for plan in plans:
+            tc_id = plan.tc_id
+            desc = plan.desc
+            exp_err = plan.expected_error
 
-            print(f"Starting execution of {len(df)} test cases on {browser.upper()}...")
+            print(f"\n--- {browser.upper()} | {tc_id}: {desc} ---")
+            tracing.start_test(tc_id, plan.field)
 
-            for index, row in df.iterrows():
-                tc_id = row["TC_ID"]
-                desc = row["Description"]
-                field_name = str(row["Field_Name"]).strip()
-                inp_val = row["Input_Value"]
-                exp_err = str(row["Expected_Error"]).strip()
+            driver, relaunched = driver_pool.ensure_healthy(driver, LOGIN_URL)
+            if relaunched:
+                login(driver)
 
-                print(f"\n--- {browser.upper()} | {tc_id}: {desc} ---")
+            # Always reset to fresh profile page state
+            driver.refresh()
+            wait_for_app_idle(driver, label="reload")
+            ensure_profile_page(driver)
 
-                # Always reset to fresh profile page state
-                driver.refresh()
-                time.sleep(1)
-                ensure_profile_page(driver)
+            status = "PASS"
+            fail_reason = ""
+            details = ""
+            actual_toast = ""
 
-                status = "PASS"
-                fail_reason = ""
-                details = ""
-                actual_toast = ""
+            try:
+                # 3. Handle Special "Refresh" / "Persistence" Case
+                if plan.refresh_check:
+                    try:
+                        # Enter Data (NO SAVE), then Refresh
+                        run_steps(driver, plan)
 
-                try:
-                    # 3. Handle Special "Refresh" / "Persistence" Case
-                    if "Refresh" in desc or "Persistence" in desc:
+                        # Verify Revert
                         try:
-                            try:
-                                input_el = driver.find_element(
-                                    By.CSS_SELECTOR, f"[data-test='{field_name}']"
-                                )
-                            except Exception:
-                                input_el = driver.find_element(By.ID, field_name)
-
-                            # Enter Data (NO SAVE)
-                            clear_and_type(input_el, inp_val)
-                            time.sleep(0.5)
-
-                            # Refresh
-                            driver.refresh()
-                            time.sleep(1)
-                            ensure_profile_page(driver)
-
-                            # Verify Revert
-                            try:
-                                try:
-                                    new_el = driver.find_element(
-                                        By.CSS_SELECTOR, f"[data-test='{field_name}']"
-                                    )
-                                except Exception:
-                                    new_el = driver.find_element(By.ID, field_name)
-
-                                current_val = new_el.get_attribute("value")
-                                if current_val != inp_val:
-                                    print("    [PASS] Passed (Value reverted on refresh)")
-                                    status = "PASS"
-                                    details = "Value reverted on refresh"
-                                else:
-                                    print(
-                                        "    [FAIL] Value persisted after refresh (Unexpected)"
-                                    )
-                                    status = "FAIL"
-                                    details = "Value persisted after refresh"
-                            except Exception:
-                                print("    [PASS] Passed (Page reset)")
+                            new_el = find_field(driver, f"[data-test='{plan.field}']", plan.field)
+
+                            current_val = new_el.get_attribute("value")
+                            if current_val != plan.value:
+                                print("    [PASS] Passed (Value reverted on refresh)")
                                 status = "PASS"
-                                details = "Page reset after refresh"
-
-                        except Exception as e:
-                            print(f"    [CRITICAL FAIL] Script error: {e}")
-                            status = "SCRIPT_ERROR"
-                            details = str(e)
-
-                        # Log result and go to next row
-                        results.append(
-                            {
-                                "TC_ID": tc_id,
-                                "Description": desc,
-                                "Browser": browser,
-                                "Status": status,
-                                "Expected_Error": exp_err,
-                                "Actual_Toast": "",
-                                "Details": details or fail_reason,
-                            }
+                                details = "Value reverted on refresh"
+                            else:
+                                print(
+                                    "    [FAIL] Value persisted after refresh (Unexpected)"
+                                )
+                                status = "FAIL"
+                                details = "Value persisted after refresh"
+                        except Exception:
+                            print("    [PASS] Passed (Page reset)")
+                            status = "PASS"
+                            details = "Page reset after refresh"
+
+                    except Exception as e:
+                        print(f"    [CRITICAL FAIL] Script error: {e}")
+                        status = "SCRIPT_ERROR"
+                        details = str(e)
+
+                    # Log result and go to next row
+                    results.append(
+                        {
+                            "TC_ID": tc_id,
+                            "Description": desc,
+                            "Browser": browser,
+                            "Status": status,
+                            "Expected_Error": exp_err,
+                            "Actual_Toast": "",
+                            "Details": details or fail_reason,
+                        }
+                    )
+                    continue
+
+                # 4. Standard Input Handling, 5. Click Update Profile
+                run_steps(driver, plan)
+
+                # 6. Verify Result
+                actual_toast, is_red = capture_toast(driver)
+
+                if exp_err:
+                    # Expect Error
+                    if not actual_toast or exp_err not in actual_toast:
+                        status = "FAIL"
+                        fail_reason = (
+                            f"Expected Error '{exp_err}' NOT found "
+                            f"(Got: '{actual_toast}')"
+                        )
+                else:
+                    # Expect Success
+                    if is_red:
+                        status = "FAIL"
+                        fail_reason = (
+                            f"Bug Detected: Error Toast appeared: '{actual_toast}'"
                         )
-                        continue
 
-                    # 4. Standard Input Handling
-                    try:
-                        selector = f"[data-test='{field_name}']"
-                        if "_" in field_name:
-                            selector = f"[data-test='{field_name.replace('_', '-')}]"
-                        input_el = driver.find_element(By.CSS_SELECTOR, selector)
-                    except Exception:
-                        input_el = driver.find_element(By.ID, field_name)
-
-                    clear_and_type(input_el, inp_val)
-
-                    # 5. Click Update Profile
-                    save_btn = driver.find_element(
-                        By.XPATH, "//button[normalize-space()='Update Profile']"
-                    )
-                    driver.execute_script(
-                        "arguments[0].scrollIntoView({block: 'center'});", save_btn
-                    )
-                    time.sleep(0.5)
-                    force_click(driver, save_btn)
-
-                    # 6. Verify Result
-                    actual_toast, is_red = capture_toast(driver)
-
-                    if exp_err:
-                        # Expect Error
-                        if not actual_toast or exp_err not in actual_toast:
-                            status = "FAIL"
-                            fail_reason = (
-                                f"Expected Error '{exp_err}' NOT found "
-                                f"(Got: '{actual_toast}')"
-                            )
-                    else:
-                        # Expect Success
-                        if is_red:
-                            status = "FAIL"
-                            fail_reason = (
-                                f"Bug Detected: Error Toast appeared: '{actual_toast}'"
-                            )
-
-                    if status == "FAIL":
-                        print(f"    [FAIL] {fail_reason}")
-                    else:
-                        print("    [PASS] Passed")
-
-                    details = fail_reason if status == "FAIL" else "Passed"
-
-                except Exception as e:
-                    print(f"    [CRITICAL FAIL] Script error: {e}")
-                    status = "SCRIPT_ERROR"
-                    details = str(e)
-
-                # Record result for this test case
-                results.append(
-                    {
-                        "TC_ID": tc_id,
-                        "Description": desc,
-                        "Browser": browser,
-                        "Status": status,
-                        "Expected_Error": exp_err,
-                        "Actual_Toast": actual_toast,
-                        "Details": details,
-                    }
-                )
-
-        finally:
-            print("\nTest Run Complete for", browser.upper(), "- Closing Browser...")
-            driver.quit()
-
-            # Save CSV report for this browser
-            out_file = f"results_profile_{browser}.csv"
-            pd.DataFrame(results).to_csv(out_file, index=False)
-            print(f"[INFO] Results saved to {out_file}")
+                if status == "FAIL":
+                    print(f"    [FAIL] {fail_reason}")
+                else:
+                    print("    [PASS] Passed")
+
+                details = fail_reason if status == "FAIL" else "Passed"
+
+            except Exception as e:
+                print(f"    [CRITICAL FAIL] Script error: {e}")
+                status = "SCRIPT_ERROR"
+                details = str(e)
+
+            # Record result for this test case
+            results.append(
+                {
+                    "TC_ID": tc_id,
+                    "Description": desc,
+                    "Browser": browser,
+                    "Status": status,
+                    "Expected_Error": exp_err,
+                    "Actual_Toast": actual_toast,
+                    "Details": details,
+                }
+            )
+
+    finally:
+        print("\nTest Run Complete for", browser.upper(), "- Releasing Browser...")
+        if driver is not None:
+            driver_pool.release(driver)
+        print_wait_summary()
+        tracing.finish_run()
+        if driver is None:
+            results.abandon()
+        else:
+            results.close()
+        selection.record_run("profile", browser, results.outcomes)
+        print(f"[INFO] Results saved to {out_file}")
+
+def run_profile_tests():
+    # Load data once
+    try:
+        df = pd.read_csv(DATA_FILE)
+        df = df.fillna("")
+    except Exception:
+        print(f"Error: Could not find {DATA_FILE}")
+        return
+
+    # Compiled once for all browsers: a bad row stops the run before any launch
+    plans = plan_compiler.load_plans("profile", df)
+    if plans is None:
+        return
+    run = functools.partial(run_profile_tests_for_browser, plans=plans)
+
+    browsers = ["chrome", "firefox", "edge"]
+
+    for browser in browsers:
+        flakiness.run_with_retries(run, df, "profile", browser,
+                                   f"results_profile_{browser}.csv")
 
 if __name__ == "__main__":
+    run_profiles.apply_cli_profile()
+    selection.apply_cli_selection()
     run_profile_tests()
\ No newline at end of file
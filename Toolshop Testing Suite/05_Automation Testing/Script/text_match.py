@@ -0,0 +1,94 @@
+import re
+from functools import lru_cache
+
+# ERROR TEXT MATCHING
+# The product suite used to normalize the whole driver.page_source (three regex
+# passes) on every retry. Here one execute_script returns only the text that can
+# carry a message (toasts, alerts, inline .invalid-feedback), each text is
+# normalized once with precompiled patterns, and an Aho-Corasick automaton finds
+# every pattern of interest (expected error + error/success keywords) in one scan.
+
+PUNCTUATION = re.compile(r"[^\w\s]")
+FILLER_WORDS = re.compile(r"\b(the|field)\b")
+SPACES = re.compile(r"\s+")
+
+TOAST_SELECTOR = ".toast, .toast-message, .toast-container .toast, .alert, [role='alert']"
+INLINE_SELECTOR = ".invalid-feedback"
+
+# Visible message nodes as [kind, text, class], kind "toast" or "inline"
+MESSAGES_JS = """
+const seen = new Set();
+const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+const pick = (selector, kind) => Array.from(document.querySelectorAll(selector))
+    .filter(el => !seen.has(el) && (seen.add(el), visible(el)))
+    .map(el => [kind, (el.innerText || el.textContent || "").trim(), (el.getAttribute("class") || "").toLowerCase()])
+    .filter(item => item[1]);
+return pick(arguments[0], "toast").concat(pick(arguments[1], "inline"));
+"""
+
+# NORMALIZATION
+def normalize_text(s):
+    if s is None:
+        return ""
+    s = PUNCTUATION.sub(" ", s.lower())  # remove punctuation
+    s = FILLER_WORDS.sub(" ", s)         # drop filler words
+    return SPACES.sub(" ", s).strip()
+
+# AHO-CORASICK
+@lru_cache(maxsize=64)
+def build_matcher(patterns):
+    # patterns: tuple of normalized strings -> (goto, fail, out)
+    goto, fail, out = [{}], [0], [set()]
+    for idx, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        state = 0
+        for char in pattern:
+            if char not in goto[state]:
+                goto.append({})
+                fail.append(0)
+                out.append(set())
+                goto[state][char] = len(goto) - 1
+            state = goto[state][char]
+        out[state].add(idx)
+
+    # Breadth-first failure links; outputs inherit those of their fallback state
+    queue = list(goto[0].values())
+    for state in queue:
+        for char, target in goto[state].items():
+            queue.append(target)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[target] = goto[fallback].get(char, 0)
+            out[target] |= out[fail[target]]
+    return goto, fail, out
+
+def find_patterns(matcher, text):
+    # Indices of every pattern occurring in text, in one pass
+    goto, fail, out = matcher
+    found = set()
+    state = 0
+    for char in text:
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        if out[state]:
+            found |= out[state]
+    return found
+
+# PAGE MESSAGES
+def read_messages(driver):
+    try:
+        return driver.execute_script(MESSAGES_JS, TOAST_SELECTOR, INLINE_SELECTOR) or []
+    except Exception:
+        return []
+
+def match_messages(messages, patterns):
+    # [(kind, text, class, normalized, {pattern indices})] for every message
+    matcher = build_matcher(tuple(normalize_text(p) for p in patterns))
+    matched = []
+    for kind, text, classes in messages:
+        norm = normalize_text(text)
+        matched.append((kind, text, classes, norm, find_patterns(matcher, norm)))
+    return matched
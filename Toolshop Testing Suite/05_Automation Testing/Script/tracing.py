@@ -0,0 +1,169 @@
+import argparse
+import functools
+import glob
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# STEP TRACING
+# Wall-clock spans around the helpers of test_cart.py, test_product.py and
+# test_profile.py. Each run writes its spans next to its results CSV:
+#   <results>.trace.jsonl  one span per line (suite, browser, TC_ID, flow, step, start, dur)
+#   <results>.trace.json   the same spans in Chrome trace format (chrome://tracing, Perfetto)
+# and prints the slowest steps and flows of the run. "python tracing.py" ranks
+# them again over every trace under "Test Result/".
+#
+# A test's own span is named "test"; step times include the steps they call.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULT_DIR = os.path.join(SCRIPT_DIR, "..", "Test Result")
+TOP_STEPS = 10
+TOP_TESTS = 5
+
+run = {}      # suite, browser, out_file, t0 of the current run
+test = {}     # tc_id, flow, started of the current test case
+spans = []
+depth = 0
+
+# RECORDING
+def start_run(suite, browser, out_file):
+    global depth
+    run.clear()
+    run.update(suite=suite, browser=browser, out_file=out_file, t0=time.perf_counter())
+    test.clear()
+    spans.clear()
+    depth = 0
+
+def add_span(name, started, level):
+    now = time.perf_counter()
+    spans.append({
+        "suite": run.get("suite", ""),
+        "browser": run.get("browser", ""),
+        "tc_id": test.get("tc_id", ""),
+        "flow": test.get("flow", ""),
+        "step": name,
+        "depth": level,
+        "start": round(started - run.get("t0", started), 4),
+        "dur": round(now - started, 4),
+    })
+
+def end_test():
+    if test:
+        add_span("test", test["started"], 0)
+        test.clear()
+
+def start_test(tc_id, flow=""):
+    # Closes the previous test case, so early `continue`s need no extra call
+    end_test()
+    test.update(tc_id=tc_id, flow=flow, started=time.perf_counter())
+
+@contextmanager
+def span(name):
+    global depth
+    started = time.perf_counter()
+    depth += 1
+    try:
+        yield
+    finally:
+        depth -= 1
+        add_span(name, started, depth + 1)
+
+def traced(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+def test_elapsed():
+    # Seconds since the current test case started ("" outside a test case)
+    return round(time.perf_counter() - test["started"], 4) if test else ""
+
+def finish_run():
+    end_test()
+    if not run or not spans:
+        return
+    write_spans(spans, run["out_file"])
+    print_slow_steps(spans, f"{run['suite']} on {run['browser'].upper()}")
+
+# TRACE FILES
+def trace_files(out_file):
+    stem = out_file[:-len(".csv")] if out_file.endswith(".csv") else out_file
+    return stem + ".trace.jsonl", stem + ".trace.json"
+
+def read_spans(jsonl_file):
+    if not os.path.exists(jsonl_file):
+        return []
+    with open(jsonl_file, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+def write_spans(span_list, out_file):
+    jsonl_file, chrome_file = trace_files(out_file)
+    with open(jsonl_file, mode="w", encoding="utf-8") as file:
+        for s in span_list:
+            file.write(json.dumps(s) + "\n")
+
+    # Complete ("X") events in microseconds; one row per browser, one track per test case
+    events = [
+        {
+            "name": s["step"], "cat": s["flow"] or "step", "ph": "X",
+            "ts": int(s["start"] * 1e6), "dur": int(s["dur"] * 1e6),
+            "pid": f"{s['suite']} {s['browser']}", "tid": s["tc_id"] or "setup",
+            "args": {"tc_id": s["tc_id"], "flow": s["flow"]},
+        }
+        for s in span_list
+    ]
+    with open(chrome_file, mode="w", encoding="utf-8") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+def remove_traces(out_file):
+    for path in trace_files(out_file):
+        if os.path.exists(path):
+            os.remove(path)
+
+# REPORT
+def print_slow_steps(span_list, title):
+    steps, flows = {}, {}
+    tests = [s for s in span_list if s["step"] == "test"]
+    for s in span_list:
+        if s["step"] == "test":
+            bucket, key = flows, s["flow"] or "-"
+        else:
+            bucket, key = steps, s["step"]
+        count, total, worst = bucket.get(key, (0, 0.0, 0.0))
+        bucket[key] = (count + 1, total + s["dur"], max(worst, s["dur"]))
+
+    print(f"\n[Info] Slowest steps, {title} (step: count, total, avg, max)")
+    for name, (count, total, worst) in sorted(steps.items(), key=lambda item: -item[1][1])[:TOP_STEPS]:
+        print(f"    {name}: {count}x, {total:.2f}s, {total / count:.3f}s, {worst:.3f}s")
+
+    print(f"[Info] Flows by average test time, {title}")
+    for name, (count, total, worst) in sorted(flows.items(), key=lambda item: -item[1][1] / item[1][0]):
+        print(f"    {name}: {count} tests, {total / count:.2f}s avg, {worst:.2f}s max")
+
+    if tests:
+        slowest = sorted(tests, key=lambda s: -s["dur"])[:TOP_TESTS]
+        print("[Info] Slowest tests: " + ", ".join(f"{s['tc_id']} {s['dur']:.2f}s" for s in slowest))
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank the slowest steps and flows per browser from saved traces.")
+    parser.add_argument("traces", nargs="*",
+                        help="*.trace.jsonl files (default: every trace under 'Test Result/')")
+    args = parser.parse_args()
+
+    paths = args.traces or sorted(glob.glob(os.path.join(RESULT_DIR, "**", "*.trace.jsonl"), recursive=True))
+    if not paths:
+        print("Error: No trace files found.")
+        return
+
+    by_browser = {}
+    for path in paths:
+        for s in read_spans(path):
+            by_browser.setdefault((s["suite"], s["browser"]), []).append(s)
+
+    for (suite, browser), span_list in sorted(by_browser.items()):
+        print_slow_steps(span_list, f"{suite} on {browser.upper()}")
+
+if __name__ == "__main__":
+    main()
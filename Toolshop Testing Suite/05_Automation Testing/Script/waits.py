@@ -0,0 +1,153 @@
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from run_profiles import active_profile
+
+# WAIT LAYER
+# Shared by test_cart.py, test_product.py and test_profile.py instead of fixed
+# time.sleep calls. Every wait returns as soon as its condition holds and
+# records how long it actually took in WAIT_LOG (label, seconds, satisfied).
+# Timeouts are multiplied by the run profile's wait_scale.
+
+WAIT_LOG = []
+
+POLL_INTERVAL = 0.05
+
+# Counts in-flight XHR/fetch requests. Installed lazily; a full page load drops
+# it, and it is installed again by the next idle wait.
+NETWORK_HOOK_JS = """
+if (window.__toolshopPending !== undefined) { return; }
+window.__toolshopPending = 0;
+const send = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.send = function () {
+    window.__toolshopPending++;
+    this.addEventListener('loadend', () => { window.__toolshopPending--; });
+    return send.apply(this, arguments);
+};
+if (window.fetch) {
+    const fetch = window.fetch;
+    window.fetch = function () {
+        window.__toolshopPending++;
+        return fetch.apply(this, arguments).finally(() => { window.__toolshopPending--; });
+    };
+}
+"""
+
+# Idle = document loaded, Angular zones stable (when testabilities are exposed)
+# and no requests in flight
+IDLE_JS = """
+if (document.readyState !== 'complete') { return false; }
+if (window.getAllAngularTestabilities) {
+    const testabilities = window.getAllAngularTestabilities();
+    if (!testabilities.every(t => t.isStable())) { return false; }
+}
+return (window.__toolshopPending || 0) === 0;
+"""
+
+# Resolves once the subtree has had no mutations for quietMs (true), or at timeoutMs (false)
+DOM_QUIET_JS = """
+const selector = arguments[0], quietMs = arguments[1], timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const root = (selector && document.querySelector(selector)) || document.body;
+let quietTimer = null;
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietMs);
+});
+const capTimer = setTimeout(() => finish(false), timeoutMs);
+function finish(ok) {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(capTimer);
+    done(ok);
+}
+observer.observe(root, { childList: true, subtree: true, attributes: true, characterData: true });
+quietTimer = setTimeout(() => finish(true), quietMs);
+"""
+
+# BOOKKEEPING
+def record_wait(label, started, satisfied):
+    WAIT_LOG.append((label, time.perf_counter() - started, satisfied))
+
+def print_wait_summary():
+    if not WAIT_LOG:
+        return
+    totals = {}
+    for label, seconds, satisfied in WAIT_LOG:
+        count, total, worst, timeouts = totals.get(label, (0, 0.0, 0.0, 0))
+        totals[label] = (count + 1, total + seconds, max(worst, seconds), timeouts + (not satisfied))
+
+    print("\n[Info] Wait summary (label: count, total, avg, max, timeouts)")
+    for label, (count, total, worst, timeouts) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        print(f"    {label}: {count}x, {total:.2f}s, {total / count:.3f}s, {worst:.3f}s, {timeouts}")
+    WAIT_LOG.clear()
+
+# WAITS
+def wait_until(driver, condition, timeout=5, label="condition", required=True):
+    # WebDriverWait with bookkeeping; required=False returns None on timeout instead of raising
+    started = time.perf_counter()
+    timeout *= active_profile()["wait_scale"]
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+    except TimeoutException:
+        record_wait(label, started, False)
+        if required:
+            raise
+        return None
+    record_wait(label, started, True)
+    return result
+
+def app_is_idle(driver):
+    try:
+        driver.execute_script(NETWORK_HOOK_JS)
+        return driver.execute_script(IDLE_JS)
+    except WebDriverException:
+        # Mid-navigation: the document is being replaced
+        return False
+
+def wait_for_app_idle(driver, timeout=5, label="app idle"):
+    return wait_until(driver, app_is_idle, timeout, label, required=False)
+
+def wait_for_dom_quiet(driver, selector=None, quiet_ms=150, timeout=3, label="dom quiet"):
+    started = time.perf_counter()
+    timeout *= active_profile()["wait_scale"]
+    try:
+        driver.set_script_timeout(timeout + 1)
+        satisfied = driver.execute_async_script(DOM_QUIET_JS, selector, quiet_ms, int(timeout * 1000))
+    except WebDriverException:
+        satisfied = False
+    record_wait(label, started, satisfied)
+    return satisfied
+
+def wait_for_url(driver, fragment, timeout=5, label=None):
+    return wait_until(driver, EC.url_contains(fragment), timeout, label or f"url {fragment}", required=False)
+
+def wait_for_value(driver, element, value, timeout=2, settle=0.15, label="input value"):
+    # True once the field shows value. A field that rejects or reshapes the
+    # input (number input given "abc", masks, maxlength) never does: stop as
+    # soon as its value has stayed the same for settle seconds and return False
+    expected = str(value)
+    seen = {"value": None, "since": time.perf_counter()}
+
+    def typed_or_settled(d):
+        current = element.get_attribute("value")
+        if current == expected:
+            return "typed"
+        now = time.perf_counter()
+        if current != seen["value"]:
+            seen["value"], seen["since"] = current, now
+            return False
+        return "settled" if now - seen["since"] >= settle else False
+
+    return wait_until(driver, typed_or_settled, timeout, label, required=False) == "typed"
+
+def wait_for_value_change(driver, element, old_value, timeout=2, label="value change"):
+    return wait_until(
+        driver, lambda d: element.get_attribute("value") != old_value, timeout, label, required=False
+    )
+
+def wait_for_removal(driver, element, timeout=3, label="element removed"):
+    return wait_until(driver, EC.staleness_of(element), timeout, label, required=False)